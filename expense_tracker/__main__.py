@@ -1,5 +1,9 @@
 # expense_tracker/__main__.py
 
+import argparse
+
+from pathlib import Path
+
 from expense_tracker import __app_name__
 
 from expense_tracker.model.orm import engine, Base
@@ -12,16 +16,58 @@ from expense_tracker.model.orm.db_tag import DB_Tag
 from expense_tracker.model.orm.db_budget import DB_Budget
 from expense_tracker.model.orm.db_month_budget import DB_Month_Budget
 
-from expense_tracker.config_manager import Config_Manager
-
-import os
+from expense_tracker.model.schema_manager import Schema_Manager
+from expense_tracker.model.transaction_totals import Transaction_Totals
+from expense_tracker.model.reconcile_stream import Reconcile_Stream
 
 from expense_tracker.view.exptrack_app import Exptrack_App
 
 
 def main() -> None:
-    if not os.path.exists(Config_Manager().get_database_path()):
-        Base.metadata.create_all(engine)
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(prog=__app_name__)
+    parser.add_argument(
+        "--verify-totals",
+        action="store_true",
+        help="check the stored transaction totals against their amounts and exit",
+    )
+    parser.add_argument(
+        "--rebuild-totals",
+        action="store_true",
+        help="recalculate every stored transaction total from its amounts and exit",
+    )
+    parser.add_argument(
+        "--reconcile",
+        nargs=2,
+        metavar=("STATEMENT", "ACCOUNT_ID"),
+        help="reconcile a date ordered statement csv against an account without loading it into memory and exit, rows that do not match are left for the interactive reconcile",
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    # Create the database if it does not exist and migrate it if it is out of date
+    Schema_Manager.migrate(engine)
+
+    if args.verify_totals:
+        inconsistent_list: list[tuple[int, float, float]] = Transaction_Totals.verify()
+        for transaction_id, total, amount_sum in inconsistent_list:
+            print(
+                f"Transaction {transaction_id} has a stored total of {total} but its amounts sum to {amount_sum}"
+            )
+        print(f"{len(inconsistent_list)} inconsistent transaction totals")
+        raise SystemExit(1 if inconsistent_list else 0)
+
+    if args.rebuild_totals:
+        print(f"Rebuilt totals, {Transaction_Totals.rebuild()} were inconsistent")
+        return
+
+    if args.reconcile:
+        statement_path, account_id = args.reconcile
+        result: Reconcile_Stream.Result = Reconcile_Stream(
+            Path(statement_path), int(account_id)
+        ).commit()
+        print(
+            f"Reconciled {result.matched_count} statement rows, {result.unmatched_count} rows and {result.orphan_count} unreconciled transactions from the same dates did not match"
+        )
+        return
 
     app: Exptrack_App = Exptrack_App()
     app.run()
@@ -1,11 +1,10 @@
 # expense_tracker/model/db_util.py
 
-from sqlalchemy.orm import Session
-
-import re
-
 from typing import Optional
 
+from expense_tracker.model.merchant_matcher import Merchant_Matcher
+from expense_tracker.model.transaction_totals import Transaction_Totals
+
 from expense_tracker.model.orm import engine
 from expense_tracker.model.orm.db_transaction import DB_Transaction
 from expense_tracker.model.orm.db_merchant import DB_Merchant
@@ -32,15 +31,23 @@ class DB_Util:
 
         Return: DB_Merchant if one was found.
         """
-        with Session(engine) as session:
-            for merchant in session.query(DB_Merchant).all():
-                if not merchant.naming_rule:
-                    continue
 
-                if re.search(merchant.naming_rule, description):
-                    return merchant
+        return Merchant_Matcher.match(description)
+
+    @staticmethod
+    def get_merchants_from_descriptions(
+        description_list: list[str],
+    ) -> list[Optional[DB_Merchant]]:
+        """
+        Uses existing merchant naming rules to try to find a merchant for many statement descriptions at once.
+
+        Args:
+            description_list: Statement row descriptions.
+
+        Return: List of the DB_Merchant found for each description, None where no merchant was found.
+        """
 
-        return None
+        return Merchant_Matcher.match_many(description_list)
 
     @staticmethod
     def get_transaction_amount(transaction: DB_Transaction) -> float:
@@ -53,10 +60,17 @@ class DB_Util:
         Return: Amount total.
         """
 
-        with Session(engine) as session:
-            return sum(
-                amount.amount
-                for amount in session.query(DB_Amount)
-                .where(DB_Amount.transaction == transaction)
-                .all()
-            )
+        return Transaction_Totals.get_total(transaction.id)
+
+    @staticmethod
+    def get_transaction_amounts(transaction_id_list: list[int]) -> dict[int, float]:
+        """
+        Get the total amount for many transactions with one aggregate query.
+
+        Args:
+            transaction_id_list: IDs of the transactions whose amounts should be totaled.
+
+        Return: Dict of transaction id to amount total, transactions without amounts have a total of 0.
+        """
+
+        return Transaction_Totals.get_totals(transaction_id_list)
@@ -0,0 +1,182 @@
+# expense_tracker/model/merchant_matcher.py
+
+import re
+
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+
+
+class Merchant_Matcher:
+    """
+    Matches statement descriptions to merchants using the merchant naming rules.
+
+    The naming rules are compiled once and reused until invalidate is called. Rules are indexed by the literal text they start with, so a description is only searched with the rules whose literal text appears in it and the rules that have no literal text.
+    """
+
+    # Characters that end the literal prefix of a naming rule
+    _SPECIAL_CHARACTERS: str = "\\.^$*+?{}[]()|"
+
+    # Merchants with a valid naming rule and their compiled rules, in the order they are checked
+    _merchant_list: Optional[list[DB_Merchant]] = None
+    _rule_list: list[re.Pattern] = []
+
+    # Literal prefix length to literal prefix to indexes of the rules that start with it
+    _prefix_index: dict[int, dict[str, list[int]]] = {}
+
+    # Indexes of the rules without a literal prefix, these are checked against every description
+    _unindexed_list: list[int] = []
+
+    @staticmethod
+    def invalidate() -> None:
+        """
+        Clear the compiled rules, should be called whenever a merchant or its naming rule changes.
+        """
+
+        Merchant_Matcher._merchant_list = None
+        Merchant_Matcher._rule_list = []
+        Merchant_Matcher._prefix_index = {}
+        Merchant_Matcher._unindexed_list = []
+
+    @staticmethod
+    def match(description: str) -> Optional[DB_Merchant]:
+        """
+        Find the first merchant whose naming rule matches a description.
+
+        Args:
+            description: Statement row description.
+
+        Return: DB_Merchant if one was found.
+        """
+
+        if Merchant_Matcher._merchant_list is None:
+            Merchant_Matcher._compile()
+
+        # Collect the rules whose literal prefix appears somewhere in the description
+        candidate_set: set[int] = set(Merchant_Matcher._unindexed_list)
+        for length, prefix_dict in Merchant_Matcher._prefix_index.items():
+            for start in range(len(description) - length + 1):
+                index_list: Optional[list[int]] = prefix_dict.get(
+                    description[start : start + length]
+                )
+                if index_list:
+                    candidate_set.update(index_list)
+
+        # Check the candidates in order so the first merchant with a matching rule wins
+        for index in sorted(candidate_set):
+            if Merchant_Matcher._rule_list[index].search(description):
+                return Merchant_Matcher._merchant_list[index]
+
+        return None
+
+    @staticmethod
+    def get_merchant_list() -> list[DB_Merchant]:
+        """
+        Get the merchants whose naming rules are used for matching.
+
+        Return: List of merchants with a valid naming rule in the order they are checked.
+        """
+
+        if Merchant_Matcher._merchant_list is None:
+            Merchant_Matcher._compile()
+
+        return list(Merchant_Matcher._merchant_list)
+
+    @staticmethod
+    def match_many(description_list: list[str]) -> list[Optional[DB_Merchant]]:
+        """
+        Find the merchant for many descriptions, each distinct description is only matched once.
+
+        Args:
+            description_list: Statement row descriptions.
+
+        Return: List of the DB_Merchant found for each description, None where no merchant was found.
+        """
+
+        merchant_dict: dict[str, Optional[DB_Merchant]] = {}
+        for description in description_list:
+            if description not in merchant_dict:
+                merchant_dict[description] = Merchant_Matcher.match(description)
+
+        return list(merchant_dict[description] for description in description_list)
+
+    @staticmethod
+    def _compile() -> None:
+        """
+        Load the merchants with naming rules from the database and compile them.
+        """
+
+        with Session(engine) as session:
+            merchant_list: list[DB_Merchant] = (
+                session.query(DB_Merchant)
+                .where(DB_Merchant.naming_rule != None)
+                .where(DB_Merchant.naming_rule != "")
+                .order_by(DB_Merchant.id)
+                .all()
+            )
+
+        Merchant_Matcher.load(merchant_list)
+
+    @staticmethod
+    def load(merchant_list: list[DB_Merchant]) -> None:
+        """
+        Compile the naming rules of a list of merchants and index them by their literal prefix, replacing any rules already compiled.
+
+        Used directly by worker processes that are given the merchants instead of reading them from the database.
+
+        Args:
+            merchant_list: Merchants with naming rules in the order they should be checked.
+        """
+
+        Merchant_Matcher.invalidate()
+        Merchant_Matcher._merchant_list = []
+
+        for merchant in merchant_list:
+            try:
+                rule: re.Pattern = re.compile(merchant.naming_rule)
+            except re.error:
+                # An invalid rule can never match a description
+                continue
+
+            index: int = len(Merchant_Matcher._merchant_list)
+            Merchant_Matcher._merchant_list.append(merchant)
+            Merchant_Matcher._rule_list.append(rule)
+
+            prefix: str = Merchant_Matcher._literal_prefix(merchant.naming_rule)
+            if not prefix:
+                Merchant_Matcher._unindexed_list.append(index)
+                continue
+
+            Merchant_Matcher._prefix_index.setdefault(len(prefix), {}).setdefault(
+                prefix, []
+            ).append(index)
+
+    @staticmethod
+    def _literal_prefix(naming_rule: str) -> str:
+        """
+        Get the literal text that every match of a naming rule must contain.
+
+        Args:
+            naming_rule: Regular expression to get the prefix of.
+
+        Return: Literal prefix, or an empty string if the rule does not start with literal text.
+        """
+
+        # A top level alternation means no single prefix is required
+        if "|" in naming_rule:
+            return ""
+
+        prefix: list[str] = []
+        for character in naming_rule.removeprefix("^"):
+            if character in Merchant_Matcher._SPECIAL_CHARACTERS:
+                # The character before an optional quantifier is not required
+                if character in "*?{" and prefix:
+                    prefix.pop()
+                break
+
+            prefix.append(character)
+
+        return "".join(prefix)
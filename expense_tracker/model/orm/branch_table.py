@@ -2,12 +2,14 @@
 
 from expense_tracker.model.orm import Base
 
-from sqlalchemy import Table, Column, ForeignKey
+from sqlalchemy import Table, Column, ForeignKey, Index
 
 
 class Branch_Table:
     """
     SQLAlchemy association tables for the various tables that require a many to many connection.
+
+    Each table is indexed on both of its columns so the connection can be followed from either side.
     """
 
     amount_tag: Table = Table(
@@ -15,6 +17,8 @@ class Branch_Table:
         Base.metadata,
         Column("amount_id", ForeignKey("amounts.id")),
         Column("tag_id", ForeignKey("tags.id")),
+        Index("ix_amount_tag_branches_amount_id_tag_id", "amount_id", "tag_id"),
+        Index("ix_amount_tag_branches_tag_id", "tag_id"),
     )
 
     merchant_tag_default: Table = Table(
@@ -22,6 +26,8 @@ class Branch_Table:
         Base.metadata,
         Column("merchant_id", ForeignKey("merchants.id")),
         Column("tag_id", ForeignKey("tags.id")),
+        Index("ix_merchant_tag_defaults_merchant_id_tag_id", "merchant_id", "tag_id"),
+        Index("ix_merchant_tag_defaults_tag_id", "tag_id"),
     )
 
     budget_account: Table = Table(
@@ -29,6 +35,10 @@ class Branch_Table:
         Base.metadata,
         Column("budget_id", ForeignKey("budgets.id")),
         Column("account_id", ForeignKey("accounts.id")),
+        Index(
+            "ix_budget_account_branches_budget_id_account_id", "budget_id", "account_id"
+        ),
+        Index("ix_budget_account_branches_account_id", "account_id"),
     )
 
     budget_tag: Table = Table(
@@ -36,4 +46,6 @@ class Branch_Table:
         Base.metadata,
         Column("budget_id", ForeignKey("budgets.id")),
         Column("tag_id", ForeignKey("tags.id")),
+        Index("ix_budget_tag_branches_budget_id_tag_id", "budget_id", "tag_id"),
+        Index("ix_budget_tag_branches_tag_id", "tag_id"),
     )
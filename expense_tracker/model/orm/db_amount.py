@@ -5,7 +5,7 @@ from typing import List
 from expense_tracker.model.orm import Base
 from expense_tracker.model.orm.branch_table import Branch_Table
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import relationship, mapped_column
 
@@ -18,6 +18,7 @@ class DB_Amount(Base):
     """
 
     __tablename__ = "amounts"
+    __table_args__ = (Index("ix_amounts_transaction_id", "transaction_id"),)
 
     # Database columns
     id: Mapped[int] = mapped_column(
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from expense_tracker.model.orm import Base
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import relationship, mapped_column
 
@@ -17,6 +17,10 @@ class DB_Merchant_Location(Base):
     """
 
     __tablename__ = "merchant_locations"
+    __table_args__ = (
+        Index("ix_merchant_locations_merchant_id", "merchant_id"),
+        Index("ix_merchant_locations_x_coord_y_coord", "x_coord", "y_coord"),
+    )
 
     # Database columns
     id: Mapped[int] = mapped_column(
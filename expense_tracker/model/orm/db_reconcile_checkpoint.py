@@ -0,0 +1,38 @@
+# expense_tracker/orm/db_reconcile_checkpoint.py
+
+from expense_tracker.model.orm import Base
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+
+class DB_Reconcile_Checkpoint(Base):
+    """
+    SQLAlchemy reconcile checkpoints table
+
+    Stores the reconcile session in progress so it can be resumed after the app is closed, its statement rows are stored in the reconcile checkpoint rows table.
+    """
+
+    __tablename__ = "reconcile_checkpoints"
+
+    # Database columns
+    id: Mapped[int] = mapped_column(
+        primary_key=True,
+        nullable=False,
+    )
+    account_id: Mapped[int] = mapped_column(
+        ForeignKey("accounts.id"),
+        nullable=False,
+    )
+    statement_path: Mapped[str] = mapped_column(
+        nullable=False,
+    )
+
+    # Size and modification time of the statement when it was parsed, a statement that changed since is parsed again
+    statement_size: Mapped[int] = mapped_column(
+        nullable=False,
+    )
+    statement_modified_ns: Mapped[int] = mapped_column(
+        nullable=False,
+    )
@@ -0,0 +1,47 @@
+# expense_tracker/orm/db_reconcile_checkpoint_row.py
+
+from datetime import datetime
+
+from expense_tracker.model.orm import Base
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+
+class DB_Reconcile_Checkpoint_Row(Base):
+    """
+    SQLAlchemy reconcile checkpoint rows table
+
+    Stores a parsed statement row of a reconcile checkpoint with its merchant, including merchants set by hand, and the transaction it is matched to.
+    """
+
+    __tablename__ = "reconcile_checkpoint_rows"
+
+    # Database columns
+    checkpoint_id: Mapped[int] = mapped_column(
+        ForeignKey("reconcile_checkpoints.id"),
+        primary_key=True,
+        nullable=False,
+    )
+    row_id: Mapped[int] = mapped_column(
+        primary_key=True,
+        nullable=False,
+    )
+    description: Mapped[str] = mapped_column(
+        nullable=False,
+    )
+    merchant_id: Mapped[int] = mapped_column(
+        ForeignKey("merchants.id"),
+        nullable=True,
+    )
+    date: Mapped[datetime] = mapped_column(
+        nullable=False,
+    )
+    amount: Mapped[float] = mapped_column(
+        nullable=False,
+    )
+    matched_transaction_id: Mapped[int] = mapped_column(
+        ForeignKey("transactions.id"),
+        nullable=True,
+    )
@@ -6,7 +6,7 @@ from typing import List
 
 from expense_tracker.model.orm import Base
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import relationship, mapped_column
 
@@ -17,6 +17,16 @@ class DB_Transaction(Base):
     """
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_date_id", "date", "id"),
+        Index(
+            "ix_transactions_account_id_reconciled_status",
+            "account_id",
+            "reconciled_status",
+        ),
+        Index("ix_transactions_merchant_id", "merchant_id"),
+        Index("ix_transactions_total", "total"),
+    )
 
     # Database columns
     id: Mapped[int] = mapped_column(
@@ -59,6 +69,13 @@ class DB_Transaction(Base):
         nullable=True,
     )
 
+    # Sum of the amounts, stored so totals can be read and sorted without the amounts table
+    total: Mapped[float] = mapped_column(
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+
     # ORM objects
     merchant: Mapped["DB_Merchant"] = relationship(
         back_populates="transactions",
@@ -75,3 +92,10 @@ class DB_Transaction(Base):
         back_populates="transfer_transactions",
         foreign_keys=[transfer_account_id],
     )
+
+    def update_total(self) -> None:
+        """
+        Recalculate the stored total from the amounts, should be called whenever an amount is added or edited.
+        """
+
+        self.total = sum(amount.amount for amount in self.amounts)
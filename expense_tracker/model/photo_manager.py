@@ -8,18 +8,38 @@ from pathlib import Path
 
 from datetime import datetime
 
-from typing import Optional
+from typing import Optional, BinaryIO
+
+from dataclasses import dataclass
 
 from expense_tracker.constants import Constants
 
 import shutil
 
 
+@dataclass
+class Photo_Metadata:
+    """
+    Metadata read from the EXIF segment of a photo, values the photo does not have are None.
+    """
+
+    date: Optional[datetime] = None
+    description: Optional[str] = None
+    coords: Optional[tuple[float, float]] = None
+
+
 class Photo_Manager:
     """
     Functions to manage and interact with photos
     """
 
+    # JPEG markers used to find the EXIF segment
+    _JPEG_START_MARKER: bytes = b"\xff\xd8"
+    _JPEG_END_MARKER: bytes = b"\xff\xd9"
+    _JPEG_SCAN_MARKER: bytes = b"\xff\xda"
+    _JPEG_APP1_MARKER: bytes = b"\xff\xe1"
+    _EXIF_HEADER: bytes = b"Exif\x00\x00"
+
     @staticmethod
     def directory_exists(dir_path: Path) -> bool:
         """
@@ -79,26 +99,105 @@ class Photo_Manager:
         shutil.move(current_path, new_path)
 
     @staticmethod
-    def get_coords(path: Path) -> Optional[tuple[float, float]]:
+    def get_metadata(path: Path) -> Photo_Metadata:
         """
-        Gets coords from photo and returns them as a tuple
+        Read the date, description and coords of a photo in one pass.
+
+        Only the EXIF segment at the start of a JPEG is read, other files are parsed whole.
+
+        Args:
+            path: Path of the photo.
+
+        Return: Photo_Metadata of the photo.
         """
 
         with open(path, "rb") as src:
-            image: Image = Image(src)
-
+            exif_segment: Optional[bytes] = Photo_Manager._read_exif_segment(src)
+
+            if exif_segment is None:
+                src.seek(0)
+                image_bytes: bytes = src.read()
+            else:
+                # The parser expects another marker after the segment
+                image_bytes: bytes = exif_segment + Photo_Manager._JPEG_END_MARKER
+
+        try:
+            image: Image = Image(image_bytes)
+        except Exception:
+            return Photo_Metadata()
+        if not image.has_exif:
+            return Photo_Metadata()
+
+        metadata: Photo_Metadata = Photo_Metadata()
+
+        description: Optional[str] = image.get("image_description")
+        if description is not None:
+            metadata.description = re.sub("\n", " ", description)
+
+        date: Optional[str] = image.get("datetime")
+        if date is not None:
             try:
-                return (
-                    Photo_Manager._to_decimal_coords(
-                        image.gps_latitude, image.gps_latitude_ref
-                    ),
-                    Photo_Manager._to_decimal_coords(
-                        image.gps_longitude, image.gps_longitude_ref
-                    ),
-                )
-            except AttributeError:
+                metadata.date = datetime.strptime(date, "%Y:%m:%d %H:%M:%S")
+            except ValueError:
+                pass
+
+        latitude: Optional[tuple[float, float, float]] = image.get("gps_latitude")
+        longitude: Optional[tuple[float, float, float]] = image.get("gps_longitude")
+        if latitude is not None and longitude is not None:
+            metadata.coords = (
+                Photo_Manager._to_decimal_coords(
+                    latitude, image.get("gps_latitude_ref")
+                ),
+                Photo_Manager._to_decimal_coords(
+                    longitude, image.get("gps_longitude_ref")
+                ),
+            )
+
+        return metadata
+
+    @staticmethod
+    def _read_exif_segment(src: BinaryIO) -> Optional[bytes]:
+        """
+        Walk the segment headers at the start of a JPEG and read only the EXIF APP1 segment.
+
+        Args:
+            src: Photo file opened in binary mode, positioned at the start.
+
+        Return: The APP1 segment including its marker and length, or None if the file is not a JPEG or has no EXIF segment before the image data.
+        """
+
+        if src.read(2) != Photo_Manager._JPEG_START_MARKER:
+            return None
+
+        while True:
+            header: bytes = src.read(4)
+            if len(header) < 4 or header[0] != 0xFF:
+                return None
+
+            marker: bytes = header[:2]
+            if marker in (
+                Photo_Manager._JPEG_SCAN_MARKER,
+                Photo_Manager._JPEG_END_MARKER,
+            ):
                 return None
 
+            # The segment length includes the two length bytes
+            length: int = int.from_bytes(header[2:], "big")
+            if marker == Photo_Manager._JPEG_APP1_MARKER:
+                body: bytes = src.read(length - 2)
+                if body.startswith(Photo_Manager._EXIF_HEADER):
+                    return header + body
+            else:
+                src.seek(length - 2, 1)
+
+    @staticmethod
+    def get_coords(path: Path) -> Optional[tuple[float, float]]:
+        """
+        Gets coords from photo and returns them as a tuple
+        """
+
+        return Photo_Manager.get_metadata(path).coords
+
     @staticmethod
     def _to_decimal_coords(coords: tuple[float, float], ref: str):
         """
@@ -117,14 +216,7 @@ class Photo_Manager:
         Get the description from the photo
         """
 
-        with open(path, "rb") as src:
-            image: Image = Image(src)
-
-            # Return the image description if there is one
-            try:
-                return re.sub("\n", " ", image.image_description)
-            except AttributeError:
-                return None
+        return Photo_Manager.get_metadata(path).description
 
     @staticmethod
     def get_date(path: Path) -> datetime:
@@ -132,11 +224,4 @@ class Photo_Manager:
         Get the date and time that the photo was taken
         """
 
-        with open(path, "rb") as src:
-            image: Image = Image(src)
-
-            # Return the image date if there is one
-            try:
-                return datetime.strptime(image.datetime, "%Y:%m:%d %H:%M:%S")
-            except AttributeError:
-                return None
+        return Photo_Manager.get_metadata(path).date
@@ -0,0 +1,274 @@
+# expense_tracker/model/reconcile_checkpoint.py
+
+from pathlib import Path
+
+from os import stat_result
+
+from typing import Optional
+
+from sqlalchemy import Row, Table, bindparam, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_transaction import DB_Transaction
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+from expense_tracker.model.orm.db_amount import DB_Amount
+from expense_tracker.model.orm.db_account import DB_Account
+from expense_tracker.model.orm.db_merchant_location import DB_Merchant_Location
+from expense_tracker.model.orm.db_tag import DB_Tag
+from expense_tracker.model.orm.db_budget import DB_Budget
+from expense_tracker.model.orm.db_month_budget import DB_Month_Budget
+from expense_tracker.model.orm.db_reconcile_checkpoint import DB_Reconcile_Checkpoint
+from expense_tracker.model.orm.db_reconcile_checkpoint_row import (
+    DB_Reconcile_Checkpoint_Row,
+)
+
+from expense_tracker.model.statement_manager import ST_Transaction
+from expense_tracker.model.reconcile_session import Reconcile_Session
+from expense_tracker.model.session_manager import Session_Manager
+
+
+class Reconcile_Checkpoint:
+    """
+    Saves the reconcile session in progress to the database so it can be resumed after the app is closed.
+
+    The checkpoint keeps the parsed statement rows with their merchants, including merchants set by hand, and the transaction each row is matched to. Resuming loads the rows and restores their matches, the statement is not parsed and the rows are not scored again. Only one session is checkpointed at a time.
+    """
+
+    @staticmethod
+    def save(
+        statement_path: Path, account_id: int, reconcile_session: Reconcile_Session
+    ) -> None:
+        """
+        Replace the checkpoint with a new session.
+
+        Args:
+            statement_path: Path to the statement of the session.
+            account_id: ID of the account that the statement belongs to.
+            reconcile_session: Session to save.
+        """
+
+        statement_path = Path(statement_path).resolve()
+        statement_stat: stat_result = statement_path.stat()
+
+        with Session(engine) as session:
+            Reconcile_Checkpoint._delete(session)
+
+            checkpoint: DB_Reconcile_Checkpoint = DB_Reconcile_Checkpoint(
+                account_id=account_id,
+                statement_path=str(statement_path),
+                statement_size=statement_stat.st_size,
+                statement_modified_ns=statement_stat.st_mtime_ns,
+            )
+            session.add(checkpoint)
+            session.flush()
+
+            # Rows are inserted through the table with one statement executed for every row, the ORM bulk insert is several times slower
+            session.execute(
+                insert(DB_Reconcile_Checkpoint_Row.__table__),
+                list(
+                    {
+                        "checkpoint_id": checkpoint.id,
+                        "row_id": row.statement_trans.row_id,
+                        "description": row.statement_trans.description,
+                        "merchant_id": Reconcile_Checkpoint._merchant_id(
+                            row.statement_trans
+                        ),
+                        "date": row.statement_trans.date,
+                        "amount": row.statement_trans.amount,
+                        "matched_transaction_id": (
+                            row.matched_trans.id if row.matched_trans else None
+                        ),
+                    }
+                    for row in reconcile_session.reconcile_row_list
+                ),
+            )
+            session.commit()
+
+    @staticmethod
+    def update(
+        reconcile_session: Reconcile_Session, row_id_set: Optional[set[int]] = None
+    ) -> None:
+        """
+        Save the merchants and matches of statement rows that changed.
+
+        Args:
+            reconcile_session: Session that is checkpointed.
+            row_id_set: IDs of the rows that changed, every row is saved if not provided.
+        """
+
+        row_list: list[Reconcile_Session.Row] = (
+            reconcile_session.reconcile_row_list
+            if row_id_set is None
+            else list(
+                reconcile_session.get_row(row_id) for row_id in sorted(row_id_set)
+            )
+        )
+
+        with Session(engine) as session:
+            checkpoint_id: Optional[int] = session.scalar(
+                select(DB_Reconcile_Checkpoint.id)
+            )
+            if checkpoint_id is None or not row_list:
+                return
+
+            # Bulk update by primary key through the table, the statement is compiled once and executed for every row
+            table: Table = DB_Reconcile_Checkpoint_Row.__table__
+            session.execute(
+                update(table)
+                .where(table.c.checkpoint_id == checkpoint_id)
+                .where(table.c.row_id == bindparam("updated_row_id"))
+                .values(
+                    merchant_id=bindparam("updated_merchant_id"),
+                    matched_transaction_id=bindparam("updated_matched_transaction_id"),
+                ),
+                list(
+                    {
+                        "updated_row_id": row.statement_trans.row_id,
+                        "updated_merchant_id": Reconcile_Checkpoint._merchant_id(
+                            row.statement_trans
+                        ),
+                        "updated_matched_transaction_id": (
+                            row.matched_trans.id if row.matched_trans else None
+                        ),
+                    }
+                    for row in row_list
+                ),
+            )
+            session.commit()
+
+    @staticmethod
+    def load() -> Optional[tuple[Path, int, Reconcile_Session]]:
+        """
+        Resume the checkpointed session.
+
+        A checkpoint whose statement has changed since it was parsed is deleted, the statement has to be reconciled again.
+
+        Return: Tuple of the statement path, the account ID and the resumed session, or None if there is no checkpoint to resume.
+        """
+
+        with Session(engine) as session:
+            checkpoint: Optional[DB_Reconcile_Checkpoint] = session.scalar(
+                select(DB_Reconcile_Checkpoint)
+            )
+            if checkpoint is None:
+                return None
+
+            statement_path: Path = Path(checkpoint.statement_path)
+            if Reconcile_Checkpoint._statement_changed(checkpoint, statement_path):
+                Reconcile_Checkpoint._delete(session)
+                session.commit()
+                return None
+
+            account_id: int = checkpoint.account_id
+            checkpoint_row_list: list[Row] = session.execute(
+                select(
+                    DB_Reconcile_Checkpoint_Row.row_id,
+                    DB_Reconcile_Checkpoint_Row.description,
+                    DB_Reconcile_Checkpoint_Row.merchant_id,
+                    DB_Reconcile_Checkpoint_Row.date,
+                    DB_Reconcile_Checkpoint_Row.amount,
+                    DB_Reconcile_Checkpoint_Row.matched_transaction_id,
+                )
+                .where(DB_Reconcile_Checkpoint_Row.checkpoint_id == checkpoint.id)
+                .order_by(DB_Reconcile_Checkpoint_Row.row_id)
+            ).all()
+
+        # Merchants belong to the shared session like the ones set by hand, merchants that were deleted are dropped
+        with Session_Manager.unit_of_work() as session:
+            merchant_dict: dict[int, DB_Merchant] = {
+                merchant.id: merchant
+                for merchant in session.scalars(
+                    select(DB_Merchant).where(
+                        DB_Merchant.id.in_(
+                            set(
+                                checkpoint_row.merchant_id
+                                for checkpoint_row in checkpoint_row_list
+                            )
+                        )
+                    )
+                )
+            }
+
+        st_trans_list: list[ST_Transaction] = list(
+            ST_Transaction(
+                checkpoint_row.row_id,
+                checkpoint_row.description,
+                merchant_dict.get(checkpoint_row.merchant_id),
+                checkpoint_row.date,
+                checkpoint_row.amount,
+            )
+            for checkpoint_row in checkpoint_row_list
+        )
+
+        return (
+            statement_path,
+            account_id,
+            Reconcile_Session(
+                statement_path,
+                account_id,
+                st_trans_list,
+                list(
+                    checkpoint_row.matched_transaction_id
+                    for checkpoint_row in checkpoint_row_list
+                ),
+            ),
+        )
+
+    @staticmethod
+    def delete() -> None:
+        """
+        Delete the checkpoint, called when its session is committed or killed.
+        """
+
+        with Session(engine) as session:
+            Reconcile_Checkpoint._delete(session)
+            session.commit()
+
+    @staticmethod
+    def _delete(session: Session) -> None:
+        """
+        Delete every checkpoint and its rows without loading them.
+
+        Args:
+            session: Session to delete with, it is not committed.
+        """
+
+        session.execute(delete(DB_Reconcile_Checkpoint_Row))
+        session.execute(delete(DB_Reconcile_Checkpoint))
+
+    @staticmethod
+    def _statement_changed(
+        checkpoint: DB_Reconcile_Checkpoint, statement_path: Path
+    ) -> bool:
+        """
+        Check if the statement of a checkpoint was changed after it was parsed.
+
+        Args:
+            checkpoint: Checkpoint to check.
+            statement_path: Path to the statement of the checkpoint.
+
+        Return: True if the statement has a different size or modification time, a statement that no longer exists has not changed since the checkpoint has its rows.
+        """
+
+        if not statement_path.exists():
+            return False
+
+        statement_stat: stat_result = statement_path.stat()
+        return (
+            statement_stat.st_size != checkpoint.statement_size
+            or statement_stat.st_mtime_ns != checkpoint.statement_modified_ns
+        )
+
+    @staticmethod
+    def _merchant_id(st_trans: ST_Transaction) -> Optional[int]:
+        """
+        Get the ID of the merchant of a statement row.
+
+        Args:
+            st_trans: Statement row in the form of a ST_Transaction.
+
+        Return: ID of the merchant, or None if the row has no merchant.
+        """
+
+        return st_trans.merchant.id if st_trans.merchant else None
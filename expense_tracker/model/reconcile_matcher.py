@@ -0,0 +1,343 @@
+# expense_tracker/model/reconcile_matcher.py
+
+from datetime import date
+
+from difflib import SequenceMatcher
+
+from typing import Optional
+
+from expense_tracker.model.statement_manager import ST_Transaction
+
+from expense_tracker.model.orm.db_transaction import DB_Transaction
+
+
+class Reconcile_Matcher:
+    """
+    Scores statement rows against database transactions and finds the assignment of rows to transactions with the lowest total cost.
+
+    Rows and transactions that could match form a sparse graph, each connected group of it is solved on its own so the work grows with the size of the groups rather than the size of the statement.
+    """
+
+    # A statement row can be posted a few days after the transaction was made and differ from it by rounding
+    DATE_TOLERANCE_DAYS: int = 3
+    AMOUNT_TOLERANCE: float = 0.01
+
+    # Cost of each day and each dollar of difference and of completely different descriptions
+    DATE_WEIGHT: float = 1
+    AMOUNT_WEIGHT: float = 100
+    DESCRIPTION_WEIGHT: float = 0.5
+
+    # Costs are rounded so near equal pairs tie and are matched in date order
+    COST_DIGITS: int = 3
+
+    # Largest group solved exactly, larger groups are matched cheapest pair first
+    MAX_ASSIGNMENT_SIZE: int = 50
+
+    @staticmethod
+    def statement_key(st_trans: ST_Transaction) -> tuple[int, date, Optional[int]]:
+        """
+        Get the fields that are compared when matching a statement transaction.
+
+        Args:
+            st_trans: Statement row in the form of a ST_Transaction.
+
+        Return: Tuple of the absolute amount in cents, the calendar date and the merchant id if there is a merchant.
+        """
+
+        return (
+            round(abs(st_trans.amount) * 100),
+            st_trans.date.date(),
+            st_trans.merchant.id if st_trans.merchant else None,
+        )
+
+    @staticmethod
+    def transaction_key(db_trans: DB_Transaction) -> tuple[int, date, int]:
+        """
+        Get the fields that are compared when matching a database transaction, amounts are read from the stored transaction total.
+
+        Args:
+            db_trans: Database transaction, or a row with the same columns.
+
+        Return: Tuple of the absolute amount in cents, the calendar date and the merchant id.
+        """
+
+        return (
+            round(abs(db_trans.total) * 100),
+            db_trans.date.date(),
+            db_trans.merchant_id,
+        )
+
+    @staticmethod
+    def matching_fields(
+        st_key: tuple[int, date, Optional[int]], db_key: tuple[int, date, int]
+    ) -> int:
+        """
+        Find the number of columns (amount, merchant, date) that match, amounts and dates match if they are within the tolerances.
+
+        Args:
+            st_key: Match fields of the statement row.
+            db_key: Match fields of the database transaction.
+
+        Return: Int from 0 to 3 that represents how many columns (amount, merchant, date) are equal.
+        """
+
+        return (
+            (
+                abs(st_key[0] - db_key[0])
+                <= round(Reconcile_Matcher.AMOUNT_TOLERANCE * 100)
+            )
+            + (
+                abs((st_key[1] - db_key[1]).days)
+                <= Reconcile_Matcher.DATE_TOLERANCE_DAYS
+            )
+            + (st_key[2] == db_key[2])
+        )
+
+    @staticmethod
+    def cost(st_trans: ST_Transaction, db_trans: DB_Transaction) -> float:
+        """
+        Get the cost of matching a statement row to a database transaction, lower is a better match.
+
+        Args:
+            st_trans: Statement row in the form of a ST_Transaction.
+            db_trans: Database transaction, or a row with the same columns.
+
+        Return: Weighted sum of the date distance, the amount difference and how different the descriptions are.
+        """
+
+        date_distance: int = abs((st_trans.date.date() - db_trans.date.date()).days)
+        amount_delta: float = abs(abs(st_trans.amount) - abs(db_trans.total))
+        description_similarity: float = SequenceMatcher(
+            None, st_trans.description.lower(), db_trans.description.lower()
+        ).ratio()
+
+        return round(
+            Reconcile_Matcher.DATE_WEIGHT * date_distance
+            + Reconcile_Matcher.AMOUNT_WEIGHT * amount_delta
+            + Reconcile_Matcher.DESCRIPTION_WEIGHT * (1 - description_similarity),
+            Reconcile_Matcher.COST_DIGITS,
+        )
+
+    @staticmethod
+    def assign(edge_dict: dict[int, dict[int, float]]) -> dict[int, int]:
+        """
+        Match rows to columns so that as many rows as possible are matched with the lowest total cost.
+
+        Args:
+            edge_dict: Cost of each pair that can be matched by row and then column. Rows and columns are ordered, pairs of equal cost are matched in order.
+
+        Return: Dict of row to the column it is matched to, rows that can not be matched are left out.
+        """
+
+        assignment_dict: dict[int, int] = {}
+        for row_list, column_list in Reconcile_Matcher.groups(edge_dict):
+            if len(row_list) == 1 and len(column_list) == 1:
+                assignment_dict[row_list[0]] = column_list[0]
+            elif max(len(row_list), len(column_list)) <= (
+                Reconcile_Matcher.MAX_ASSIGNMENT_SIZE
+            ):
+                assignment_dict.update(
+                    Reconcile_Matcher._assign_exact(edge_dict, row_list, column_list)
+                )
+            else:
+                assignment_dict.update(
+                    Reconcile_Matcher._assign_greedy(edge_dict, row_list)
+                )
+
+        return assignment_dict
+
+    @staticmethod
+    def groups(
+        edge_dict: dict[int, dict[int, float]]
+    ) -> list[tuple[list[int], list[int]]]:
+        """
+        Split the pairs into groups that share no rows or columns.
+
+        Args:
+            edge_dict: Cost of each pair that can be matched by row and then column.
+
+        Return: List of the sorted rows and sorted columns of each group.
+        """
+
+        # Union find over rows and columns, columns are keyed apart from rows
+        parent_dict: dict[tuple[int, int], tuple[int, int]] = {}
+
+        def find(node: tuple[int, int]) -> tuple[int, int]:
+            root: tuple[int, int] = node
+            while parent_dict.setdefault(root, root) != root:
+                root = parent_dict[root]
+            while parent_dict[node] != root:
+                parent_dict[node], node = root, parent_dict[node]
+            return root
+
+        for row, column_dict in edge_dict.items():
+            for column in column_dict:
+                parent_dict[find((0, row))] = find((1, column))
+
+        group_dict: dict[tuple[int, int], tuple[list[int], list[int]]] = {}
+        for node in list(parent_dict):
+            group_dict.setdefault(find(node), ([], []))[node[0]].append(node[1])
+
+        return list(
+            (sorted(row_list), sorted(column_list))
+            for row_list, column_list in group_dict.values()
+            if row_list and column_list
+        )
+
+    @staticmethod
+    def _assign_exact(
+        edge_dict: dict[int, dict[int, float]],
+        row_list: list[int],
+        column_list: list[int],
+    ) -> dict[int, int]:
+        """
+        Find the best assignment of a group with the Hungarian algorithm.
+
+        Every row also gets a column of its own for leaving it unmatched, it costs more than any chain of real pairs so rows are only left unmatched when they have to be.
+
+        Args:
+            edge_dict: Cost of each pair that can be matched by row and then column.
+            row_list: Sorted rows of the group.
+            column_list: Sorted columns of the group.
+
+        Return: Dict of row to the column it is matched to.
+        """
+
+        row_count: int = len(row_list)
+        column_count: int = len(column_list)
+
+        highest_cost: float = max(
+            cost for row in row_list for cost in edge_dict[row].values()
+        )
+        unmatched_cost: float = (row_count + 1) * (highest_cost + 1)
+        forbidden_cost: float = (row_count + 2) * unmatched_cost
+
+        # Pairs of equal cost prefer rows and columns in the same order, the penalty is too small to outweigh any difference in cost
+        tie_break: float = 10**-Reconcile_Matcher.COST_DIGITS / (
+            2 * row_count * max(row_count, column_count) ** 2 + 1
+        )
+
+        cost_matrix: list[list[float]] = []
+        for row_index, row in enumerate(row_list):
+            cost_row: list[float] = []
+            for column_index, column in enumerate(column_list):
+                cost: float = edge_dict[row].get(column)
+                cost_row.append(
+                    forbidden_cost
+                    if cost is None
+                    else cost + tie_break * (row_index - column_index) ** 2
+                )
+            cost_row.extend(
+                unmatched_cost if index == row_index else forbidden_cost
+                for index in range(row_count)
+            )
+            cost_matrix.append(cost_row)
+
+        return {
+            row_list[row_index]: column_list[column_index]
+            for row_index, column_index in enumerate(
+                Reconcile_Matcher._hungarian(cost_matrix)
+            )
+            if column_index < column_count
+        }
+
+    @staticmethod
+    def _hungarian(cost_matrix: list[list[float]]) -> list[int]:
+        """
+        Solve a rectangular assignment problem with at least as many columns as rows.
+
+        Args:
+            cost_matrix: Cost of matching each row to each column.
+
+        Return: Column matched to each row.
+        """
+
+        row_count: int = len(cost_matrix)
+        column_count: int = len(cost_matrix[0])
+
+        # Potentials of the rows and columns and the row matched to each column, all offset by one so index zero is free for the row being added
+        row_potential: list[float] = [0] * (row_count + 1)
+        column_potential: list[float] = [0] * (column_count + 1)
+        column_match: list[int] = [0] * (column_count + 1)
+        previous_column: list[int] = [0] * (column_count + 1)
+
+        for row in range(1, row_count + 1):
+            column_match[0] = row
+            column: int = 0
+            min_slack: list[float] = [float("inf")] * (column_count + 1)
+            used: list[bool] = [False] * (column_count + 1)
+
+            # Grow alternating paths from the new row until one reaches a free column
+            while column_match[column] != 0:
+                used[column] = True
+                current_row: int = column_match[column]
+                cost_row: list[float] = cost_matrix[current_row - 1]
+                delta: float = float("inf")
+                next_column: int = 0
+
+                for other_column in range(1, column_count + 1):
+                    if used[other_column]:
+                        continue
+
+                    slack: float = (
+                        cost_row[other_column - 1]
+                        - row_potential[current_row]
+                        - column_potential[other_column]
+                    )
+                    if slack < min_slack[other_column]:
+                        min_slack[other_column] = slack
+                        previous_column[other_column] = column
+                    if min_slack[other_column] < delta:
+                        delta = min_slack[other_column]
+                        next_column = other_column
+
+                for other_column in range(column_count + 1):
+                    if used[other_column]:
+                        row_potential[column_match[other_column]] += delta
+                        column_potential[other_column] -= delta
+                    else:
+                        min_slack[other_column] -= delta
+
+                column = next_column
+
+            # Flip the path so the new row is matched
+            while column != 0:
+                column_match[column] = column_match[previous_column[column]]
+                column = previous_column[column]
+
+        assignment_list: list[int] = [0] * row_count
+        for column in range(1, column_count + 1):
+            if column_match[column] != 0:
+                assignment_list[column_match[column] - 1] = column - 1
+
+        return assignment_list
+
+    @staticmethod
+    def _assign_greedy(
+        edge_dict: dict[int, dict[int, float]], row_list: list[int]
+    ) -> dict[int, int]:
+        """
+        Match a group that is too large to solve exactly, cheapest pairs first.
+
+        Args:
+            edge_dict: Cost of each pair that can be matched by row and then column.
+            row_list: Rows of the group.
+
+        Return: Dict of row to the column it is matched to.
+        """
+
+        assignment_dict: dict[int, int] = {}
+        matched_column_set: set[int] = set()
+
+        for cost, row, column in sorted(
+            (cost, row, column)
+            for row in row_list
+            for column, cost in edge_dict[row].items()
+        ):
+            if row in assignment_dict or column in matched_column_set:
+                continue
+
+            assignment_dict[row] = column
+            matched_column_set.add(column)
+
+        return assignment_dict
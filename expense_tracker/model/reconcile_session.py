@@ -1,19 +1,24 @@
 # expense_tracker/model/reconcile_session.py
 
+from __future__ import annotations
+
 from pathlib import Path
 
 from typing import Optional
 
-from copy import copy
+from dataclasses import dataclass, field
+
+from datetime import date, timedelta
 
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from expense_tracker.model.statement_manager import Statement, ST_Transaction
-from expense_tracker.model.db_util import DB_Util
+from expense_tracker.model.reconcile_matcher import Reconcile_Matcher
 
-from expense_tracker.model.orm import engine
 from expense_tracker.model.orm.db_transaction import DB_Transaction
 from expense_tracker.model.orm.db_merchant import DB_Merchant
 from expense_tracker.model.orm.db_amount import DB_Amount
@@ -23,6 +28,8 @@ from expense_tracker.model.orm.db_tag import DB_Tag
 from expense_tracker.model.orm.db_budget import DB_Budget
 from expense_tracker.model.orm.db_month_budget import DB_Month_Budget
 
+from expense_tracker.model.session_manager import Session_Manager
+
 
 class Reconcile_Session:
     """
@@ -35,47 +42,221 @@ class Reconcile_Session:
         matched_trans: Optional[DB_Transaction] = None
         possible_match_list: Optional[list[DB_Transaction]] = None
 
-    def __init__(self, statement_path: Path, account_id: int) -> None:
+    @dataclass
+    class Change_Set:
+        """
+        Changes made to the session by an incremental re-match.
+        """
+
+        # IDs of the statement rows whose match or possible matches changed
+        row_id_set: set[int] = field(default_factory=set)
+
+        # Database transactions that became orphans and IDs of the ones that stopped being orphans
+        added_orphan_list: list[DB_Transaction] = field(default_factory=list)
+        removed_orphan_id_set: set[int] = field(default_factory=set)
+
+        # If the possible matches of any statement row changed
+        possible_match_changed: bool = False
+
+    def __init__(
+        self,
+        statement_path: Path,
+        account_id: int,
+        st_trans_list: Optional[list[ST_Transaction]] = None,
+        matched_id_list: Optional[list[Optional[int]]] = None,
+    ) -> None:
         """
         Initializes the class.
 
         Args:
             statement_path: Path to statement.
             account_id: ID of the account that the statement belongs to.
+            st_trans_list: Rows of the statement if it has already been parsed, read from statement_path if not provided.
+            matched_id_list: ID of the transaction each row of st_trans_list was matched to by an earlier session, or None for rows that were not matched. Every row is matched from scratch if not provided.
         """
 
         self._account_id: int = account_id
+        self._statement_path: Path = Path(statement_path)
 
         self.db_trans_list: list[DB_Transaction] = self._get_unreconciled_transactions()
-        self.st_trans_list: list[ST_Transaction] = Statement(
-            statement_path, self._account_id
-        ).get_all()
+        if st_trans_list is None:
+            st_trans_list = Statement(statement_path, self._account_id).get_all()
+
+        # Rows that were already reconciled, by a streamed reconcile or an earlier session, are left out so they are not matched twice
+        reconciled_name_set: set[str] = self._get_reconciled_statement_names()
+        keep_list: list[bool] = list(
+            Reconcile_Session.statement_name(self._statement_path, st_trans)
+            not in reconciled_name_set
+            for st_trans in st_trans_list
+        )
+        self.st_trans_list: list[ST_Transaction] = list(
+            st_trans for st_trans, keep in zip(st_trans_list, keep_list) if keep
+        )
+        if matched_id_list is not None:
+            matched_id_list = list(
+                matched_id
+                for matched_id, keep in zip(matched_id_list, keep_list)
+                if keep
+            )
+
+        # Position of each statement row in st_trans_list and reconcile_row_list by row ID
+        self._row_position_dict: dict[int, int] = {
+            st_trans.row_id: position
+            for position, st_trans in enumerate(self.st_trans_list)
+        }
 
         self.reconcile_row_list: list[Reconcile_Session.Row]
         self.orphan_list: list[DB_Transaction]
+        self._matched_id_set: set[int]
 
-        self.match()
+        if matched_id_list is None:
+            self.match()
+        else:
+            self.restore(matched_id_list)
 
     def _get_unreconciled_transactions(self) -> list[DB_Transaction]:
         """
-        Get all unreconciled transactions.
+        Get all unreconciled transactions, their merchants are loaded with them so they can be displayed without querying again.
 
         Returns:
             A list of transactions that have not been reconciled.
         """
 
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             return (
                 session.query(DB_Transaction)
+                .options(joinedload(DB_Transaction.merchant))
                 .where(DB_Transaction.reconciled_status == False)
                 .where(DB_Transaction.account_id == self._account_id)
                 .order_by(DB_Transaction.date)
                 .all()
             )
 
+    def _get_reconciled_statement_names(self) -> set[str]:
+        """
+        Get the statement names stamped on transactions reconciled against this statement.
+
+        Returns:
+            Set of the statement names that start with the file name of the statement.
+        """
+
+        with Session_Manager.unit_of_work() as session:
+            return set(
+                session.scalars(
+                    select(DB_Transaction.statement_name).where(
+                        DB_Transaction.statement_name.startswith(
+                            f"{self._statement_path.name}:", autoescape=True
+                        )
+                    )
+                )
+            )
+
+    def get_row(self, row_id: int) -> Reconcile_Session.Row:
+        """
+        Get a reconcile row by the ID of its statement row, rows that were already reconciled are not in the session.
+
+        Args:
+            row_id: ID of the statement row.
+
+        Returns: Reconcile row of the statement row.
+        """
+
+        return self.reconcile_row_list[self._row_position_dict[row_id]]
+
+    def _build_indexes(self) -> None:
+        """
+        Index the database transactions by date and by their amount and merchant, amounts are read from the stored transaction totals.
+
+        The transactions are sorted by date so their dates form a sorted index, transactions within a date window are found with a binary search. Indexes refer to transactions by their position in the date ordered list. Transactions can be edited while the session is open so the indexes are rebuilt every time the rows are matched.
+        """
+
+        self.db_trans_list.sort(key=lambda db_trans: db_trans.date)
+
+        # Position of each database transaction in the date ordered list, used to keep possible matches in date order
+        self._db_trans_positions: dict[int, int] = {}
+
+        # Match fields of each database transaction by position
+        self._db_trans_keys: list[tuple[int, date, int]] = []
+
+        self._date_list: list[date] = []
+        self._amount_merchant_index: dict[tuple[int, int], list[int]] = {}
+
+        for position, db_trans in enumerate(self.db_trans_list):
+            self._db_trans_positions[db_trans.id] = position
+
+            key: tuple[int, date, int] = Reconcile_Matcher.transaction_key(db_trans)
+            self._db_trans_keys.append(key)
+
+            cents, trans_date, merchant_id = key
+            self._date_list.append(trans_date)
+            self._amount_merchant_index.setdefault((cents, merchant_id), []).append(
+                position
+            )
+
     def match(self) -> None:
         """
         Match rows from the statement to transactions that have not been reconciled.
+
+        Rows are matched to the transactions that agree with them on every column (amount, date, merchant) within the tolerances of Reconcile_Matcher. When rows compete for transactions the assignment with the most matches and the lowest total cost is used.
+        """
+
+        self._build_indexes()
+
+        # Cost of every pair that could be matched by row and database transaction position
+        edge_dict: dict[int, dict[int, float]] = {}
+        for row_index, st_trans in enumerate(self.st_trans_list):
+            st_key: tuple[int, date, Optional[int]] = Reconcile_Matcher.statement_key(
+                st_trans
+            )
+            edge_dict[row_index] = {
+                position: Reconcile_Matcher.cost(st_trans, self.db_trans_list[position])
+                for position in self._find_date_window(st_key[1])
+                if Reconcile_Matcher.matching_fields(
+                    st_key, self._db_trans_keys[position]
+                )
+                == 3
+            }
+
+        self._set_matches(Reconcile_Matcher.assign(edge_dict))
+
+    def restore(self, matched_id_list: list[Optional[int]]) -> None:
+        """
+        Match rows from the statement to the transactions they were matched to by an earlier session, without scoring any pairs.
+
+        A match is only kept while the transaction still matches the row on every column within the tolerances. Rows whose transaction has since been reconciled, deleted or edited so it no longer matches are left unmatched and get possible matches instead.
+
+        Args:
+            matched_id_list: ID of the transaction each statement row was matched to, or None for rows that were not matched.
+        """
+
+        self._build_indexes()
+
+        assignment_dict: dict[int, int] = {}
+        used_position_set: set[int] = set()
+        for row_index, matched_id in enumerate(matched_id_list):
+            position: Optional[int] = self._db_trans_positions.get(matched_id)
+            if (
+                position is None
+                or position in used_position_set
+                or Reconcile_Matcher.matching_fields(
+                    Reconcile_Matcher.statement_key(self.st_trans_list[row_index]),
+                    self._db_trans_keys[position],
+                )
+                != 3
+            ):
+                continue
+
+            assignment_dict[row_index] = position
+            used_position_set.add(position)
+
+        self._set_matches(assignment_dict)
+
+    def _set_matches(self, assignment_dict: dict[int, int]) -> None:
+        """
+        Rebuild the reconcile rows from the matches of the statement rows, then find the possible matches of the rows that are not matched and the orphans.
+
+        Args:
+            assignment_dict: Position of the database transaction each matched row is matched to by row index.
         """
 
         # Clear the reconcile row list and orphan list to rewrite them
@@ -84,17 +265,14 @@ class Reconcile_Session:
         )
         self.orphan_list = []
 
-        # Create a list to keep track of the remaining database transactions
-        remaining_db_trans: list[DB_Transaction] = copy(self.db_trans_list)
+        # Keep track of the database transactions that have already been matched
+        matched_id_set: set[int] = set()
+        self._matched_id_set = matched_id_set
 
-        # For each row check for matches, if there are any then record them and remove the database transaction form the remaining transactions list
-        for row in self.reconcile_row_list:
-            match: DB_Transaction = self._find_match(
-                row.statement_trans, remaining_db_trans
-            )
-            if match:
-                row.matched_trans = match
-                remaining_db_trans.remove(match)
+        for row_index, position in assignment_dict.items():
+            match: DB_Transaction = self.db_trans_list[position]
+            self.reconcile_row_list[row_index].matched_trans = match
+            matched_id_set.add(match.id)
 
         # Find possible matches for each non matched statement transaction
         for row in self.reconcile_row_list:
@@ -103,106 +281,282 @@ class Reconcile_Session:
                 continue
 
             row.possible_match_list = self._find_possible_matches(
-                row.statement_trans, remaining_db_trans
+                row.statement_trans, matched_id_set
             )
 
         # Set the orphans list
-        self.orphan_list = remaining_db_trans
+        self.orphan_list = list(
+            db_trans
+            for db_trans in self.db_trans_list
+            if db_trans.id not in matched_id_set
+        )
         self.orphan_list.sort(key=lambda x: x.date, reverse=True)
 
+    def _find_date_window(self, trans_date: date) -> range:
+        """
+        Find the database transactions whose date is within the tolerance of a date, every match of a statement row on that date is one of them.
+
+        Args:
+            trans_date: Date of a statement row.
+
+        Returns: Range of the positions of the database transactions.
+        """
+
+        date_tolerance: timedelta = timedelta(
+            days=Reconcile_Matcher.DATE_TOLERANCE_DAYS
+        )
+
+        return range(
+            bisect_left(self._date_list, trans_date - date_tolerance),
+            bisect_right(self._date_list, trans_date + date_tolerance),
+        )
+
+    def _find_candidates(
+        self, st_key: tuple[int, date, Optional[int]], matched_id_set: set[int]
+    ) -> list[int]:
+        """
+        Find the database transactions that agree with a statement row on at least two columns (amount, date, merchant) within the tolerances, and possibly some that do not.
+
+        Any transaction whose date is within the tolerance is in the date window, the others can only match on amount and merchant and are in the amount and merchant index.
+
+        Args:
+            st_key: Match fields of the statement row.
+            matched_id_set: IDs of the database transactions that have already been matched.
+
+        Returns: Sorted positions of the database transactions that are not matched.
+        """
+
+        cents, trans_date, merchant_id = st_key
+
+        position_set: set[int] = set(self._find_date_window(trans_date))
+        if merchant_id is not None:
+            cents_tolerance: int = round(Reconcile_Matcher.AMOUNT_TOLERANCE * 100)
+            for other_cents in range(
+                cents - cents_tolerance, cents + cents_tolerance + 1
+            ):
+                position_set.update(
+                    self._amount_merchant_index.get((other_cents, merchant_id), [])
+                )
+
+        return sorted(
+            position
+            for position in position_set
+            if self.db_trans_list[position].id not in matched_id_set
+        )
+
     def _find_match(
-        self, st_trans: ST_Transaction, remaining_db_trans: list[DB_Transaction]
+        self, st_trans: ST_Transaction, matched_id_set: set[int]
     ) -> Optional[DB_Transaction]:
         """
         Try to find database transaction a match for a statement row.
 
-        Match is defined as a database transaction where all columns (amount, merchant, date) are equal.
+        Match is defined as a database transaction where all columns (amount, merchant, date) are equal within the tolerances, the one with the lowest cost is used.
 
         Args:
             st_trans: Statement Row in the form of a ST_Transaction.
-            remaining_db_trans: List of the database transactions that have not been reconciled or matched.
+            matched_id_set: IDs of the database transactions that have already been matched.
 
         Returns: Database transaction if one is found.
         """
 
-        # Check the statement trans against the remaining database trans, if one is a match return it.
-        for db_trans in remaining_db_trans:
-            if self.matching_trans_fields(st_trans, db_trans) == 3:
-                return db_trans
+        st_key: tuple[int, date, Optional[int]] = Reconcile_Matcher.statement_key(
+            st_trans
+        )
+
+        # A statement transaction without a merchant can never match all three columns
+        if st_key[2] is None:
+            return None
+
+        position_list: list[int] = list(
+            position
+            for position in self._find_date_window(st_key[1])
+            if self.db_trans_list[position].id not in matched_id_set
+            and Reconcile_Matcher.matching_fields(st_key, self._db_trans_keys[position])
+            == 3
+        )
 
         # No matches were found
-        return None
+        if not position_list:
+            return None
+
+        # Equal costs are broken by date order
+        return self.db_trans_list[
+            min(
+                position_list,
+                key=lambda x: (
+                    Reconcile_Matcher.cost(st_trans, self.db_trans_list[x]),
+                    x,
+                ),
+            )
+        ]
 
     def _find_possible_matches(
-        self, st_trans: ST_Transaction, remaining_db_trans: list[DB_Transaction]
+        self, st_trans: ST_Transaction, matched_id_set: set[int]
     ) -> list[DB_Transaction]:
         """
         Try to find database transactions that might match a statement row.
 
-        Possible match is defined as a database transaction where two of three columns (amount, merchant, date) are equal.
+        Possible match is defined as a database transaction where two of three columns (amount, merchant, date) are equal within the tolerances.
 
         Args:
             st_trans: Statement Row in the form of a ST_Transaction.
-            remaining_db_trans: List of the database transactions that have not been reconciled or matched.
+            matched_id_set: IDs of the database transactions that have already been matched.
 
         Returns: List of database transaction if it might be a possible match.
         """
 
-        possible_matches_list: list[DB_Transaction] = []
-
-        # Check the statement trans against the remaining database trans, if two out of three fields match then add it.
-        for db_trans in remaining_db_trans:
-            if self.matching_trans_fields(st_trans, db_trans) == 2:
-                possible_matches_list.append(db_trans)
+        st_key: tuple[int, date, Optional[int]] = Reconcile_Matcher.statement_key(
+            st_trans
+        )
 
-        # Return the list
-        return possible_matches_list
+        # Candidates are in the same date order as the database transactions
+        return list(
+            self.db_trans_list[position]
+            for position in self._find_candidates(st_key, matched_id_set)
+            if Reconcile_Matcher.matching_fields(st_key, self._db_trans_keys[position])
+            == 2
+        )
 
     def matching_trans_fields(
         self, st_trans: ST_Transaction, db_trans: DB_Transaction
     ) -> int:
         """
-        Find the number of columns (amount, merchant, date) that match.
+        Find the number of columns (amount, merchant, date) that match, amounts and dates match if they are within the tolerances of Reconcile_Matcher.
 
         Args:
             st_trans: Statement row in the form of a ST_Transaction.
-            db_trans: Database transaction.
+            db_trans: Database transaction from this session.
 
         Return: Int from 0 to 3 that represents how many columns (amount, merchant, date) are equal.
         """
 
-        matching_fields: int = 0
+        return Reconcile_Matcher.matching_fields(
+            Reconcile_Matcher.statement_key(st_trans),
+            self._db_trans_keys[self._db_trans_positions[db_trans.id]],
+        )
 
-        with Session(engine) as session:
-            session.add(db_trans)
+    def set_statement_transaction_merchant(
+        self, row_id: int, new_merchant: DB_Merchant
+    ) -> Reconcile_Session.Change_Set:
+        """
+        Set the merchant for a statement transaction in the current reconcile session.
 
-            # Check the amount
-            if abs(st_trans.amount) == abs(DB_Util.get_transaction_amount(db_trans)):
-                matching_fields += 1
+        Only the edited row and the database transactions it releases or claims are re-matched, the rest of the session is left as it is. Call match to re-match the whole session.
 
-            # Check date
-            if st_trans.date.date() == db_trans.date.date():
-                matching_fields += 1
+        Args:
+            row_id: ID of the row to be edited.
+            new_merchant: New merchant.
+
+        Return: The changes made to the session.
+        """
 
-            # Check merchant
-            if st_trans.merchant and st_trans.merchant.id == db_trans.merchant.id:
-                matching_fields += 1
+        change_set: Reconcile_Session.Change_Set = Reconcile_Session.Change_Set()
+        row: Reconcile_Session.Row = self.get_row(row_id)
+        row.statement_trans.merchant = new_merchant
+        change_set.row_id_set.add(row_id)
 
-        return matching_fields
+        # Release the old match so the edited row can be matched again
+        released_trans: Optional[DB_Transaction] = row.matched_trans
+        if released_trans:
+            row.matched_trans = None
+            self._matched_id_set.remove(released_trans.id)
 
-    def set_statement_transaction_merchant(
-        self, row_id: int, new_merchant: DB_Merchant
+        # Try to match the edited row, if it can not be matched then find its possible matches
+        match: Optional[DB_Transaction] = self._find_match(
+            row.statement_trans, self._matched_id_set
+        )
+        if match:
+            self._claim(row, match, change_set)
+        else:
+            row.possible_match_list = self._find_possible_matches(
+                row.statement_trans, self._matched_id_set
+            )
+            change_set.possible_match_changed = True
+
+        # The released transaction may be an exact match for another row, if not it becomes an orphan
+        if released_trans and released_trans is not match:
+            self._release(released_trans, change_set)
+
+        return change_set
+
+    def _claim(
+        self,
+        row: Reconcile_Session.Row,
+        db_trans: DB_Transaction,
+        change_set: Reconcile_Session.Change_Set,
     ) -> None:
         """
-        Set the merchant for a statement transaction in the current reconcile session.
+        Match a database transaction to a statement row and remove it from the orphans and other possible matches.
 
         Args:
-            row_id: ID of the row to be edited.
-            new_merchant: New merchant.
+            row: Statement row that is being matched.
+            db_trans: Database transaction that is not matched to any row.
+            change_set: Change set to record the changes in.
         """
 
-        self.reconcile_row_list[row_id].statement_trans.merchant = new_merchant
-        self.match()
+        if row.possible_match_list:
+            change_set.possible_match_changed = True
+
+        row.matched_trans = db_trans
+        row.possible_match_list = None
+        self._matched_id_set.add(db_trans.id)
+        change_set.row_id_set.add(row.statement_trans.row_id)
+
+        # Remove the transaction from the possible matches of the other rows
+        for other_row in self.reconcile_row_list:
+            if (
+                other_row.possible_match_list
+                and db_trans in other_row.possible_match_list
+            ):
+                other_row.possible_match_list.remove(db_trans)
+                change_set.row_id_set.add(other_row.statement_trans.row_id)
+                change_set.possible_match_changed = True
+
+        # Remove the transaction from the orphans
+        if db_trans in self.orphan_list:
+            self.orphan_list.remove(db_trans)
+            change_set.removed_orphan_id_set.add(db_trans.id)
+
+    def _release(
+        self, db_trans: DB_Transaction, change_set: Reconcile_Session.Change_Set
+    ) -> None:
+        """
+        Find a new row for a database transaction that is no longer matched, if there is none then make it an orphan.
+
+        Args:
+            db_trans: Database transaction that is not matched to any row.
+            change_set: Change set to record the changes in.
+        """
+
+        # The first unmatched row that the transaction matches exactly claims it
+        for row in self.reconcile_row_list:
+            if (
+                not row.matched_trans
+                and self.matching_trans_fields(row.statement_trans, db_trans) == 3
+            ):
+                self._claim(row, db_trans, change_set)
+                return
+
+        # Add the transaction to the possible matches of the unmatched rows it might match
+        for row in self.reconcile_row_list:
+            if (
+                row.matched_trans
+                or (row.possible_match_list and db_trans in row.possible_match_list)
+                or self.matching_trans_fields(row.statement_trans, db_trans) != 2
+            ):
+                continue
+
+            row.possible_match_list = sorted(
+                (row.possible_match_list or []) + [db_trans],
+                key=lambda x: self._db_trans_positions[x.id],
+            )
+            change_set.row_id_set.add(row.statement_trans.row_id)
+            change_set.possible_match_changed = True
+
+        # Make the transaction an orphan
+        self.orphan_list.append(db_trans)
+        self.orphan_list.sort(key=lambda x: x.date, reverse=True)
+        change_set.added_orphan_list.append(db_trans)
 
     def committable(self) -> bool:
         """
@@ -218,17 +572,49 @@ class Reconcile_Session:
 
         return True
 
+    @staticmethod
+    def statement_name(statement_path: Path, st_trans: ST_Transaction) -> str:
+        """
+        Get the name stamped on a database transaction reconciled against a statement row.
+
+        Args:
+            statement_path: Path to the statement.
+            st_trans: Statement row the transaction was matched to.
+
+        Return: Statement file name, row ID and row date, the date keeps statements that reuse a file name apart.
+        """
+
+        return f"{statement_path.name}:{st_trans.row_id}:{st_trans.date:%Y-%m-%d}"
+
     def commit(self) -> None:
         """
         Try to commit the session.
+
+        Every matched transaction is marked reconciled and stamped with its statement row by one bulk update in a single database transaction.
         """
 
         if not self.committable():
             raise RuntimeError("Session is not committable")
 
-        with Session(engine) as session:
-            for row in self.reconcile_row_list:
-                db_trans: DB_Transaction = row.matched_trans
-                db_trans.reconciled_status = True
-                session.add(db_trans)
+        value_list: list[dict] = list(
+            {
+                "id": row.matched_trans.id,
+                "reconciled_status": True,
+                "statement_name": Reconcile_Session.statement_name(
+                    self._statement_path, row.statement_trans
+                ),
+            }
+            for row in self.reconcile_row_list
+        )
+
+        with Session_Manager.unit_of_work() as session:
+            # Bulk update by primary key, the statement is compiled once and executed for every row
+            session.execute(update(DB_Transaction), value_list)
             session.commit()
+
+        # The bulk update does not touch the loaded transactions, set the committed values on them instead of expiring them so they are not loaded again
+        for row, values in zip(self.reconcile_row_list, value_list):
+            set_committed_value(row.matched_trans, "reconciled_status", True)
+            set_committed_value(
+                row.matched_trans, "statement_name", values["statement_name"]
+            )
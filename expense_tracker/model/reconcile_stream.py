@@ -0,0 +1,385 @@
+# expense_tracker/model/reconcile_stream.py
+
+from __future__ import annotations
+
+from collections import deque
+
+from dataclasses import dataclass, field
+
+from datetime import date, datetime, time, timedelta
+
+from itertools import chain
+
+from pathlib import Path
+
+from typing import Iterator, Optional
+
+from sqlalchemy import Row, Select, select, update
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_transaction import DB_Transaction
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+from expense_tracker.model.orm.db_amount import DB_Amount
+from expense_tracker.model.orm.db_account import DB_Account
+from expense_tracker.model.orm.db_merchant_location import DB_Merchant_Location
+from expense_tracker.model.orm.db_tag import DB_Tag
+from expense_tracker.model.orm.db_budget import DB_Budget
+from expense_tracker.model.orm.db_month_budget import DB_Month_Budget
+
+from expense_tracker.model.statement_manager import Statement, ST_Transaction
+from expense_tracker.model.reconcile_matcher import Reconcile_Matcher
+from expense_tracker.model.reconcile_session import Reconcile_Session
+from expense_tracker.model.session_manager import Session_Manager
+
+
+class Reconcile_Stream:
+    """
+    Reconcile a statement without loading the whole statement or the account's unreconciled transactions.
+
+    The statement must be in date order, oldest or newest first. It is read a batch at a time while the unreconciled transactions are read in the same date order, only the transactions within the date tolerance of the current statement row are kept. Rows are matched the same way as Reconcile_Session.match, each group of rows that compete for transactions is assigned once no later row can join it.
+    """
+
+    # Number of database transactions read and updated at a time
+    BATCH_SIZE: int = 1000
+
+    @dataclass
+    class Result:
+        """
+        Counts of a committed stream.
+        """
+
+        matched_count: int = 0
+        unmatched_count: int = 0
+
+        # Unreconciled transactions within the dates of the statement that were not matched
+        orphan_count: int = 0
+
+    @dataclass
+    class _Group:
+        """
+        Statement rows that compete for the same transactions and have not been assigned yet.
+        """
+
+        # Possible matches of each row and their costs by row ID and then transaction ID
+        edge_dict: dict[int, dict[int, float]] = field(default_factory=dict)
+
+        row_dict: dict[int, ST_Transaction] = field(default_factory=dict)
+        db_row_dict: dict[int, Row] = field(default_factory=dict)
+
+        # Day number of the last row added, rows are added in date order
+        last_day: int = 0
+
+    def __init__(self, statement_path: Path, account_id: int) -> None:
+        """
+        Initializes the class.
+
+        Args:
+            statement_path: Path to statement.
+            account_id: ID of the account that the statement belongs to.
+        """
+
+        self._statement_path: Path = Path(statement_path)
+        self._account_id: int = account_id
+
+        # Number of unreconciled transactions within the dates of the statement that the last match did not match
+        self._orphan_count: int = 0
+
+    def match(self, session: Session) -> Iterator[tuple[ST_Transaction, Optional[Row]]]:
+        """
+        Match the statement rows to the unreconciled transactions of the account.
+
+        Rows are produced in date order of their groups, not in statement order.
+
+        Args:
+            session: Session to read the transactions with.
+
+        Return: Generator of each statement row and the row of the transaction it matched, None if it did not match.
+        """
+
+        tolerance: int = Reconcile_Matcher.DATE_TOLERANCE_DAYS
+        cents_tolerance: int = round(Reconcile_Matcher.AMOUNT_TOLERANCE * 100)
+        self._orphan_count = 0
+
+        st_trans_iter: Iterator[ST_Transaction] = (
+            st_trans
+            for batch in Statement(self._statement_path, self._account_id).get_batches()
+            for st_trans in self._drop_reconciled_rows(session, batch)
+        )
+
+        # Read until the second date of the statement to find its order
+        buffer_list: list[ST_Transaction] = []
+        for st_trans in st_trans_iter:
+            buffer_list.append(st_trans)
+            if st_trans.date.date() != buffer_list[0].date.date():
+                break
+
+        if not buffer_list:
+            return
+
+        # Dates are compared as day numbers, negated for newest first statements so both orders are walked the same way
+        direction: int = -1 if buffer_list[-1].date < buffer_list[0].date else 1
+
+        def day_number(trans_date: date) -> int:
+            return direction * trans_date.toordinal()
+
+        db_row_iter: Iterator[Row] = iter(
+            session.execute(
+                self._transaction_query(buffer_list[0].date.date(), direction)
+            )
+        )
+        next_db_row: Optional[Row] = next(db_row_iter, None)
+
+        # Transactions from the first date of the statement that were read and that were matched, the ones after its last date are taken off at the end
+        first_day: int = day_number(buffer_list[0].date.date())
+        read_count: int = 0
+        matched_count: int = 0
+
+        def assign_group(
+            group_id: int,
+        ) -> Iterator[tuple[ST_Transaction, Optional[Row]]]:
+            nonlocal matched_count
+            for st_trans, db_row in self._assign_group(
+                group_dict, db_group_dict, group_id
+            ):
+                if (
+                    db_row is not None
+                    and first_day <= day_number(db_row.date.date()) <= current_day
+                ):
+                    matched_count += 1
+                yield st_trans, db_row
+
+        # Transactions within the tolerance of the current row in date order, and indexed by amount and merchant, every transaction in the index entry of a row's amount and merchant matches it
+        window: deque[tuple[int, tuple[int, int], Row]] = deque()
+        window_index: dict[tuple[int, int], deque[Row]] = {}
+
+        # Groups that have not been assigned by the row ID of their first row, and the group each transaction they can match belongs to
+        group_dict: dict[int, Reconcile_Stream._Group] = {}
+        db_group_dict: dict[int, int] = {}
+
+        current_day: Optional[int] = None
+        for st_trans in chain(buffer_list, st_trans_iter):
+            st_day: int = day_number(st_trans.date.date())
+
+            if current_day is not None and st_day < current_day:
+                raise ValueError(
+                    f"Statement row {st_trans.row_id} is not in date order, the statement must be sorted by date"
+                )
+
+            if st_day != current_day:
+                current_day = st_day
+
+                # Groups whose rows are more than twice the tolerance behind can not share a transaction with this row or any after it
+                for group_id in list(group_dict):
+                    if group_dict[group_id].last_day < current_day - 2 * tolerance:
+                        yield from assign_group(group_id)
+
+                while window and window[0][0] < current_day - tolerance:
+                    _, index_key, _ = window.popleft()
+                    window_index[index_key].popleft()
+                    if not window_index[index_key]:
+                        del window_index[index_key]
+
+            while next_db_row is not None:
+                db_day: int = day_number(next_db_row.date.date())
+                if db_day > current_day + tolerance:
+                    break
+
+                read_count += db_day >= first_day
+                cents, _, merchant_id = Reconcile_Matcher.transaction_key(next_db_row)
+                window.append((db_day, (cents, merchant_id), next_db_row))
+                window_index.setdefault((cents, merchant_id), deque()).append(
+                    next_db_row
+                )
+                next_db_row = next(db_row_iter, None)
+
+            cents, _, merchant_id = Reconcile_Matcher.statement_key(st_trans)
+            row_edge_dict: dict[int, float] = {}
+            row_db_row_dict: dict[int, Row] = {}
+            for other_cents in range(
+                cents - cents_tolerance, cents + cents_tolerance + 1
+            ):
+                for db_row in window_index.get((other_cents, merchant_id), ()):
+                    row_edge_dict[db_row.id] = Reconcile_Matcher.cost(st_trans, db_row)
+                    row_db_row_dict[db_row.id] = db_row
+
+            if not row_edge_dict:
+                yield st_trans, None
+                continue
+
+            # The row joins the groups of every transaction it can match, and merges them
+            group_id_list: list[int] = sorted(
+                set(
+                    db_group_dict[db_id]
+                    for db_id in row_edge_dict
+                    if db_id in db_group_dict
+                )
+            )
+            group_id: int = group_id_list[0] if group_id_list else st_trans.row_id
+            group: Reconcile_Stream._Group = group_dict.setdefault(
+                group_id, Reconcile_Stream._Group()
+            )
+            for other_group_id in group_id_list[1:]:
+                other_group: Reconcile_Stream._Group = group_dict.pop(other_group_id)
+                group.edge_dict.update(other_group.edge_dict)
+                group.row_dict.update(other_group.row_dict)
+                group.db_row_dict.update(other_group.db_row_dict)
+                for db_id in other_group.db_row_dict:
+                    db_group_dict[db_id] = group_id
+
+            group.edge_dict[st_trans.row_id] = row_edge_dict
+            group.row_dict[st_trans.row_id] = st_trans
+            group.db_row_dict.update(row_db_row_dict)
+            for db_id in row_edge_dict:
+                db_group_dict[db_id] = group_id
+            group.last_day = st_day
+
+        for group_id in list(group_dict):
+            yield from assign_group(group_id)
+
+        # Transactions after the last date of the statement are all still in the window
+        read_count -= sum(1 for db_day, _, _ in window if db_day > current_day)
+        self._orphan_count = read_count - matched_count
+
+    def _drop_reconciled_rows(
+        self, session: Session, batch: list[ST_Transaction]
+    ) -> list[ST_Transaction]:
+        """
+        Leave out the statement rows of a batch that were already reconciled, by an earlier stream or an interactive session.
+
+        Args:
+            session: Session to read the transactions with.
+            batch: Batch of statement rows.
+
+        Return: Rows of the batch whose statement name is not stamped on any transaction.
+        """
+
+        name_dict: dict[str, ST_Transaction] = {
+            Reconcile_Session.statement_name(self._statement_path, st_trans): st_trans
+            for st_trans in batch
+        }
+        reconciled_name_set: set[str] = set(
+            session.scalars(
+                select(DB_Transaction.statement_name).where(
+                    DB_Transaction.statement_name.in_(name_dict)
+                )
+            )
+        )
+
+        return list(
+            st_trans
+            for name, st_trans in name_dict.items()
+            if name not in reconciled_name_set
+        )
+
+    def _transaction_query(self, first_date: date, direction: int) -> Select:
+        """
+        Get the query that reads the unreconciled transactions of the account from the first date of the statement.
+
+        Args:
+            first_date: Date of the first statement row.
+            direction: 1 if the statement is oldest first, -1 if it is newest first.
+
+        Return: Query for the columns that are matched, in the order of the statement.
+        """
+
+        tolerance: timedelta = timedelta(days=Reconcile_Matcher.DATE_TOLERANCE_DAYS)
+        query: Select = (
+            select(
+                DB_Transaction.id,
+                DB_Transaction.description,
+                DB_Transaction.merchant_id,
+                DB_Transaction.date,
+                DB_Transaction.total,
+            )
+            .where(DB_Transaction.reconciled_status == False)
+            .where(DB_Transaction.account_id == self._account_id)
+            .execution_options(yield_per=Reconcile_Stream.BATCH_SIZE)
+        )
+
+        if direction == 1:
+            return query.where(
+                DB_Transaction.date >= datetime.combine(first_date - tolerance, time())
+            ).order_by(DB_Transaction.date, DB_Transaction.id)
+
+        return query.where(
+            DB_Transaction.date
+            < datetime.combine(first_date + tolerance + timedelta(days=1), time())
+        ).order_by(DB_Transaction.date.desc(), DB_Transaction.id.desc())
+
+    @staticmethod
+    def _assign_group(
+        group_dict: dict[int, Reconcile_Stream._Group],
+        db_group_dict: dict[int, int],
+        group_id: int,
+    ) -> Iterator[tuple[ST_Transaction, Optional[Row]]]:
+        """
+        Assign a group that can not grow any more and forget it.
+
+        Args:
+            group_dict: Groups that have not been assigned by ID.
+            db_group_dict: ID of the group each transaction the groups can match belongs to.
+            group_id: ID of the group to assign.
+
+        Return: Generator of each statement row of the group and the row of the transaction it matched, None if it did not match.
+        """
+
+        group: Reconcile_Stream._Group = group_dict.pop(group_id)
+        for db_id in group.db_row_dict:
+            del db_group_dict[db_id]
+
+        # Most groups are a single row and transaction
+        assignment_dict: dict[int, int] = (
+            {row_id: db_id for row_id, db_id in zip(group.row_dict, group.db_row_dict)}
+            if len(group.row_dict) == 1 and len(group.db_row_dict) == 1
+            else Reconcile_Matcher.assign(group.edge_dict)
+        )
+
+        for row_id in sorted(group.row_dict):
+            db_id: Optional[int] = assignment_dict.get(row_id)
+            yield group.row_dict[row_id], (
+                group.db_row_dict[db_id] if db_id is not None else None
+            )
+
+    def commit(self) -> Reconcile_Stream.Result:
+        """
+        Mark every matched transaction reconciled and stamp it with its statement row, the transactions are updated a batch at a time in a single database transaction.
+
+        Rows that do not match are left for an interactive reconcile session.
+
+        Return: Counts of the matched and unmatched rows and of the transactions that were not matched.
+        """
+
+        result: Reconcile_Stream.Result = Reconcile_Stream.Result()
+        value_list: list[dict] = []
+
+        with Session(engine) as session:
+            for st_trans, db_row in self.match(session):
+                if db_row is None:
+                    result.unmatched_count += 1
+                    continue
+
+                result.matched_count += 1
+                value_list.append(
+                    {
+                        "id": db_row.id,
+                        "reconciled_status": True,
+                        "statement_name": Reconcile_Session.statement_name(
+                            self._statement_path, st_trans
+                        ),
+                    }
+                )
+                if len(value_list) == Reconcile_Stream.BATCH_SIZE:
+                    session.execute(update(DB_Transaction), value_list)
+                    value_list = []
+
+            if value_list:
+                session.execute(update(DB_Transaction), value_list)
+            session.commit()
+
+        result.orphan_count = self._orphan_count
+
+        # Transactions loaded by the shared session are out of date
+        Session_Manager.expire()
+
+        return result
@@ -0,0 +1,136 @@
+# expense_tracker/model/schema_manager.py
+
+from typing import Callable
+
+from sqlalchemy import Connection, Engine, Inspector, inspect, text
+
+from expense_tracker.model.orm import Base
+from expense_tracker.model.orm.db_transaction import DB_Transaction
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+from expense_tracker.model.orm.db_amount import DB_Amount
+from expense_tracker.model.orm.db_account import DB_Account
+from expense_tracker.model.orm.db_merchant_location import DB_Merchant_Location
+from expense_tracker.model.orm.db_tag import DB_Tag
+from expense_tracker.model.orm.db_budget import DB_Budget
+from expense_tracker.model.orm.db_month_budget import DB_Month_Budget
+from expense_tracker.model.orm.db_reconcile_checkpoint import DB_Reconcile_Checkpoint
+from expense_tracker.model.orm.db_reconcile_checkpoint_row import (
+    DB_Reconcile_Checkpoint_Row,
+)
+
+
+class Schema_Manager:
+    """
+    Creates the database and brings existing databases up to date with the ORM models.
+
+    The schema version of a database is stored in SQLite's user_version pragma. Each migration step upgrades the schema by one version and is only run on databases that have not had it applied yet.
+    """
+
+    @staticmethod
+    def _create_missing_indexes(connection: Connection) -> None:
+        """
+        Create the indexes declared on the models that an existing database does not have yet.
+
+        Indexes on columns that a later step adds are skipped, that step creates them.
+
+        Args:
+            connection: Connection to the database being migrated.
+        """
+
+        inspector: Inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            column_name_set: set[str] = set(
+                column["name"] for column in inspector.get_columns(table.name)
+            )
+            for index in table.indexes:
+                if set(column.name for column in index.columns) <= column_name_set:
+                    index.create(connection, checkfirst=True)
+
+        # Give the query planner statistics for the new indexes
+        connection.execute(text("ANALYZE"))
+
+    @staticmethod
+    def _add_transaction_total(connection: Connection) -> None:
+        """
+        Add the stored total column to transactions, fill it from the amounts and index it.
+
+        Args:
+            connection: Connection to the database being migrated.
+        """
+
+        if "total" not in set(
+            column["name"] for column in inspect(connection).get_columns("transactions")
+        ):
+            connection.execute(
+                text(
+                    "ALTER TABLE transactions ADD COLUMN total FLOAT NOT NULL DEFAULT 0"
+                )
+            )
+        connection.execute(
+            text(
+                "UPDATE transactions SET total = COALESCE("
+                "(SELECT SUM(amount) FROM amounts WHERE transaction_id = transactions.id), 0)"
+            )
+        )
+        Schema_Manager._create_missing_indexes(connection)
+
+    # Migration steps in order, the schema version of a database is the number of steps applied to it. Set after the class, staticmethod objects in the class body can not be called before Python 3.10
+    _STEP_LIST: list[Callable[[Connection], None]]
+
+    @staticmethod
+    def get_schema_version(connection: Connection) -> int:
+        """
+        Get the schema version of a database.
+
+        Args:
+            connection: Connection to the database.
+
+        Return: Number of migration steps that have been applied to the database.
+        """
+
+        return connection.execute(text("PRAGMA user_version")).scalar()
+
+    @staticmethod
+    def migrate(engine: Engine) -> int:
+        """
+        Create any missing tables and apply the migration steps that the database has not had yet.
+
+        New databases are created with the current models and only need their version set.
+
+        Args:
+            engine: Engine of the database to migrate.
+
+        Return: Number of migration steps that were applied.
+        """
+
+        with engine.begin() as connection:
+            new_database: bool = not Base.metadata.tables.keys() & set(
+                connection.dialect.get_table_names(connection)
+            )
+            Base.metadata.create_all(connection)
+
+            version: int = Schema_Manager.get_schema_version(connection)
+            if new_database:
+                version = len(Schema_Manager._STEP_LIST)
+
+            applied_count: int = 0
+            for step in Schema_Manager._STEP_LIST[version:]:
+                step(connection)
+                applied_count += 1
+
+            # Pragma values can not be bound as parameters
+            connection.execute(
+                text(
+                    f"PRAGMA user_version = {max(version, len(Schema_Manager._STEP_LIST))}"
+                )
+            )
+
+        return applied_count
+
+
+Schema_Manager._STEP_LIST = [
+    Schema_Manager._create_missing_indexes,
+    # Merchant location coordinate index
+    Schema_Manager._create_missing_indexes,
+    Schema_Manager._add_transaction_total,
+]
@@ -0,0 +1,136 @@
+# expense_tracker/model/session_manager.py
+
+from collections import OrderedDict
+
+from contextlib import contextmanager
+
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+
+from expense_tracker.model.orm import engine
+
+
+class Session_Manager:
+    """
+    Long lived session shared by the presenters and the reconcile session, one per thread.
+
+    Objects loaded through the shared session stay in its identity map between calls, so looking up a row that is already loaded does not query the database again and objects never have to be re-attached to a new session. The identity map only holds weak references, the session keeps strong references to the MAX_REFERENCE_COUNT objects that were loaded most recently and anything else stays loaded only while the caller holds it, so memory does not grow with every row that was ever shown.
+
+    Objects that are still loaded are not refreshed when their rows are changed outside the shared session. Anything that writes through another session or a bulk statement must call expire, objects that were dropped are read again the next time they are used.
+    """
+
+    # Most objects kept loaded after their caller has let go of them
+    MAX_REFERENCE_COUNT: int = 10000
+
+    # Commits do not expire loaded objects, they are only expired explicitly
+    _session_factory: sessionmaker = sessionmaker(engine, expire_on_commit=False)
+    _scoped_session: scoped_session = scoped_session(_session_factory)
+
+    @staticmethod
+    def _hold_reference(session: Session, instance: object) -> None:
+        """
+        Keep a reference to an object that became persistent in a shared session, the identity map only holds weak references so unreferenced objects would be loaded again. The reference to the object that was loaded longest ago is dropped once there are more than MAX_REFERENCE_COUNT.
+
+        Args:
+            session: Shared session the object belongs to.
+            instance: Object that became persistent.
+        """
+
+        reference_dict: OrderedDict = session.info.setdefault(
+            "reference_dict", OrderedDict()
+        )
+        reference_dict[instance] = None
+        reference_dict.move_to_end(instance)
+        if len(reference_dict) > Session_Manager.MAX_REFERENCE_COUNT:
+            reference_dict.popitem(last=False)
+
+    @staticmethod
+    def _release_reference(session: Session, instance: object) -> None:
+        """
+        Drop the reference to an object that is no longer persistent in a shared session.
+
+        Args:
+            session: Shared session the object belonged to.
+            instance: Object that stopped being persistent.
+        """
+
+        session.info.setdefault("reference_dict", OrderedDict()).pop(instance, None)
+
+    @staticmethod
+    def get_session() -> Session:
+        """
+        Get the shared session of the current thread, it is created the first time it is needed.
+
+        Return: Shared session.
+        """
+
+        return Session_Manager._scoped_session()
+
+    @staticmethod
+    @contextmanager
+    def unit_of_work() -> Iterator[Session]:
+        """
+        Use the shared session for one unit of work, changes that were not committed are rolled back if the work raises.
+
+        The session is left open when the work is done so the objects it loaded can be used again.
+
+        Return: Shared session of the current thread.
+        """
+
+        session: Session = Session_Manager.get_session()
+        try:
+            yield session
+        except BaseException:
+            session.rollback()
+            raise
+
+    @staticmethod
+    def expire(instance_list: Optional[list[object]] = None) -> None:
+        """
+        Expire loaded objects so their attributes are loaded from the database the next time they are used.
+
+        Args:
+            instance_list: Objects to expire, every object in the shared session of the current thread is expired if not provided.
+        """
+
+        session: Session = Session_Manager.get_session()
+
+        if instance_list is None:
+            session.expire_all()
+            return
+
+        for instance in instance_list:
+            if instance in session:
+                session.expire(instance)
+
+    @staticmethod
+    def remove() -> None:
+        """
+        Close the shared session of the current thread and forget every object it loaded, a new session is created the next time one is needed.
+        """
+
+        Session_Manager._scoped_session.remove()
+
+
+for event_name in (
+    "pending_to_persistent",
+    "deleted_to_persistent",
+    "detached_to_persistent",
+    "loaded_as_persistent",
+):
+    event.listen(
+        Session_Manager._session_factory, event_name, Session_Manager._hold_reference
+    )
+
+for event_name in (
+    "persistent_to_detached",
+    "persistent_to_deleted",
+    "persistent_to_transient",
+):
+    event.listen(
+        Session_Manager._session_factory,
+        event_name,
+        Session_Manager._release_reference,
+    )
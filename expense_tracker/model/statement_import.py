@@ -0,0 +1,233 @@
+# expense_tracker/model/statement_import.py
+
+import re
+
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+
+from dataclasses import dataclass
+
+from datetime import datetime
+
+from pathlib import Path
+
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.merchant_matcher import Merchant_Matcher
+from expense_tracker.model.statement_manager import Statement, ST_Transaction
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+from expense_tracker.model.orm.db_account import DB_Account
+
+
+@dataclass
+class Staged_Statement:
+    """
+    Statement that has been parsed and merchant matched and is waiting to be reconciled.
+    """
+
+    statement_path: Path
+    account_id: int
+    st_trans_list: list[ST_Transaction]
+
+
+# Work sent to a worker process, the statement path, the account column indexes and the merchant naming rules
+_Statement_Job = tuple[str, tuple[int, int, int, int], list[tuple[int, str, str]]]
+
+# Row returned from a worker process, merchants are returned by id
+_Parsed_Row = tuple[int, str, Optional[int], datetime, float]
+
+
+def _parse_statement(job: _Statement_Job) -> list[_Parsed_Row]:
+    """
+    Parse and merchant match one statement in a worker process.
+
+    Workers do not read the database, the account column indexes and merchant naming rules are sent with the job.
+
+    Args:
+        job: Statement path, account id and column indexes, and merchant id, name and naming rule list.
+
+    Return: List of the parsed rows with the id of their merchant.
+    """
+
+    statement_path, account_columns, merchant_rule_list = job
+    account_id, description_index, amount_index, date_index = account_columns
+
+    Merchant_Matcher.load(
+        list(
+            DB_Merchant(id=merchant_id, name=name, naming_rule=naming_rule)
+            for merchant_id, name, naming_rule in merchant_rule_list
+        )
+    )
+
+    statement: Statement = Statement(
+        Path(statement_path),
+        account_id,
+        DB_Account(
+            id=account_id,
+            statement_description_column_index=description_index,
+            statement_amount_column_index=amount_index,
+            statement_date_column_index=date_index,
+        ),
+    )
+
+    return list(
+        (
+            st_trans.row_id,
+            st_trans.description,
+            st_trans.merchant.id if st_trans.merchant else None,
+            st_trans.date,
+            st_trans.amount,
+        )
+        for batch in statement.get_batches()
+        for st_trans in batch
+    )
+
+
+class Statement_Import:
+    """
+    Parses a directory of statements for many accounts at once.
+    """
+
+    @staticmethod
+    def map_statements(directory: Path) -> dict[Path, int]:
+        """
+        Match each csv in a directory to the account whose name the file name starts with.
+
+        Case, spaces, dashes and underscores are ignored when comparing names and the longest matching account name wins. Files that do not match an account, or whose account does not have statement columns set, are skipped.
+
+        Args:
+            directory: Directory containing statement csv files.
+
+        Return: Dict of statement path to account id.
+        """
+
+        with Session(engine) as session:
+            account_list: list[DB_Account] = session.query(DB_Account).all()
+
+        # Longest names first so "Credit Card Business" wins over "Credit Card"
+        name_list: list[tuple[str, int]] = sorted(
+            (
+                (Statement_Import._normalize_name(account.name), account.id)
+                for account in account_list
+                if account.statement_description_column_index is not None
+                and account.statement_amount_column_index is not None
+                and account.statement_date_column_index is not None
+            ),
+            key=lambda name: len(name[0]),
+            reverse=True,
+        )
+
+        statement_dict: dict[Path, int] = {}
+        for statement_path in sorted(directory.glob("*.csv")):
+            file_name: str = Statement_Import._normalize_name(statement_path.stem)
+            for account_name, account_id in name_list:
+                if account_name and file_name.startswith(account_name):
+                    statement_dict[statement_path] = account_id
+                    break
+
+        return statement_dict
+
+    @staticmethod
+    def _normalize_name(name: str) -> str:
+        """
+        Lower case a name and remove the separators that file names and account names use differently.
+        """
+
+        return re.sub(r"[\s_\-]", "", name.lower())
+
+    @staticmethod
+    def import_statements(
+        statement_dict: dict[Path, int], max_workers: Optional[int] = None
+    ) -> list[Staged_Statement]:
+        """
+        Parse and merchant match many statements in parallel worker processes.
+
+        Args:
+            statement_dict: Dict of statement path to the id of the account it belongs to.
+            max_workers: Number of worker processes, defaults to one per statement up to the number of cpus.
+
+        Return: List of Staged_Statement in the order of statement_dict.
+        """
+
+        if not statement_dict:
+            return []
+
+        with Session(engine) as session:
+            account_dict: dict[int, DB_Account] = {
+                account.id: account
+                for account in session.query(DB_Account)
+                .where(DB_Account.id.in_(set(statement_dict.values())))
+                .all()
+            }
+
+        if max_workers is None:
+            max_workers = min(len(statement_dict), multiprocessing.cpu_count())
+
+        # Starting worker processes only pays off when there is more than one
+        if max_workers <= 1:
+            return list(
+                Staged_Statement(
+                    statement_path,
+                    account_id,
+                    Statement(
+                        statement_path, account_id, account_dict[account_id]
+                    ).get_all(),
+                )
+                for statement_path, account_id in statement_dict.items()
+            )
+
+        merchant_list: list[DB_Merchant] = Merchant_Matcher.get_merchant_list()
+        merchant_dict: dict[int, DB_Merchant] = {
+            merchant.id: merchant for merchant in merchant_list
+        }
+        merchant_rule_list: list[tuple[int, str, str]] = list(
+            (merchant.id, merchant.name, merchant.naming_rule)
+            for merchant in merchant_list
+        )
+
+        job_list: list[_Statement_Job] = list(
+            (
+                str(statement_path),
+                (
+                    account_id,
+                    account_dict[account_id].statement_description_column_index,
+                    account_dict[account_id].statement_amount_column_index,
+                    account_dict[account_id].statement_date_column_index,
+                ),
+                merchant_rule_list,
+            )
+            for statement_path, account_id in statement_dict.items()
+        )
+
+        # Spawn workers instead of forking, the app runs threads that a forked worker would copy in an unknown state
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            parsed_list: list[list[_Parsed_Row]] = list(
+                executor.map(_parse_statement, job_list)
+            )
+
+        return list(
+            Staged_Statement(
+                statement_path,
+                account_id,
+                list(
+                    ST_Transaction(
+                        row_id,
+                        description,
+                        merchant_dict.get(merchant_id),
+                        date,
+                        amount,
+                    )
+                    for row_id, description, merchant_id, date, amount in row_list
+                ),
+            )
+            for (statement_path, account_id), row_list in zip(
+                statement_dict.items(), parsed_list
+            )
+        )
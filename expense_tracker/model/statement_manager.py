@@ -1,6 +1,9 @@
 # expense_tracker/model/statement_manager.py
 
 import csv
+import re
+
+from functools import lru_cache
 
 from dataclasses import dataclass
 
@@ -8,7 +11,7 @@ from datetime import datetime
 
 from pathlib import Path
 
-from typing import Optional
+from typing import Iterator, Optional
 
 from sqlalchemy.orm import Session
 
@@ -41,13 +44,25 @@ class Statement:
     Bank statement ORM
     """
 
-    def __init__(self, statement_path: Path, account_id: int) -> None:
+    # Number of rows in each batch read from the statement
+    BATCH_SIZE: int = 1000
+
+    # Month/day/year dates in the form STATEMENT_DATE_FORMAT reads them
+    _DATE_PATTERN: re.Pattern = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+    def __init__(
+        self,
+        statement_path: Path,
+        account_id: int,
+        account: Optional[DB_Account] = None,
+    ) -> None:
         """
         Initializes the class.
 
         Args:
             statement_path: Path to statement.
             account_id: ID of the account that the statement belongs to.
+            account: Account to read the statement column indexes from, loaded using account_id if not provided.
         """
 
         if not statement_path.suffix == ".csv":
@@ -55,15 +70,18 @@ class Statement:
 
         self.statement_path: Path = statement_path
 
-        with Session(engine) as session:
-            self.account: DB_Account = (
-                session.query(DB_Account).where(DB_Account.id == account_id).first()
-            )
-            self._description_column_index: int = (
-                self.account.statement_description_column_index
-            )
-            self._amount_column_index: int = self.account.statement_amount_column_index
-            self._date_column_index: int = self.account.statement_date_column_index
+        if account is None:
+            with Session(engine) as session:
+                account = (
+                    session.query(DB_Account).where(DB_Account.id == account_id).first()
+                )
+
+        self.account: DB_Account = account
+        self._description_column_index: int = (
+            self.account.statement_description_column_index
+        )
+        self._amount_column_index: int = self.account.statement_amount_column_index
+        self._date_column_index: int = self.account.statement_date_column_index
 
         self._max_required_index: int = max(
             self._description_column_index,
@@ -78,69 +96,115 @@ class Statement:
         Return: List of readable rows in ST_Transaction format.
         """
 
-        st_trans_list: list[ST_Transaction] = []
+        return list(st_trans for batch in self.get_batches() for st_trans in batch)
+
+    def get_batches(
+        self, batch_size: Optional[int] = None
+    ) -> Iterator[list[ST_Transaction]]:
+        """
+        Read the statement a batch of rows at a time so only one batch is held in memory.
+
+        Args:
+            batch_size: Number of readable rows in each batch, defaults to BATCH_SIZE.
+
+        Return: Generator of lists of readable rows in ST_Transaction format.
+        """
+
+        if batch_size is None:
+            batch_size = Statement.BATCH_SIZE
 
         with open(self.statement_path) as statement_file:
             csv_parser: csv = csv.reader(statement_file, delimiter=",")
 
             id_counter: int = 0
+            row_list: list[tuple[str, datetime, float]] = []
 
             for row in csv_parser:
-                if not self._valid_statement_row(row):
+                parsed_row: Optional[tuple[str, datetime, float]] = self._parse_row(row)
+                if not parsed_row:
                     continue
 
-                st_trans_list.append(
-                    ST_Transaction(
-                        id_counter,
-                        row[self._description_column_index],
-                        DB_Util.get_merchant_from_description(
-                            row[self._description_column_index]
-                        ),
-                        datetime.strptime(
-                            row[self._date_column_index],
-                            Constants.STATEMENT_DATE_FORMAT,
-                        ),
-                        float(row[self._amount_column_index]),
-                    )
-                )
+                row_list.append(parsed_row)
+                if len(row_list) == batch_size:
+                    yield self._create_batch(row_list, id_counter)
+                    id_counter += len(row_list)
+                    row_list = []
+
+            if row_list:
+                yield self._create_batch(row_list, id_counter)
+
+    @staticmethod
+    def _create_batch(
+        row_list: list[tuple[str, datetime, float]], first_row_id: int
+    ) -> list[ST_Transaction]:
+        """
+        Find the merchants for a batch of parsed rows and convert them to ST_Transactions.
+
+        Args:
+            row_list: Parsed rows containing the description, date and amount.
+            first_row_id: Row id of the first row in the batch.
+
+        Return: List of rows in ST_Transaction format.
+        """
 
-                id_counter += 1
+        merchant_list: list[
+            Optional[DB_Merchant]
+        ] = DB_Util.get_merchants_from_descriptions(list(row[0] for row in row_list))
 
-        return st_trans_list
+        return list(
+            ST_Transaction(first_row_id + index, description, merchant, date, amount)
+            for index, ((description, date, amount), merchant) in enumerate(
+                zip(row_list, merchant_list)
+            )
+        )
 
-    def _valid_statement_row(self, row: tuple[str, ...]) -> bool:
+    def _parse_row(self, row: tuple[str, ...]) -> Optional[tuple[str, datetime, float]]:
         """
-        Check if the row is readable.
+        Read the description, date and amount from a row.
 
         Args:
             row: Tuple containing the row info.
 
-        Return: True if row is valid false if not.
+        Return: Tuple of the description, date and amount, or None if the row is not readable.
         """
+
         if len(row) - 1 < self._max_required_index:
-            return False
+            return None
 
         try:
-            float(row[self._amount_column_index])
+            amount: float = float(row[self._amount_column_index])
         except ValueError:
-            return False
+            return None
 
-        if not self._valid_date(row[self._date_column_index]):
-            return False
+        date: Optional[datetime] = Statement._parse_date(row[self._date_column_index])
+        if date is None:
+            return None
 
-        return True
+        return row[self._description_column_index], date, amount
 
-    def _valid_date(self, date: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_date(date: str) -> Optional[datetime]:
         """
-        Checks if the date can be read.
+        Read a statement date, statements repeat dates so results are cached.
+
+        Dates in the usual month/day/year form are read directly and anything else falls back to strptime.
 
         Args:
-            date: Input string to be validated.
+            date: Input string to be read.
 
-        Return: True if date can be read and false if not.
+        Return: Datetime if the date can be read and None if not.
         """
+
+        if Constants.STATEMENT_DATE_FORMAT == "%m/%d/%Y":
+            match: Optional[re.Match] = Statement._DATE_PATTERN.fullmatch(date)
+            if match:
+                try:
+                    return datetime(int(match[3]), int(match[1]), int(match[2]))
+                except ValueError:
+                    return None
+
         try:
-            datetime.strptime(date, Constants.STATEMENT_DATE_FORMAT)
-            return True
+            return datetime.strptime(date, Constants.STATEMENT_DATE_FORMAT)
         except ValueError:
-            return False
+            return None
@@ -0,0 +1,64 @@
+# expense_tracker/model/tag_repository.py
+
+from typing import Optional, Union
+
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm.db_tag import DB_Tag
+
+from expense_tracker.model.session_manager import Session_Manager
+
+
+class Tag_Repository:
+    """
+    Tags loaded through the shared session and kept in process, tags are a small table that rarely changes.
+
+    Tags are kept until invalidate is called, which should happen whenever a tag is created or edited.
+    """
+
+    # Tag id to tag, every tag belongs to _session
+    _tag_dict: dict[int, DB_Tag] = {}
+    _session: Optional[Session] = None
+
+    @staticmethod
+    def get_tags(tag_id_list: list[Union[int, str]]) -> list[Optional[DB_Tag]]:
+        """
+        Get many tags, the tags that are not cached are loaded with a single query.
+
+        Args:
+            tag_id_list: IDs of the tags, ids may be ints or strings of ints.
+
+        Return: List of tags in the same order as tag_id_list, None for ids that do not belong to a tag.
+        """
+
+        # Cached tags can only be used by the session they were loaded with
+        session: Session = Session_Manager.get_session()
+        if session is not Tag_Repository._session:
+            Tag_Repository._tag_dict = {}
+            Tag_Repository._session = session
+
+        id_list: list[int] = list(int(tag_id) for tag_id in tag_id_list)
+        missing_id_list: list[int] = list(
+            dict.fromkeys(
+                tag_id for tag_id in id_list if tag_id not in Tag_Repository._tag_dict
+            )
+        )
+
+        if missing_id_list:
+            Tag_Repository._tag_dict.update(
+                (tag.id, tag)
+                for tag in session.query(DB_Tag)
+                .where(DB_Tag.id.in_(missing_id_list))
+                .all()
+            )
+
+        return list(Tag_Repository._tag_dict.get(tag_id) for tag_id in id_list)
+
+    @staticmethod
+    def invalidate() -> None:
+        """
+        Forget every cached tag so they are loaded again the next time they are needed.
+        """
+
+        Tag_Repository._tag_dict = {}
+        Tag_Repository._session = None
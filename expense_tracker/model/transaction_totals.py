@@ -0,0 +1,168 @@
+# expense_tracker/model/transaction_totals.py
+
+from typing import Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_transaction import DB_Transaction
+from expense_tracker.model.orm.db_amount import DB_Amount
+
+from expense_tracker.model.session_manager import Session_Manager
+
+
+class Transaction_Totals:
+    """
+    Totals of the amounts of transactions, read from the stored transaction totals in batches and memoized.
+
+    Totals are kept until invalidate is called, which should happen whenever the amounts of a transaction change and when a reconcile session ends. The stored totals can be checked against the amounts table with verify and fixed with rebuild.
+    """
+
+    # Maximum number of ids bound to a single IN clause, kept below SQLite's variable limit
+    MAX_IN_CLAUSE_SIZE: int = 900
+
+    # Largest difference between a stored total and the sum of its amounts that is not reported by verify
+    TOLERANCE: float = 1e-9
+
+    # Transaction id to the total of its amounts
+    _total_dict: dict[int, float] = {}
+
+    @staticmethod
+    def get_totals(transaction_id_list: list[int]) -> dict[int, float]:
+        """
+        Get the totals of many transactions, only the totals that are not memoized are queried.
+
+        Args:
+            transaction_id_list: IDs of the transactions whose amounts should be totaled.
+
+        Return: Dict of transaction id to amount total, transactions without amounts have a total of 0.
+        """
+
+        missing_id_list: list[int] = list(
+            dict.fromkeys(
+                transaction_id
+                for transaction_id in transaction_id_list
+                if transaction_id not in Transaction_Totals._total_dict
+            )
+        )
+
+        if missing_id_list:
+            Transaction_Totals._total_dict.update(
+                Transaction_Totals._query_totals(missing_id_list)
+            )
+
+        return {
+            transaction_id: Transaction_Totals._total_dict[transaction_id]
+            for transaction_id in transaction_id_list
+        }
+
+    @staticmethod
+    def get_total(transaction_id: int) -> float:
+        """
+        Get the total of one transaction.
+
+        Args:
+            transaction_id: ID of the transaction whose amounts should be totaled.
+
+        Return: Amount total.
+        """
+
+        total: Optional[float] = Transaction_Totals._total_dict.get(transaction_id)
+        if total is not None:
+            return total
+
+        return Transaction_Totals.get_totals([transaction_id])[transaction_id]
+
+    @staticmethod
+    def invalidate(transaction_id_list: Optional[list[int]] = None) -> None:
+        """
+        Forget memoized totals so they are queried again the next time they are needed.
+
+        Args:
+            transaction_id_list: IDs of the transactions whose totals changed, all totals are forgotten if not provided.
+        """
+
+        if transaction_id_list is None:
+            Transaction_Totals._total_dict = {}
+            return
+
+        for transaction_id in transaction_id_list:
+            Transaction_Totals._total_dict.pop(transaction_id, None)
+
+    @staticmethod
+    def _query_totals(transaction_id_list: list[int]) -> dict[int, float]:
+        """
+        Read the stored totals of transactions, one query per IN clause sized chunk.
+
+        Args:
+            transaction_id_list: IDs of the transactions whose totals should be read.
+
+        Return: Dict of transaction id to amount total, transactions that do not exist have a total of 0.
+        """
+
+        total_dict: dict[int, float] = dict.fromkeys(transaction_id_list, 0)
+
+        with Session(engine) as session:
+            for start in range(
+                0, len(transaction_id_list), Transaction_Totals.MAX_IN_CLAUSE_SIZE
+            ):
+                total_dict.update(
+                    session.query(DB_Transaction.id, DB_Transaction.total)
+                    .where(
+                        DB_Transaction.id.in_(
+                            transaction_id_list[
+                                start : start + Transaction_Totals.MAX_IN_CLAUSE_SIZE
+                            ]
+                        )
+                    )
+                    .all()
+                )
+
+        return total_dict
+
+    @staticmethod
+    def verify() -> list[tuple[int, float, float]]:
+        """
+        Find the transactions whose stored total does not equal the sum of their amounts.
+
+        Return: List of the transaction id, stored total and sum of the amounts for each inconsistent transaction.
+        """
+
+        with Session(engine) as session:
+            return list(
+                (transaction_id, total, amount_sum)
+                for transaction_id, total, amount_sum in session.query(
+                    DB_Transaction.id,
+                    DB_Transaction.total,
+                    func.coalesce(func.sum(DB_Amount.amount), 0),
+                )
+                .outerjoin(DB_Amount, DB_Amount.transaction_id == DB_Transaction.id)
+                .group_by(DB_Transaction.id)
+                if abs(total - amount_sum) > Transaction_Totals.TOLERANCE
+            )
+
+    @staticmethod
+    def rebuild() -> int:
+        """
+        Recalculate every stored total from the amounts table.
+
+        Return: Number of transactions whose stored total was wrong.
+        """
+
+        inconsistent_list: list[tuple[int, float, float]] = Transaction_Totals.verify()
+
+        with Session(engine) as session:
+            session.execute(
+                update(DB_Transaction).values(
+                    total=select(func.coalesce(func.sum(DB_Amount.amount), 0))
+                    .where(DB_Amount.transaction_id == DB_Transaction.id)
+                    .scalar_subquery()
+                )
+            )
+            session.commit()
+
+        # The bulk update bypasses the shared session, its loaded transactions have stale totals
+        Session_Manager.expire()
+        Transaction_Totals.invalidate()
+        return len(inconsistent_list)
@@ -1,6 +1,6 @@
 # expense_tracker/presenter/account.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query
 
 from datetime import datetime
 
@@ -12,7 +12,6 @@ from expense_tracker.constants import Constants
 
 from expense_tracker.presenter.presenter import Presenter
 
-from expense_tracker.model.orm import engine
 from expense_tracker.model.orm.db_transaction import DB_Transaction
 from expense_tracker.model.orm.db_merchant import DB_Merchant
 from expense_tracker.model.orm.db_amount import DB_Amount
@@ -22,6 +21,8 @@ from expense_tracker.model.orm.db_tag import DB_Tag
 from expense_tracker.model.orm.db_budget import DB_Budget
 from expense_tracker.model.orm.db_month_budget import DB_Month_Budget
 
+from expense_tracker.model.session_manager import Session_Manager
+
 
 class Account(Presenter):
     """
@@ -35,6 +36,14 @@ class Account(Presenter):
         AMOUNT_COLUMN_INDEX: int = 3
         DATE_COLUMN_INDEX: int = 4
 
+    _sql_column_dict: dict[Enum, any] = {
+        Column.ID: DB_Account.id,
+        Column.NAME: DB_Account.name,
+        Column.DESCRIPTION_COLUMN_INDEX: DB_Account.statement_description_column_index,
+        Column.AMOUNT_COLUMN_INDEX: DB_Account.statement_amount_column_index,
+        Column.DATE_COLUMN_INDEX: DB_Account.statement_date_column_index,
+    }
+
     @staticmethod
     def _format(amount: DB_Account) -> tuple[str, ...]:
         """
@@ -48,22 +57,33 @@ class Account(Presenter):
             str(amount.statement_date_column_index),
         )
 
+    @staticmethod
+    def _query(session: Session) -> Query:
+        """
+        Query for accounts that loads everything _format needs.
+
+        Args:
+            session: Session to query with.
+
+        Return: Query for accounts.
+        """
+
+        return session.query(DB_Account)
+
     @staticmethod
     def get_by_id(id: int) -> list[tuple[str, ...]]:
         """
         Returns a single object with the requested id
         """
-        with Session(engine) as session:
-            return Account._format(
-                session.query(DB_Account).where(DB_Account.id == id).first()
-            )
+        with Session_Manager.unit_of_work() as session:
+            return Account._format(session.get(DB_Account, id))
 
     @staticmethod
     def get_all() -> list[tuple[str, ...]]:
         """
         Returns a list of all merchants as a list of tuples of strings
         """
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             return list(
                 Account._format(account)
                 for account in session.query(DB_Account).order_by(DB_Account.name).all()
@@ -74,7 +94,7 @@ class Account(Presenter):
         """
         Create a merchant
         """
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             new_account: DB_Account = DB_Account(
                 name=values[Account.Column.NAME],
                 statement_description_column_index=values[
@@ -87,6 +107,7 @@ class Account(Presenter):
             )
             session.add(new_account)
             session.commit()
+            Account.notify_created(new_account.id)
             return Account._format(new_account)
 
     @staticmethod
@@ -94,33 +115,35 @@ class Account(Presenter):
         """
         Updates cell in the database
         """
-        with Session(engine) as session:
-            account: DB_Account = (
-                session.query(DB_Account).where(DB_Account.id == id).first()
-            )
+        with Session_Manager.unit_of_work() as session:
+            account: DB_Account = session.get(DB_Account, id)
 
             # new_value will be an str
             if column == Account.Column.NAME:
                 account.name = new_value
                 session.commit()
+                Account.notify_updated(id)
                 return account.name
 
             # new_value will be an str
             if column == Account.Column.DESCRIPTION_COLUMN_INDEX:
                 account.statement_description_column_index = int(new_value)
                 session.commit()
+                Account.notify_updated(id)
                 return account.statement_description_column_index
 
             # new_value will be an str
             if column == Account.Column.AMOUNT_COLUMN_INDEX:
                 account.statement_amount_column_index = int(new_value)
                 session.commit()
+                Account.notify_updated(id)
                 return account.statement_amount_column_index
 
             # new_value will be an str
             if column == Account.Column.DATE_COLUMN_INDEX:
                 account.statement_date_column_index = int(new_value)
                 session.commit()
+                Account.notify_updated(id)
                 return account.statement_date_column_index
 
         Presenter.set_value(id, column, new_value)
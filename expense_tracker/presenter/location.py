@@ -1,6 +1,7 @@
 # expense_tracker/presenter/location.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, Query, joinedload
 
 from enum import Enum
 
@@ -12,6 +13,8 @@ from typing import Union
 
 from datetime import datetime
 
+import math
+
 from geopy.distance import geodesic
 
 from expense_tracker.model.orm import engine
@@ -23,6 +26,8 @@ from expense_tracker.model.orm.db_tag import DB_Tag
 from expense_tracker.model.orm.db_budget import DB_Budget
 from expense_tracker.model.orm.db_month_budget import DB_Month_Budget
 
+from expense_tracker.model.session_manager import Session_Manager
+
 
 class Location(Presenter):
     """
@@ -36,6 +41,21 @@ class Location(Presenter):
         XCOORD: int = 3
         YCOORD: int = 4
 
+    _sql_column_dict: dict[Enum, any] = {
+        Column.ID: DB_Merchant_Location.id,
+        Column.MERCHANT: DB_Merchant_Location.merchant_id,
+        Column.NAME: DB_Merchant_Location.name,
+        Column.XCOORD: DB_Merchant_Location.x_coord,
+        Column.YCOORD: DB_Merchant_Location.y_coord,
+    }
+
+    # Shortest length of a degree of latitude, used so the bounding box never excludes a location within the radius
+    MIN_MILES_PER_DEGREE: float = 68.7
+
+    # Mean radius of the earth, haversine can differ from geodesic by up to 0.5% so its checks are given slack
+    EARTH_RADIUS_MILES: float = 3958.8
+    HAVERSINE_SLACK: float = 1.01
+
     @staticmethod
     def _format(location: DB_Merchant_Location) -> tuple[str, ...]:
         """
@@ -49,17 +69,28 @@ class Location(Presenter):
             str(location.y_coord),
         )
 
+    @staticmethod
+    def _query(session: Session) -> Query:
+        """
+        Query for locations that loads everything _format needs.
+
+        Args:
+            session: Session to query with.
+
+        Return: Query for locations with their merchant joined.
+        """
+
+        return session.query(DB_Merchant_Location).options(
+            joinedload(DB_Merchant_Location.merchant)
+        )
+
     @staticmethod
     def get_by_id(id: int) -> list[tuple[str, ...]]:
         """
         Returns a single object with the requested id
         """
-        with Session(engine) as session:
-            return Location._format(
-                session.query(DB_Merchant_Location)
-                .where(DB_Merchant_Location.id == id)
-                .first()
-            )
+        with Session_Manager.unit_of_work() as session:
+            return Location._format(session.get(DB_Merchant_Location, id))
 
     @staticmethod
     def create(values: dict[Enum, Union[int, str, datetime]]) -> tuple[str, ...]:
@@ -67,7 +98,7 @@ class Location(Presenter):
         Create a transaction
         """
 
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             new_location: DB_Merchant_Location = DB_Merchant_Location(
                 merchant_id=values[Location.Column.MERCHANT],
                 name=values[Location.Column.NAME],
@@ -76,6 +107,7 @@ class Location(Presenter):
             )
             session.add(new_location)
             session.commit()
+            Location.notify_created(new_location.id)
             return Location._format(new_location)
 
     @staticmethod
@@ -83,7 +115,7 @@ class Location(Presenter):
         """
         Returns a list of all merchants as a list of tuples of strings
         """
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             return list(
                 Location._format(location)
                 for location in session.query(DB_Merchant_Location)
@@ -96,40 +128,36 @@ class Location(Presenter):
         """
         Updates cell in the database
         """
-        with Session(engine) as session:
-            location: DB_Merchant_Location = (
-                session.query(DB_Merchant_Location)
-                .where(DB_Merchant_Location.id == id)
-                .first()
-            )
+        with Session_Manager.unit_of_work() as session:
+            location: DB_Merchant_Location = session.get(DB_Merchant_Location, id)
 
             # new_value will be an str
             if column == Location.Column.NAME:
                 location.name = new_value
                 session.commit()
+                Location.notify_updated(id)
                 return location.name
 
             # new_value will be an int representing the id of the new merchant
             if column == Location.Column.MERCHANT:
-                new_merchant: DB_Merchant = (
-                    session.query(DB_Merchant)
-                    .where(DB_Merchant.id == new_value)
-                    .first()
-                )
+                new_merchant: DB_Merchant = session.get(DB_Merchant, new_value)
                 Location.merchant = new_merchant
                 session.commit()
+                Location.notify_updated(id)
                 return Location.merchant.name
 
             # new_value will be an str
             if column == Location.Column.XCOORD:
                 location.x_coord = float(new_value)
                 session.commit()
+                Location.notify_updated(id)
                 return location.x_coord
 
             # new_value will be an str
             if column == Location.Column.YCOORD:
                 location.y_coord = float(new_value)
                 session.commit()
+                Location.notify_updated(id)
                 return location.y_coord
 
         Presenter.set_value(id, column, new_value)
@@ -148,12 +176,10 @@ class Location(Presenter):
         if column == Location.Column.XCOORD or column == Location.Column.YCOORD:
             return float(value)
 
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             # value will be an int representing a merchant id
             if column == Location.Column.MERCHANT:
-                merchant: DB_Merchant = (
-                    session.query(DB_Merchant).where(DB_Merchant.id == value).first()
-                )
+                merchant: DB_Merchant = session.get(DB_Merchant, value)
                 return merchant.name
 
         return Presenter.get_value(id, column)
@@ -165,11 +191,25 @@ class Location(Presenter):
     ) -> Optional[int]:
         """
         Check if a location is close enough, to any coordinate in a provided list, to be the same location. If so return the closest location.
+
+        Only the locations inside a bounding box around the target are loaded, these are filtered with haversine and the remaining locations are measured with geodesic.
         """
         with Session(engine) as session:
+            query = session.query(DB_Merchant_Location)
+            for condition in Location._bounding_box_filter(
+                target_coord, same_location__mile_radius
+            ):
+                query = query.where(condition)
+
             # If the coords are within the specified radius, add it to the result list along with its distance.
             compared_coords_list: list[tuple[DB_Merchant_Location, float]] = []
-            for location in session.query(DB_Merchant_Location).all():
+            for location in query.order_by(DB_Merchant_Location.id).all():
+                if (
+                    Location._haversine_miles(location.get_coords(), target_coord)
+                    > same_location__mile_radius * Location.HAVERSINE_SLACK
+                ):
+                    continue
+
                 distance: float = geodesic(location.get_coords(), target_coord).miles
                 if distance <= same_location__mile_radius:
                     compared_coords_list.append((location, distance))
@@ -181,3 +221,89 @@ class Location(Presenter):
             # If there are matches, sort the list by distance and return the closest coords
             compared_coords_list.sort(key=lambda x: x[1])
             return compared_coords_list[0][0].merchant_id
+
+    @staticmethod
+    def _bounding_box_filter(
+        target_coord: tuple[float, float], mile_radius: float
+    ) -> list[any]:
+        """
+        Get the SQL conditions that limit locations to a box of latitudes and longitudes around a coordinate.
+
+        Args:
+            target_coord: Latitude and longitude at the center of the box.
+            mile_radius: Distance from the center that the box must contain.
+
+        Return: List of SQL conditions, the longitude is not limited near the poles.
+        """
+
+        latitude, longitude = target_coord
+        latitude_delta: float = (
+            mile_radius * Location.HAVERSINE_SLACK / Location.MIN_MILES_PER_DEGREE
+        )
+        condition_list: list[any] = [
+            DB_Merchant_Location.x_coord.between(
+                latitude - latitude_delta, latitude + latitude_delta
+            )
+        ]
+
+        # A degree of longitude shrinks with the cosine of the latitude, use the widest latitude in the box
+        widest_latitude: float = abs(latitude) + latitude_delta
+        if widest_latitude >= 90:
+            return condition_list
+        longitude_delta: float = latitude_delta / math.cos(
+            math.radians(widest_latitude)
+        )
+        if longitude_delta >= 180:
+            return condition_list
+
+        min_longitude: float = longitude - longitude_delta
+        max_longitude: float = longitude + longitude_delta
+
+        # Boxes that cross the antimeridian wrap around to the other side
+        if min_longitude < -180:
+            condition_list.append(
+                or_(
+                    DB_Merchant_Location.y_coord >= min_longitude + 360,
+                    DB_Merchant_Location.y_coord <= max_longitude,
+                )
+            )
+        elif max_longitude > 180:
+            condition_list.append(
+                or_(
+                    DB_Merchant_Location.y_coord >= min_longitude,
+                    DB_Merchant_Location.y_coord <= max_longitude - 360,
+                )
+            )
+        else:
+            condition_list.append(
+                DB_Merchant_Location.y_coord.between(min_longitude, max_longitude)
+            )
+
+        return condition_list
+
+    @staticmethod
+    def _haversine_miles(
+        first_coord: tuple[float, float], second_coord: tuple[float, float]
+    ) -> float:
+        """
+        Get the great circle distance between two coordinates on a spherical earth.
+
+        Args:
+            first_coord: Latitude and longitude of the first point.
+            second_coord: Latitude and longitude of the second point.
+
+        Return: Distance in miles.
+        """
+
+        first_latitude: float = math.radians(first_coord[0])
+        second_latitude: float = math.radians(second_coord[0])
+        latitude_delta: float = second_latitude - first_latitude
+        longitude_delta: float = math.radians(second_coord[1] - first_coord[1])
+
+        a: float = (
+            math.sin(latitude_delta / 2) ** 2
+            + math.cos(first_latitude)
+            * math.cos(second_latitude)
+            * math.sin(longitude_delta / 2) ** 2
+        )
+        return 2 * Location.EARTH_RADIUS_MILES * math.asin(min(1, math.sqrt(a)))
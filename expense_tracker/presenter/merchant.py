@@ -1,6 +1,6 @@
 # expense_tracker/presenter/merchant.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query, joinedload
 
 from enum import Enum
 
@@ -11,7 +11,8 @@ from typing import Union
 from expense_tracker.presenter.presenter import Presenter
 from expense_tracker.presenter.tag import Tag
 
-from expense_tracker.model.orm import engine
+from expense_tracker.model.merchant_matcher import Merchant_Matcher
+
 from expense_tracker.model.orm.db_transaction import DB_Transaction
 from expense_tracker.model.orm.db_merchant import DB_Merchant
 from expense_tracker.model.orm.db_amount import DB_Amount
@@ -21,6 +22,8 @@ from expense_tracker.model.orm.db_tag import DB_Tag
 from expense_tracker.model.orm.db_budget import DB_Budget
 from expense_tracker.model.orm.db_month_budget import DB_Month_Budget
 
+from expense_tracker.model.session_manager import Session_Manager
+
 
 class Merchant(Presenter):
     """
@@ -33,6 +36,12 @@ class Merchant(Presenter):
         NAMING_RULE: int = 2
         DEFAULT_TAGS: int = 3
 
+    _sql_column_dict: dict[Enum, any] = {
+        Column.ID: DB_Merchant.id,
+        Column.NAME: DB_Merchant.name,
+        Column.NAMING_RULE: DB_Merchant.naming_rule,
+    }
+
     @staticmethod
     def _format(merchant: DB_Merchant) -> tuple[str, ...]:
         """
@@ -45,12 +54,25 @@ class Merchant(Presenter):
             ", ".join(tag.name for tag in merchant.default_tags),
         )
 
+    @staticmethod
+    def _query(session: Session) -> Query:
+        """
+        Query for merchants that loads everything _format needs.
+
+        Args:
+            session: Session to query with.
+
+        Return: Query for merchants with their default tags joined.
+        """
+
+        return session.query(DB_Merchant).options(joinedload(DB_Merchant.default_tags))
+
     @staticmethod
     def get_all() -> list[tuple[str, ...]]:
         """
         Returns a list of all merchants as a list of tuples of strings
         """
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             return list(
                 Merchant._format(merchant)
                 for merchant in session.query(DB_Merchant)
@@ -63,10 +85,8 @@ class Merchant(Presenter):
         """
         Returns a single object with the requested id
         """
-        with Session(engine) as session:
-            return Merchant._format(
-                session.query(DB_Merchant).where(DB_Merchant.id == id).first()
-            )
+        with Session_Manager.unit_of_work() as session:
+            return Merchant._format(session.get(DB_Merchant, id))
 
     @staticmethod
     def create(values: dict[Enum, Union[int, str, datetime]]) -> tuple[str, ...]:
@@ -74,13 +94,15 @@ class Merchant(Presenter):
         Create a merchant
         """
 
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             new_merchant: DB_Merchant = DB_Merchant(
                 name=values[Merchant.Column.NAME],
                 naming_rule=values[Merchant.Column.NAMING_RULE],
             )
             session.add(new_merchant)
             session.commit()
+            Merchant.notify_created(new_merchant.id)
+            Merchant_Matcher.invalidate()
             return Merchant._format(new_merchant)
 
     @staticmethod
@@ -88,30 +110,30 @@ class Merchant(Presenter):
         """
         Updates cell in the database
         """
-        with Session(engine) as session:
-            merchant: DB_Merchant = (
-                session.query(DB_Merchant).where(DB_Merchant.id == id).first()
-            )
+        with Session_Manager.unit_of_work() as session:
+            merchant: DB_Merchant = session.get(DB_Merchant, id)
 
             # new_value will be an str
             if column == Merchant.Column.NAME:
                 merchant.name = new_value
                 session.commit()
+                Merchant.notify_updated(id)
+                Merchant_Matcher.invalidate()
                 return merchant.name
 
             # new_value will be an str
             if column == Merchant.Column.NAMING_RULE:
                 merchant.naming_rule = new_value
                 session.commit()
+                Merchant.notify_updated(id)
+                Merchant_Matcher.invalidate()
                 return merchant.naming_rule
 
             # new_value will be a list of ints representing ids of tags
             if column == Merchant.Column.DEFAULT_TAGS:
-                merchant.default_tags = []
-                for id in new_value:
-                    tag: DB_Tag = session.query(DB_Tag).where(DB_Tag.id == id).first()
-                    merchant.default_tags.append(tag)
+                merchant.default_tags = Tag.get_tag_list(new_value)
                 session.commit()
+                Merchant.notify_updated(id)
                 return ", ".join(tag.name for tag in merchant.default_tags)
 
         Presenter.set_value(id, column, new_value)
@@ -126,7 +148,7 @@ class Merchant(Presenter):
         if column == Merchant.Column.NAME or column == Merchant.Column.NAMING_RULE:
             return str(value)
 
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             # value will be a list of ints
             # TODO Edit this to support multiple amounts
             if column == Merchant.Column.DEFAULT_TAGS:
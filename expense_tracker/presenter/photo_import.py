@@ -0,0 +1,128 @@
+# expense_tracker/presenter/photo_import.py
+
+from pathlib import Path
+
+from threading import Event
+
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+
+from dataclasses import dataclass, field
+
+from typing import Callable, Optional
+
+from expense_tracker.presenter.location import Location
+from expense_tracker.presenter.tag import Tag
+
+from expense_tracker.model.photo_manager import Photo_Manager, Photo_Metadata
+from expense_tracker.model.session_manager import Session_Manager
+
+from expense_tracker.config_manager import Config_Manager
+
+
+@dataclass
+class Photo_Import_Result:
+    """
+    Defaults found for a photo before its create popup is opened.
+    """
+
+    path: Path
+    metadata: Photo_Metadata = field(default_factory=Photo_Metadata)
+    merchant_id: Optional[int] = None
+    default_tag_id_list: list[int] = field(default_factory=list)
+
+
+class Photo_Import:
+    """
+    Finds the defaults for every photo in an import before any create popups are opened.
+    """
+
+    # Number of photos scanned at once
+    MAX_WORKERS: int = 8
+
+    @staticmethod
+    def scan_photo(path: Path, mile_radius: float) -> Photo_Import_Result:
+        """
+        Read the metadata of a photo and find the merchant and default tags for its location.
+
+        Args:
+            path: Path of the photo.
+            mile_radius: Distance a saved location can be from the photo to be the same location.
+
+        Return: Photo_Import_Result for the photo.
+        """
+
+        result: Photo_Import_Result = Photo_Import_Result(
+            path, Photo_Manager.get_metadata(path)
+        )
+
+        # The rest of the defaults require both coords and a possible location
+        if not result.metadata.coords:
+            return result
+
+        result.merchant_id = Location.possible_location(
+            result.metadata.coords, mile_radius
+        )
+        if not result.merchant_id:
+            return result
+
+        result.default_tag_id_list = list(
+            tag[0] for tag in Tag.get_tags_for_merchant_default(result.merchant_id)
+        )
+        return result
+
+    @staticmethod
+    def _scan_photo_on_worker(path: Path, mile_radius: float) -> Photo_Import_Result:
+        """
+        Scan a photo on a thread pool worker, the worker's shared session is closed afterwards so it does not hold a connection.
+
+        Args:
+            path: Path of the photo.
+            mile_radius: Distance a saved location can be from the photo to be the same location.
+
+        Return: Photo_Import_Result for the photo.
+        """
+
+        try:
+            return Photo_Import.scan_photo(path, mile_radius)
+        finally:
+            Session_Manager.remove()
+
+    @staticmethod
+    def scan(
+        path_list: list[Path],
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[Event] = None,
+    ) -> list[Photo_Import_Result]:
+        """
+        Scan every photo in an import on a thread pool.
+
+        Args:
+            path_list: Paths of the photos to scan.
+            progress: Called with the number of photos scanned and the total after each photo finishes.
+            cancel_event: When set, photos that have not started are skipped.
+
+        Return: Photo_Import_Result for each photo in the same order as path_list, or only the results that finished if the scan was cancelled.
+        """
+
+        mile_radius: float = Config_Manager().get_same_merchant_mile_radius()
+        result_list: list[Optional[Photo_Import_Result]] = [None] * len(path_list)
+
+        with ThreadPoolExecutor(max_workers=Photo_Import.MAX_WORKERS) as executor:
+            future_dict: dict[Future, int] = {
+                executor.submit(
+                    Photo_Import._scan_photo_on_worker, path, mile_radius
+                ): index
+                for index, path in enumerate(path_list)
+            }
+
+            for scanned_count, future in enumerate(as_completed(future_dict), 1):
+                result_list[future_dict[future]] = future.result()
+
+                if progress:
+                    progress(scanned_count, len(path_list))
+
+                if cancel_event and cancel_event.is_set():
+                    executor.shutdown(cancel_futures=True)
+                    break
+
+        return list(result for result in result_list if result)
@@ -2,10 +2,17 @@
 
 from enum import Enum
 
-from typing import Union
+from typing import Any, Union, Callable, Optional
 
 from datetime import datetime
 
+from dataclasses import dataclass, field
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session, Query
+
+from expense_tracker.model.session_manager import Session_Manager
+
 
 class Presenter:
     """
@@ -15,6 +22,135 @@ class Presenter:
     class Column(Enum):
         ID: int = 0
 
+    @dataclass
+    class Change:
+        """
+        IDs of the rows that were created, updated or deleted by an edit to the database.
+        """
+
+        created_id_list: list[int] = field(default_factory=list)
+        updated_id_list: list[int] = field(default_factory=list)
+        deleted_id_list: list[int] = field(default_factory=list)
+
+    # Column to the SQL column it is filtered and sorted by, should be extended with every column that query supports
+    _sql_column_dict: dict[Enum, Any] = {}
+
+    # Presenter class to the functions that are called when one of its rows changes
+    _listener_dict: dict[type, list[Callable[[Change], None]]] = {}
+
+    # Presenter class to the number of changes made to its rows, bumped by notify
+    _version_dict: dict[type, int] = {}
+
+    # Presenter class to the version its rows were cached at and the cached rows
+    _row_cache_dict: dict[type, tuple[int, list[tuple[str, ...]]]] = {}
+
+    @classmethod
+    def subscribe(cls, listener: Callable[[Change], None]) -> None:
+        """
+        Register a function to be called whenever rows of this presenter change.
+
+        Args:
+            listener: Function that takes a Change.
+        """
+
+        Presenter._listener_dict.setdefault(cls, []).append(listener)
+
+    @classmethod
+    def unsubscribe(cls, listener: Callable[[Change], None]) -> None:
+        """
+        Stop calling a function that was registered with subscribe.
+
+        Args:
+            listener: Function that was passed to subscribe.
+        """
+
+        listener_list: list[Callable] = Presenter._listener_dict.get(cls, [])
+        if listener in listener_list:
+            listener_list.remove(listener)
+
+    @classmethod
+    def notify(cls, change: Change) -> None:
+        """
+        Tell every listener of this presenter that rows have changed. Should be called after the change is committed.
+
+        Args:
+            change: IDs of the rows that changed.
+        """
+
+        Presenter._version_dict[cls] = cls.get_version() + 1
+
+        for listener in list(Presenter._listener_dict.get(cls, [])):
+            listener(change)
+
+    @classmethod
+    def get_version(cls) -> int:
+        """
+        Get the change stamp of this presenter, it changes every time rows of this presenter are changed.
+
+        Return: Number of changes made to the rows of this presenter.
+        """
+
+        return Presenter._version_dict.get(cls, 0)
+
+    @classmethod
+    def get_all_cached(cls) -> list[tuple[str, ...]]:
+        """
+        Get all the rows of this presenter from memory, they are only queried again after the presenter's rows change.
+
+        Meant for small reference tables like accounts, merchants and tags that popups list options from. The returned list is shared and must not be modified.
+
+        Return: Formatted list of all rows in the sql table.
+        """
+
+        version, row_list = Presenter._row_cache_dict.get(cls, (None, None))
+        if version != cls.get_version():
+            row_list = cls.get_all()
+            Presenter._row_cache_dict[cls] = (cls.get_version(), row_list)
+
+        return row_list
+
+    @staticmethod
+    def clear_cache() -> None:
+        """
+        Forget the cached rows of every presenter, needed when the database is changed without going through the presenters.
+        """
+
+        Presenter._row_cache_dict = {}
+
+    @classmethod
+    def notify_created(cls, id: int) -> None:
+        """
+        Tell every listener of this presenter that a row was created.
+
+        Args:
+            id: ID of the new row.
+        """
+
+        cls.notify(Presenter.Change(created_id_list=[id]))
+
+    @classmethod
+    def notify_updated(cls, *id_list: int) -> None:
+        """
+        Tell every listener of this presenter that rows were updated.
+
+        Args:
+            id_list: IDs of the updated rows.
+        """
+
+        if id_list:
+            cls.notify(Presenter.Change(updated_id_list=list(id_list)))
+
+    @classmethod
+    def notify_deleted(cls, id: int) -> None:
+        """
+        Tell every listener of this presenter that a row was deleted.
+
+        Args:
+            id: ID of the deleted row.
+        """
+
+        cls.notify(Presenter.Change(deleted_id_list=[id]))
+
     @staticmethod
     def _format(database_object: any) -> tuple[str, ...]:
         """
@@ -28,6 +164,187 @@ class Presenter:
 
         return []
 
+    @staticmethod
+    def _query(session: Session) -> Query:
+        """
+        Query for every row of the sql table that loads everything _format needs. Should be extended.
+
+        Args:
+            session: Session to query with.
+
+        Throws:
+            RuntimeError: If the presenter classes does not implement this method.
+        """
+
+        raise RuntimeError("Presenter class does not implement _query.")
+
+    @classmethod
+    def query(
+        cls,
+        filter_dict: Optional[dict[Enum, Any]] = None,
+        sort_column: Optional[Enum] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        cursor: Optional[tuple[Any, int]] = None,
+    ) -> tuple[list[tuple[str, ...]], Optional[tuple[Any, int]]]:
+        """
+        Gets the rows that match filters in SQL, one page at a time.
+
+        Pages are found with the sort value and id of the last row on the previous page, so fetching a page does not get slower the further into the table it is.
+
+        Args:
+            filter_dict: Column to the database value rows must have, a list or set of values matches any of them. Only columns in _sql_column_dict can be used.
+            sort_column: Column to sort by, rows with the same value are sorted by id. Sorted by id if not provided.
+            descending: If the rows are sorted from largest to smallest.
+            limit: Maximum number of rows on the page, every matching row if not provided.
+            cursor: Cursor returned with the previous page, None to get the first page.
+
+        Return: Tuple of the rows in display format and the cursor for the next page, the cursor is None if this is the last page.
+
+        Throws:
+            ValueError: If a filter or sort column is not in _sql_column_dict.
+        """
+
+        id_column: Any = cls._get_sql_column(cls.Column.ID)
+        sort_sql_column: Any = cls._get_sql_column(sort_column or cls.Column.ID)
+
+        with Session_Manager.unit_of_work() as session:
+            query: Query = cls._query(session)
+
+            for column, value in (filter_dict or {}).items():
+                sql_column: Any = cls._get_sql_column(column)
+                if isinstance(value, (list, tuple, set)):
+                    query = query.where(sql_column.in_(value))
+                else:
+                    query = query.where(sql_column == value)
+
+            if cursor:
+                query = query.where(
+                    Presenter._after_cursor(
+                        sort_sql_column, id_column, cursor, descending
+                    )
+                )
+
+            if descending:
+                query = query.order_by(sort_sql_column.desc(), id_column.desc())
+            else:
+                query = query.order_by(sort_sql_column, id_column)
+
+            if limit is not None:
+                query = query.limit(limit)
+
+            object_list: list[Any] = query.all()
+
+            next_cursor: Optional[tuple[Any, int]] = None
+            if limit is not None and object_list and len(object_list) == limit:
+                next_cursor = (
+                    getattr(object_list[-1], sort_sql_column.key),
+                    getattr(object_list[-1], id_column.key),
+                )
+
+            return list(cls._format(object) for object in object_list), next_cursor
+
+    @classmethod
+    def get_cursors(
+        cls, id_list: list[int], sort_column: Optional[Enum] = None
+    ) -> dict[int, tuple[Any, int]]:
+        """
+        Get the sort value and id of rows in the same form as the cursors returned by query, used to find where rows belong among the pages that have been loaded.
+
+        Args:
+            id_list: IDs of the rows.
+            sort_column: Column the rows are sorted by, sorted by id if not provided.
+
+        Return: Dict of id to the cursor of the row, rows that do not exist are left out.
+
+        Throws:
+            ValueError: If the sort column is not in _sql_column_dict.
+        """
+
+        id_column: Any = cls._get_sql_column(cls.Column.ID)
+        sort_sql_column: Any = cls._get_sql_column(sort_column or cls.Column.ID)
+
+        with Session_Manager.unit_of_work() as session:
+            return {
+                id: (value, id)
+                for value, id in session.execute(
+                    select(sort_sql_column, id_column).where(id_column.in_(id_list))
+                )
+            }
+
+    @staticmethod
+    def cursor_sort_key(cursor: tuple[Any, int]) -> tuple[bool, Any, int]:
+        """
+        Get a key that sorts cursors in the same order as query sorts rows, SQLite sorts nulls before every other value.
+
+        Args:
+            cursor: Sort value and id of a row.
+
+        Return: Tuple that can be compared with the keys of other cursors of the same column.
+        """
+
+        value, id = cursor
+        return value is not None, value, id
+
+    @classmethod
+    def _get_sql_column(cls, column: Enum) -> Any:
+        """
+        Get the SQL column that a column is filtered and sorted by.
+
+        Args:
+            column: Column of this presenter.
+
+        Return: Mapped attribute of the database object.
+
+        Throws:
+            ValueError: If the column is not in _sql_column_dict.
+        """
+
+        if column not in cls._sql_column_dict:
+            raise ValueError(f"Unable to query database column '{column}'.")
+
+        return cls._sql_column_dict[column]
+
+    @staticmethod
+    def _after_cursor(
+        sort_sql_column: Any,
+        id_column: Any,
+        cursor: tuple[Any, int],
+        descending: bool,
+    ) -> Any:
+        """
+        Condition for the rows that come after a cursor in sort order, SQLite sorts nulls before every other value.
+
+        Args:
+            sort_sql_column: SQL column the rows are sorted by.
+            id_column: SQL id column that breaks ties.
+            cursor: Sort value and id of the last row of the previous page.
+            descending: If the rows are sorted from largest to smallest.
+
+        Return: SQL condition.
+        """
+
+        cursor_value, cursor_id = cursor
+
+        if descending:
+            if cursor_value is None:
+                return and_(sort_sql_column.is_(None), id_column < cursor_id)
+            return or_(
+                sort_sql_column < cursor_value,
+                and_(sort_sql_column == cursor_value, id_column < cursor_id),
+                sort_sql_column.is_(None),
+            )
+
+        if cursor_value is None:
+            return or_(
+                and_(sort_sql_column.is_(None), id_column > cursor_id),
+                sort_sql_column.is_not(None),
+            )
+        return or_(
+            sort_sql_column > cursor_value,
+            and_(sort_sql_column == cursor_value, id_column > cursor_id),
+        )
+
     @staticmethod
     def get_all() -> list[tuple[str, ...]]:
         """
@@ -7,15 +7,13 @@ from pathlib import Path
 from enum import Enum
 from typing import Union
 
-from sqlalchemy.orm import Session
-
 from datetime import datetime
 
 from expense_tracker.constants import Constants
 
 from expense_tracker.presenter.presenter import Presenter
+from expense_tracker.presenter.transaction import Transaction
 
-from expense_tracker.model.orm import engine
 from expense_tracker.model.orm.db_transaction import DB_Transaction
 from expense_tracker.model.orm.db_merchant import DB_Merchant
 from expense_tracker.model.orm.db_amount import DB_Amount
@@ -25,9 +23,14 @@ from expense_tracker.model.orm.db_tag import DB_Tag
 from expense_tracker.model.orm.db_budget import DB_Budget
 from expense_tracker.model.orm.db_month_budget import DB_Month_Budget
 
+from expense_tracker.model.session_manager import Session_Manager
+
 from expense_tracker.model.reconcile_session import Reconcile_Session
+from expense_tracker.model.reconcile_checkpoint import Reconcile_Checkpoint
 from expense_tracker.model.statement_manager import ST_Transaction
+from expense_tracker.model.statement_import import Statement_Import, Staged_Statement
 from expense_tracker.model.db_util import DB_Util
+from expense_tracker.model.transaction_totals import Transaction_Totals
 
 
 from typing import Union
@@ -59,6 +62,22 @@ class Reconcile:
     reconcile_session: Optional[Reconcile_Session] = None
     statement_path: Optional[Path] = None
     account_id: Optional[Path] = None
+    last_change_set: Optional[Reconcile_Session.Change_Set] = None
+
+    # Display cells of each statement row by row ID and of each database transaction by transaction ID, transaction cells are dropped when the transaction is edited
+    _statement_cells_dict: dict[int, tuple[str, str, str, str, str]] = {}
+    _db_cells_dict: dict[int, tuple[str, str, str, str, str]] = {}
+
+    # Display rows of each statement row with its match and with its possible matches by row ID, dropped when the row's match state changes
+    _statement_row_dict: dict[
+        int, tuple[str, str, str, str, str, str, str, str, str, str]
+    ] = {}
+    _possible_row_dict: dict[
+        int, list[tuple[str, str, str, str, str, str, str, str, str, str]]
+    ] = {}
+
+    # Statements parsed by a bulk import that have not been reconciled yet
+    staged_statement_dict: dict[Path, Staged_Statement] = {}
 
     @staticmethod
     def ongoing_session() -> bool:
@@ -80,7 +99,88 @@ class Reconcile:
         """
         Reconcile.statement_path = statement_path
         Reconcile.account_id = account_id
-        Reconcile.reconcile_session = Reconcile_Session(statement_path, account_id)
+        Reconcile._clear_display_cache()
+
+        # Use the parsed rows if the statement was staged by a bulk import
+        staged_statement: Optional[
+            Staged_Statement
+        ] = Reconcile.staged_statement_dict.get(Path(statement_path).resolve())
+        if staged_statement and staged_statement.account_id == account_id:
+            del Reconcile.staged_statement_dict[staged_statement.statement_path]
+            Reconcile.reconcile_session = Reconcile_Session(
+                statement_path, account_id, staged_statement.st_trans_list
+            )
+        else:
+            Reconcile.reconcile_session = Reconcile_Session(statement_path, account_id)
+
+        Reconcile_Checkpoint.save(
+            statement_path, account_id, Reconcile.reconcile_session
+        )
+
+    @staticmethod
+    def resume_session() -> bool:
+        """
+        Resume the session that was checkpointed when the app was last closed.
+
+        Return: True if a session was resumed, False if there was no checkpoint or its statement has changed.
+        """
+
+        checkpoint: Optional[
+            tuple[Path, int, Reconcile_Session]
+        ] = Reconcile_Checkpoint.load()
+        if checkpoint is None:
+            return False
+
+        (
+            Reconcile.statement_path,
+            Reconcile.account_id,
+            Reconcile.reconcile_session,
+        ) = checkpoint
+        Reconcile.last_change_set = None
+        Reconcile._clear_display_cache()
+        return True
+
+    @staticmethod
+    def stage_statements(directory: Path) -> list[Staged_Statement]:
+        """
+        Parse every statement in a directory in parallel and stage them to be reconciled.
+
+        Statements are matched to accounts by file name, see Statement_Import.map_statements.
+
+        Args:
+            directory: Directory containing statement csv files.
+
+        Return: List of the statements that were staged.
+        """
+
+        staged_statement_list: list[
+            Staged_Statement
+        ] = Statement_Import.import_statements(
+            Statement_Import.map_statements(Path(directory).resolve())
+        )
+        for staged_statement in staged_statement_list:
+            Reconcile.staged_statement_dict[
+                staged_statement.statement_path
+            ] = staged_statement
+
+        return staged_statement_list
+
+    @staticmethod
+    def get_staged_statement_path(account_id: int) -> Optional[Path]:
+        """
+        Get the first staged statement for an account.
+
+        Args:
+            account_id: ID of the account.
+
+        Return: Path of the staged statement, or None if the account has no staged statements.
+        """
+
+        for statement_path in sorted(Reconcile.staged_statement_dict):
+            if Reconcile.staged_statement_dict[statement_path].account_id == account_id:
+                return statement_path
+
+        return None
 
     @staticmethod
     def kill_session() -> None:
@@ -90,6 +190,80 @@ class Reconcile:
         Reconcile.reconcile_session = None
         Reconcile.statement_path = None
         Reconcile.account_id = None
+        Reconcile.last_change_set = None
+        Reconcile._clear_display_cache()
+        Reconcile_Checkpoint.delete()
+
+        # Totals are memoized for the life of the session
+        Transaction_Totals.invalidate()
+
+    @staticmethod
+    def rematch() -> None:
+        """
+        Re-match every row of the current session.
+        """
+
+        Reconcile.reconcile_session.match()
+        Reconcile.last_change_set = None
+        Reconcile._clear_display_cache()
+        Reconcile_Checkpoint.update(Reconcile.reconcile_session)
+
+    @staticmethod
+    def _clear_display_cache() -> None:
+        """
+        Drop every cached display row, called when a session starts or ends.
+        """
+
+        Reconcile._statement_cells_dict = {}
+        Reconcile._db_cells_dict = {}
+        Reconcile._invalidate_rows()
+
+    @staticmethod
+    def _transaction_changed(change: Presenter.Change) -> None:
+        """
+        Drop the cached display cells of transactions that were edited or deleted, along with the statement rows that show them.
+
+        Args:
+            change: IDs of the transactions that changed.
+        """
+
+        id_set: set[int] = set(change.updated_id_list + change.deleted_id_list)
+        for id in id_set:
+            Reconcile._db_cells_dict.pop(id, None)
+
+        if Reconcile.reconcile_session is None:
+            return
+
+        Reconcile._invalidate_rows(
+            set(
+                row.statement_trans.row_id
+                for row in Reconcile.reconcile_session.reconcile_row_list
+                if (row.matched_trans and row.matched_trans.id in id_set)
+                or any(
+                    possible_match.id in id_set
+                    for possible_match in row.possible_match_list or []
+                )
+            )
+        )
+
+    @staticmethod
+    def _invalidate_rows(row_id_set: Optional[set[int]] = None) -> None:
+        """
+        Drop the cached display rows of statement rows whose match state changed.
+
+        Args:
+            row_id_set: IDs of the statement rows to drop, every row is dropped if not provided.
+        """
+
+        if row_id_set is None:
+            Reconcile._statement_row_dict = {}
+            Reconcile._possible_row_dict = {}
+            return
+
+        for row_id in row_id_set:
+            Reconcile._statement_cells_dict.pop(row_id, None)
+            Reconcile._statement_row_dict.pop(row_id, None)
+            Reconcile._possible_row_dict.pop(row_id, None)
 
     @staticmethod
     def _format(
@@ -104,37 +278,59 @@ class Reconcile:
         Return: List of strings that can be displayed in the terminal.
         """
         if type(transaction) == ST_Transaction:
-            with Session(engine) as session:
-                # Do not know if the statement transaction has a merchant, if it does then bind it to the session
-                if transaction.merchant:
-                    session.add(transaction.merchant)
-
-                return (
-                    str(transaction.row_id),
-                    transaction.description,
-                    transaction.merchant.name if transaction.merchant else "None",
-                    datetime.strftime(transaction.date, Constants.DATE_FORMAT),
-                    str(transaction.amount),
-                )
+            # Statement merchants are loaded with their name, they do not need a session
+            return (
+                str(transaction.row_id),
+                transaction.description,
+                transaction.merchant.name if transaction.merchant else "None",
+                datetime.strftime(transaction.date, Constants.DATE_FORMAT),
+                str(transaction.amount),
+            )
 
         if type(transaction) == DB_Transaction:
-            with Session(engine) as session:
-                # The database transaction will have a merchant, add it to the session
-                session.add(transaction)
-
-                return (
-                    str(transaction.id),
-                    transaction.description,
-                    transaction.merchant.name,
-                    datetime.strftime(transaction.date, Constants.DATE_FORMAT),
-                    str(DB_Util.get_transaction_amount(transaction)),
-                )
+            # Database transactions belong to the shared session, their merchant is loaded on first use
+            return (
+                str(transaction.id),
+                transaction.description,
+                transaction.merchant.name,
+                datetime.strftime(transaction.date, Constants.DATE_FORMAT),
+                str(transaction.total),
+            )
 
         # If the type is not DB_Transaction or ST_Transaction then throw an error
         raise TypeError(
             f"transaction must be of type DB_Transaction or ST_Transaction not {type(transaction)}"
         )
 
+    @staticmethod
+    def _get_cells(
+        transaction: Union[ST_Transaction, DB_Transaction]
+    ) -> tuple[str, str, str, str, str]:
+        """
+        Get the display cells of a statement or database transaction, they are formatted the first time they are needed in a session.
+
+        Args:
+            transaction: Statement or database transaction.
+
+        Return: Tuple of strings that can be displayed in the terminal.
+        """
+
+        if type(transaction) == ST_Transaction:
+            cache_dict: dict[
+                int, tuple[str, str, str, str, str]
+            ] = Reconcile._statement_cells_dict
+            key: int = transaction.row_id
+        else:
+            cache_dict = Reconcile._db_cells_dict
+            key = transaction.id
+
+        cells: Optional[tuple[str, str, str, str, str]] = cache_dict.get(key)
+        if cells is None:
+            cells = Reconcile._format(transaction)
+            cache_dict[key] = cells
+
+        return cells
+
     @staticmethod
     def get_statement_list() -> (
         list[tuple[str, str, str, str, str, str, str, str, str, str]]
@@ -145,23 +341,44 @@ class Reconcile:
         Return: List of strings that represent rows in the statement.
         """
 
-        formatted_list: list[
+        return list(
+            Reconcile.get_statement_row(row.statement_trans.row_id)
+            for row in Reconcile.reconcile_session.reconcile_row_list
+        )
+
+    @staticmethod
+    def get_statement_row(
+        row_id: int,
+    ) -> tuple[str, str, str, str, str, str, str, str, str, str]:
+        """
+        Get a single statement row and its match from the current reconcile session and format it for display.
+
+        Args:
+            row_id: ID of the statement row.
+
+        Return: Tuple of strings that represents the statement row and its match.
+        """
+
+        display_row: Optional[
             tuple[str, str, str, str, str, str, str, str, str, str]
-        ] = []
+        ] = Reconcile._statement_row_dict.get(row_id)
+        if display_row is not None:
+            return display_row
 
-        for row in Reconcile.reconcile_session.reconcile_row_list:
-            formatted_db_trans: tuple[str, str, str, str, str] = Reconcile._format(
-                row.statement_trans
-            )
-            formatted_st_trans: tuple[str, str, str, str, str] = (
-                Reconcile._format(row.matched_trans)
-                if row.matched_trans
-                else ("", "", "", "", "")
-            )
+        row: Reconcile_Session.Row = Reconcile.reconcile_session.get_row(row_id)
 
-            formatted_list.append(formatted_db_trans + formatted_st_trans)
+        formatted_st_trans: tuple[str, str, str, str, str] = Reconcile._get_cells(
+            row.statement_trans
+        )
+        formatted_db_trans: tuple[str, str, str, str, str] = (
+            Reconcile._get_cells(row.matched_trans)
+            if row.matched_trans
+            else ("", "", "", "", "")
+        )
 
-        return formatted_list
+        display_row = formatted_st_trans + formatted_db_trans
+        Reconcile._statement_row_dict[row_id] = display_row
+        return display_row
 
     @staticmethod
     def get_possible_match_list() -> (
@@ -183,7 +400,15 @@ class Reconcile:
             if row.matched_trans or not row.possible_match_list:
                 continue
 
-            formatted_list.extend(Reconcile._format_possible_row(row))
+            row_id: int = row.statement_trans.row_id
+            display_rows: Optional[
+                list[tuple[str, str, str, str, str, str, str, str, str, str]]
+            ] = Reconcile._possible_row_dict.get(row_id)
+            if display_rows is None:
+                display_rows = Reconcile._format_possible_row(row)
+                Reconcile._possible_row_dict[row_id] = display_rows
+
+            formatted_list.extend(display_rows)
 
         return formatted_list
 
@@ -202,22 +427,23 @@ class Reconcile:
         Return: List of strings that can be displayed in the terminal.
         """
 
-        # A list of all the rows needed to display one statement transaction and all its possibly matching database transactions
-        display_rows: list[tuple[str, str, str, str, str, str, str, str, str, str]] = []
-
-        for index, possible_match in enumerate(row.possible_match_list):
-            statement_cells: tuple[str, str, str, str] = (
-                Reconcile._format(row.statement_trans)
-                if index == 0
-                else (str(row.statement_trans.row_id), "", "", "")
-            )
-            database_cells: tuple[str, str, str, str] = Reconcile._format(
-                possible_match
-            )
-
-            display_rows.append((statement_cells + database_cells))
+        # The statement cells are only shown on the first row, the rest only keep the statement ID
+        statement_cells: tuple[str, str, str, str, str] = Reconcile._get_cells(
+            row.statement_trans
+        )
+        blank_cells: tuple[str, str, str, str, str] = (
+            statement_cells[0],
+            "",
+            "",
+            "",
+            "",
+        )
 
-        return display_rows
+        return list(
+            (statement_cells if index == 0 else blank_cells)
+            + Reconcile._get_cells(possible_match)
+            for index, possible_match in enumerate(row.possible_match_list)
+        )
 
     @staticmethod
     def get_orphan_list() -> list[tuple[str, str, str, str]]:
@@ -228,10 +454,23 @@ class Reconcile:
         """
 
         return list(
-            Reconcile._format(orphan)
+            Reconcile.get_orphan_row(orphan)
             for orphan in Reconcile.reconcile_session.orphan_list
         )
 
+    @staticmethod
+    def get_orphan_row(orphan: DB_Transaction) -> tuple[str, str, str, str, str]:
+        """
+        Put a single orphan in a displayable format.
+
+        Args:
+            orphan: Database transaction that is not reconciled and did not get matched.
+
+        Return: Tuple of strings representing the orphan.
+        """
+
+        return Reconcile._get_cells(orphan)
+
     @staticmethod
     def set_value(
         row_id: int,
@@ -249,19 +488,21 @@ class Reconcile:
         Return: Value of the target cell after the set_value function.
         """
 
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             if column == Reconcile.Full_Column.ST_MERCHANT:
-                new_merchant: DB_Merchant = (
-                    session.query(DB_Merchant)
-                    .where(DB_Merchant.id == new_value)
-                    .first()
+                new_merchant: DB_Merchant = session.get(DB_Merchant, new_value)
+                Reconcile.last_change_set = (
+                    Reconcile.reconcile_session.set_statement_transaction_merchant(
+                        row_id, new_merchant
+                    )
                 )
-                Reconcile.reconcile_session.set_statement_transaction_merchant(
-                    row_id, new_merchant
+                Reconcile._invalidate_rows(Reconcile.last_change_set.row_id_set)
+                Reconcile_Checkpoint.update(
+                    Reconcile.reconcile_session, Reconcile.last_change_set.row_id_set
                 )
-                return Reconcile.reconcile_session.reconcile_row_list[
+                return Reconcile.reconcile_session.get_row(
                     row_id
-                ].statement_trans.merchant.name
+                ).statement_trans.merchant.name
 
         Presenter.set_value(id, column, new_value)
 
@@ -278,6 +519,16 @@ class Reconcile:
     @staticmethod
     def commit() -> None:
         """
-        Commits the session.
+        Commits the session and notifies the transaction tables of the transactions that were reconciled.
         """
         Reconcile.reconcile_session.commit()
+        Transaction.notify_updated(
+            *(
+                row.matched_trans.id
+                for row in Reconcile.reconcile_session.reconcile_row_list
+            )
+        )
+
+
+# Cached transaction cells are dropped whenever a transaction is edited outside the session
+Transaction.subscribe(Reconcile._transaction_changed)
@@ -1,6 +1,6 @@
 # expense_tracker/presenter/tag.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query
 
 from datetime import datetime
 
@@ -12,7 +12,6 @@ from expense_tracker.constants import Constants
 
 from expense_tracker.presenter.presenter import Presenter
 
-from expense_tracker.model.orm import engine
 from expense_tracker.model.orm.db_transaction import DB_Transaction
 from expense_tracker.model.orm.db_merchant import DB_Merchant
 from expense_tracker.model.orm.db_amount import DB_Amount
@@ -22,6 +21,9 @@ from expense_tracker.model.orm.db_tag import DB_Tag
 from expense_tracker.model.orm.db_budget import DB_Budget
 from expense_tracker.model.orm.db_month_budget import DB_Month_Budget
 
+from expense_tracker.model.session_manager import Session_Manager
+from expense_tracker.model.tag_repository import Tag_Repository
+
 
 class Tag(Presenter):
     """
@@ -33,6 +35,12 @@ class Tag(Presenter):
         NAME: int = 1
         INSTANCE_TAG: int = 2
 
+    _sql_column_dict: dict[Enum, any] = {
+        Column.ID: DB_Tag.id,
+        Column.NAME: DB_Tag.name,
+        Column.INSTANCE_TAG: DB_Tag.instance_tag,
+    }
+
     @staticmethod
     def _format(tag: DB_Tag) -> tuple[str, ...]:
         """
@@ -45,13 +53,26 @@ class Tag(Presenter):
             str(tag.instance_tag),
         )
 
+    @staticmethod
+    def _query(session: Session) -> Query:
+        """
+        Query for tags that loads everything _format needs.
+
+        Args:
+            session: Session to query with.
+
+        Return: Query for tags.
+        """
+
+        return session.query(DB_Tag)
+
     @staticmethod
     def get_all() -> list[tuple[str, ...]]:
         """
         Returns a list of all tags as a list of tuples of strings
         """
 
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             return list(
                 Tag._format(tag)
                 for tag in session.query(DB_Tag)
@@ -64,8 +85,8 @@ class Tag(Presenter):
         """
         Returns a single object with the requested id
         """
-        with Session(engine) as session:
-            return Tag._format(session.query(DB_Tag).where(DB_Tag.id == id).first())
+        with Session_Manager.unit_of_work() as session:
+            return Tag._format(session.get(DB_Tag, id))
 
     @staticmethod
     def create(values: dict[Enum, Union[int, str, datetime]]) -> tuple[str, ...]:
@@ -73,13 +94,15 @@ class Tag(Presenter):
         Create a transaction
         """
 
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             new_tag: DB_Tag = DB_Tag(
                 name=values[Tag.Column.NAME],
                 instance_tag=values[Tag.Column.INSTANCE_TAG],
             )
             session.add(new_tag)
             session.commit()
+            Tag_Repository.invalidate()
+            Tag.notify_created(new_tag.id)
             return Tag._format(new_tag)
 
     @staticmethod
@@ -87,19 +110,23 @@ class Tag(Presenter):
         """
         Updates cell in the database
         """
-        with Session(engine) as session:
-            tag: DB_Tag = session.query(DB_Tag).where(DB_Tag.id == id).first()
+        with Session_Manager.unit_of_work() as session:
+            tag: DB_Tag = session.get(DB_Tag, id)
 
             # new_value will be an str
             if column == Tag.Column.NAME:
                 tag.name = new_value
                 session.commit()
+                Tag_Repository.invalidate()
+                Tag.notify_updated(id)
                 return tag.name
 
             # new_value will be a bool
             if column == Tag.Column.INSTANCE_TAG:
                 tag.instance_tag = new_value
                 session.commit()
+                Tag_Repository.invalidate()
+                Tag.notify_updated(id)
                 return tag.instance_tag
 
         Presenter.set_value(id, column, new_value)
@@ -111,13 +138,9 @@ class Tag(Presenter):
         Gets the tags from the first amount that a transaction has
         """
 
-        with Session(engine) as session:
-            transaction: DB_Transaction = (
-                session.query(DB_Transaction).where(DB_Transaction.id == id).first()
-            )
-            amount: DB_Amount = (
-                session.query(DB_Amount).where(DB_Amount.id == transaction.id).first()
-            )
+        with Session_Manager.unit_of_work() as session:
+            transaction: DB_Transaction = session.get(DB_Transaction, id)
+            amount: DB_Amount = session.get(DB_Amount, transaction.id)
             tag_list: list[DB_Tag] = (
                 session.query(DB_Tag).where(DB_Tag.amounts.contains(amount)).all()
             )
@@ -130,10 +153,8 @@ class Tag(Presenter):
         Get a list of tag ids that are the defaults for a merchant
         """
 
-        with Session(engine) as session:
-            merchant: DB_Merchant = (
-                session.query(DB_Merchant).where(DB_Merchant.id == merchant_id).first()
-            )
+        with Session_Manager.unit_of_work() as session:
+            merchant: DB_Merchant = session.get(DB_Merchant, merchant_id)
             return list(Tag._format(tag) for tag in merchant.default_tags)
 
     @staticmethod
@@ -154,8 +175,4 @@ class Tag(Presenter):
         Convert a list of tag ids to a list of tags
         """
 
-        with Session(engine) as session:
-            return list(
-                session.query(DB_Tag).where(DB_Tag.id == tag_id).first()
-                for tag_id in tag_id_list
-            )
+        return Tag_Repository.get_tags(tag_id_list)
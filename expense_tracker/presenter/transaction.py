@@ -1,6 +1,6 @@
 # expense_tracker/presenter/transaction.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query, joinedload
 
 from datetime import datetime
 
@@ -15,7 +15,6 @@ from expense_tracker.constants import Constants
 from expense_tracker.presenter.presenter import Presenter
 from expense_tracker.presenter.tag import Tag
 
-from expense_tracker.model.orm import engine
 from expense_tracker.model.orm.db_transaction import DB_Transaction
 from expense_tracker.model.orm.db_merchant import DB_Merchant
 from expense_tracker.model.orm.db_amount import DB_Amount
@@ -25,6 +24,9 @@ from expense_tracker.model.orm.db_tag import DB_Tag
 from expense_tracker.model.orm.db_budget import DB_Budget
 from expense_tracker.model.orm.db_month_budget import DB_Month_Budget
 
+from expense_tracker.model.session_manager import Session_Manager
+from expense_tracker.model.transaction_totals import Transaction_Totals
+
 
 class Transaction(Presenter):
     """
@@ -41,6 +43,16 @@ class Transaction(Presenter):
         TAGS: int = 6
         AMOUNT: int = 7
 
+    _sql_column_dict: dict[Enum, any] = {
+        Column.ID: DB_Transaction.id,
+        Column.RECONCILED_STATUS: DB_Transaction.reconciled_status,
+        Column.ACCOUNT: DB_Transaction.account_id,
+        Column.DESCRIPTION: DB_Transaction.description,
+        Column.MERCHANT: DB_Transaction.merchant_id,
+        Column.DATE: DB_Transaction.date,
+        Column.AMOUNT: DB_Transaction.total,
+    }
+
     @staticmethod
     def _format(transaction: DB_Transaction) -> tuple[str, ...]:
         """
@@ -53,9 +65,26 @@ class Transaction(Presenter):
             transaction.description,
             transaction.merchant.name,
             datetime.strftime(transaction.date, Constants.DATE_FORMAT),
-            ", ".join(tag.name for tag in transaction.amounts[0].tags),
             # TODO Edit this to support multiple amounts
-            str(transaction.amounts[0].amount),
+            ", ".join(tag.name for tag in transaction.amounts[0].tags),
+            str(transaction.total),
+        )
+
+    @staticmethod
+    def _query(session: Session) -> Query:
+        """
+        Query for transactions that loads everything _format needs in the same SELECT.
+
+        Args:
+            session: Session to query with.
+
+        Return: Query for transactions with their account, merchant, amounts and tags joined.
+        """
+
+        return session.query(DB_Transaction).options(
+            joinedload(DB_Transaction.account),
+            joinedload(DB_Transaction.merchant),
+            joinedload(DB_Transaction.amounts).joinedload(DB_Amount.tags),
         )
 
     @staticmethod
@@ -64,10 +93,10 @@ class Transaction(Presenter):
         Returns a list of all transactions as a list of tuples of strings
         """
 
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             return list(
                 Transaction._format(transaction)
-                for transaction in session.query(DB_Transaction)
+                for transaction in Transaction._query(session)
                 .order_by(DB_Transaction.date.desc())
                 .all()
             )
@@ -77,9 +106,9 @@ class Transaction(Presenter):
         """
         Returns a single object with the requested id
         """
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             return Transaction._format(
-                session.query(DB_Transaction).where(DB_Transaction.id == id).first()
+                Transaction._query(session).where(DB_Transaction.id == id).first()
             )
 
     @staticmethod
@@ -88,7 +117,7 @@ class Transaction(Presenter):
         Create a transaction
         """
 
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             new_transaction: DB_Transaction = DB_Transaction(
                 account_id=values[Transaction.Column.ACCOUNT],
                 description=values[Transaction.Column.DESCRIPTION],
@@ -106,9 +135,13 @@ class Transaction(Presenter):
             )
             new_amount.tags = Tag.get_tag_list(values[Transaction.Column.TAGS])
             session.add(new_amount)
+            new_transaction.amounts.append(new_amount)
+            new_transaction.update_total()
 
             # Commit and return
             session.commit()
+            Transaction_Totals.invalidate([new_transaction.id])
+            Transaction.notify_created(new_transaction.id)
             return Transaction._format(new_transaction)
 
     @staticmethod
@@ -116,58 +149,55 @@ class Transaction(Presenter):
         """
         Updates a cell in the database.
         """
-        with Session(engine) as session:
-            transaction: DB_Transaction = (
-                session.query(DB_Transaction).where(DB_Transaction.id == id).first()
-            )
+        with Session_Manager.unit_of_work() as session:
+            transaction: DB_Transaction = session.get(DB_Transaction, id)
 
             # new_value will be an int representing the id of the new account
             if column == Transaction.Column.ACCOUNT:
-                new_account: DB_Account = (
-                    session.query(DB_Account).where(DB_Account.id == new_value).first()
-                )
+                new_account: DB_Account = session.get(DB_Account, new_value)
                 transaction.account = new_account
                 session.commit()
+                Transaction.notify_updated(id)
                 return transaction.account.name
 
             # new_value will be an int representing the id of the new merchant
             if column == Transaction.Column.MERCHANT:
-                new_merchant: DB_Merchant = (
-                    session.query(DB_Merchant)
-                    .where(DB_Merchant.id == new_value)
-                    .first()
-                )
+                new_merchant: DB_Merchant = session.get(DB_Merchant, new_value)
                 transaction.merchant = new_merchant
                 session.commit()
+                Transaction.notify_updated(id)
                 return transaction.merchant.name
 
             # new_value will be a datetime object
             if column == Transaction.Column.DATE:
                 transaction.date = new_value
                 session.commit()
+                Transaction.notify_updated(id)
                 return transaction.date.strftime(Constants.DATE_FORMAT)
 
             # new_value will be a str
             if column == Transaction.Column.DESCRIPTION:
                 transaction.description = new_value
                 session.commit()
+                Transaction.notify_updated(id)
                 return transaction.description
 
             # new_value will be a str
             # TODO Edit this to support multiple amounts
             if column == Transaction.Column.AMOUNT:
                 transaction.amounts[0].amount = float(new_value)
+                transaction.update_total()
                 session.commit()
+                Transaction_Totals.invalidate([id])
+                Transaction.notify_updated(id)
                 return transaction.amounts[0].amount
 
             # new_value will be a list of ints representing the ids of tags
             # TODO Edit this to support multiple amounts
             if column == Transaction.Column.TAGS:
-                transaction.amounts[0].tags = []
-                for id in new_value:
-                    tag: DB_Tag = session.query(DB_Tag).where(DB_Tag.id == id).first()
-                    transaction.amounts[0].tags.append(tag)
+                transaction.amounts[0].tags = Tag.get_tag_list(new_value)
                 session.commit()
+                Transaction.notify_updated(id)
                 return ", ".join(tag.name for tag in transaction.amounts[0].tags)
 
         return Presenter.set_value(id, column, new_value)
@@ -189,19 +219,15 @@ class Transaction(Presenter):
         if column == Transaction.Column.DATE:
             return value.strftime(Constants.DATE_FORMAT)
 
-        with Session(engine) as session:
+        with Session_Manager.unit_of_work() as session:
             # value will be an int representing a merchant id
             if column == Transaction.Column.MERCHANT:
-                merchant: DB_Merchant = (
-                    session.query(DB_Merchant).where(DB_Merchant.id == value).first()
-                )
+                merchant: DB_Merchant = session.get(DB_Merchant, value)
                 return merchant.name
 
             # value will be an int representing an account id
             if column == Transaction.Column.ACCOUNT:
-                account: DB_Account = (
-                    session.query(DB_Account).where(DB_Account.id == value).first()
-                )
+                account: DB_Account = session.get(DB_Account, value)
                 return account.name
 
             # value will be a list of ints
@@ -3,6 +3,9 @@
 from textual.app import ComposeResult
 
 from textual.binding import Binding
+from textual.worker import Worker, WorkerState
+
+from pathlib import Path
 
 from expense_tracker.view.popup.popup_utils import Popup_Utils
 
@@ -81,19 +84,23 @@ class Begin_Reconcile_Popup(ModalScreen):
         Composes the display.
         """
         self._container: Vertical = Vertical()
-        self._statement_text: Static = Static("Input a statement path")
+        self._statement_text: Static = Static(
+            "Input a statement path or a directory of statements"
+        )
         self._account_text: Static = Static("Select an account")
         self._input_widget: Validated_Input = Validated_Input(
             [
-                Function(Popup_Utils._file_exists, "File does not exist"),
-                Function(Popup_Utils._file_is_csv, "File must be in csv format"),
+                Function(
+                    Popup_Utils._statement_path_exists,
+                    "File or directory does not exist",
+                ),
+                Function(
+                    Popup_Utils._statement_path_is_csv,
+                    "File must be in csv format or a directory of csv files",
+                ),
             ]
         )
-        self._selector: Selector = Selector(
-            list(
-                Selector.Option(account[1], account[0]) for account in Account.get_all()
-            )
-        )
+        self._selector: Selector = Selector(Selector.get_option_list(Account))
         self._button: Button = Button("Submit")
 
         with self._container:
@@ -107,12 +114,18 @@ class Begin_Reconcile_Popup(ModalScreen):
         """
         Called when the widget mounts.
 
-        Checks for an ongoing session, if there is one then dismiss self and continue with ongoing session.
+        Checks for an ongoing session, if there is one then dismiss self and continue with ongoing session. A session checkpointed when the app was last closed is resumed as it was left.
         """
         if Reconcile.ongoing_session():
             self.dismiss()
-            Reconcile.reconcile_session.match()
+            Reconcile.rematch()
+            self.app.push_screen(Reconcile_Popup())
+            return
+
+        if Reconcile.resume_session():
+            self.dismiss()
             self.app.push_screen(Reconcile_Popup())
+            self.app.notify("Resumed reconcile session")
 
     def action_exit_popup(self) -> None:
         """
@@ -164,10 +177,58 @@ class Begin_Reconcile_Popup(ModalScreen):
         TODO Fill this in
         """
 
-        if self.submittable():
-            self.dismiss()
-            self.app.push_screen(
-                Reconcile_Popup(
-                    Popup_Utils._get_path(self.statement_path), self.account_id
-                )
+        if not self.submittable():
+            return
+
+        statement_path: Path = Popup_Utils._get_path(self.statement_path)
+
+        # A directory of statements is parsed in the background and the statement for the account is reconciled
+        if statement_path.is_dir():
+            self._button.disabled = True
+            self._statement_text.update("Importing statements...")
+            self.run_worker(
+                lambda: Reconcile.stage_statements(statement_path),
+                name="statement_import",
+                exit_on_error=False,
+                thread=True,
             )
+            return
+
+        self.dismiss()
+        self.app.push_screen(Reconcile_Popup(statement_path, self.account_id))
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """
+        Called when the statement import worker changes state.
+
+        Opens the reconcile popup for the staged statement of the selected account when the import has finished.
+        """
+
+        if event.worker.name != "statement_import":
+            return
+
+        if event.state == WorkerState.ERROR:
+            self._button.disabled = False
+            self._statement_text.update(f"Import failed: {event.worker.error}")
+            return
+
+        if event.state != WorkerState.SUCCESS:
+            return
+
+        self._button.disabled = False
+        self._statement_text.update(
+            f"Staged {len(event.worker.result)} statements for reconciling"
+        )
+
+        statement_path: Optional[Path] = Reconcile.get_staged_statement_path(
+            self.account_id
+        )
+        if not statement_path:
+            self.notify(
+                "No statement in the directory belongs to the selected account.",
+                severity="error",
+            )
+            return
+
+        self.dismiss()
+        self.app.push_screen(Reconcile_Popup(statement_path, self.account_id))
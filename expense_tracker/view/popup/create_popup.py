@@ -270,11 +270,8 @@ class Create_Popup(ModalScreen):
         for key, value in self.values.items():
             submittable_dict[key] = value.value
 
-        # Add the new row to the database
-        new_row: list = self.parent_table.presenter.create(submittable_dict)
-
-        # Update parent table
-        self.parent_table.add_row(*new_row[0:], key=new_row[0])
+        # Add the new row to the database, the parent table adds the row when it is notified of the change
+        self.parent_table.presenter.create(submittable_dict)
 
         # Dismiss self
         self.dismiss()
@@ -7,12 +7,16 @@ from textual.screen import ModalScreen
 from textual.validation import Function
 from textual.css.query import NoMatches
 from textual.binding import Binding
+from textual.worker import Worker, WorkerState
 
 from pathlib import Path
 
+from threading import Event
+
 from expense_tracker.model.photo_manager import Photo_Manager
 
 from expense_tracker.presenter.transaction import Transaction
+from expense_tracker.presenter.photo_import import Photo_Import, Photo_Import_Result
 
 from expense_tracker.view.popup.transaction_create_popup import Transaction_Create_Popup
 from expense_tracker.view.table.exptrack_data_table import Exptrack_Data_Table
@@ -70,6 +74,9 @@ class Photo_Import_Popup(ModalScreen):
         super().__init__(name, id, classes)
         self.parent_table: Exptrack_Data_Table = parent_table
 
+        # Set to stop a scan that is in progress
+        self._cancel_event: Event = Event()
+
     def compose(self) -> ComposeResult:
         """
         Composes the display
@@ -143,19 +150,68 @@ class Photo_Import_Popup(ModalScreen):
         """
         Called when the input widget is submitted with the enter key.
 
-        Returns the input value if validation is successful and dismisses.
+        Starts scanning the photos in the directory if validation is successful.
         """
 
         if not event.validation_result.is_valid:
             return
 
-        self.dismiss()
         path: Path = Path(Popup_Utils._get_path(self._input_widget.value))
+        path_list: list[Path] = Photo_Manager.photos_in_directory(path)
+
+        # Scan every photo in the background, the create popups are opened when the scan finishes
+        self._input_widget.disabled = True
+        self._update_progress(0, len(path_list))
+        self.run_worker(
+            lambda: Photo_Import.scan(
+                path_list,
+                progress=lambda scanned_count, total: self.app.call_from_thread(
+                    self._update_progress, scanned_count, total
+                ),
+                cancel_event=self._cancel_event,
+            ),
+            name="photo_scan",
+            exit_on_error=False,
+            thread=True,
+        )
+
+    def _update_progress(self, scanned_count: int, total: int) -> None:
+        """
+        Shows how many photos have been scanned.
+
+        Args:
+            scanned_count: Number of photos scanned.
+            total: Number of photos in the import.
+        """
+
+        self._validation_status_widget.update(
+            f"Scanning photos {scanned_count}/{total}"
+        )
 
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """
+        Called when the scan worker changes state.
+
+        Opens the create popup for the first photo when the scan has finished.
+        """
+
+        if event.worker.name != "photo_scan" or self._cancel_event.is_set():
+            return
+
+        if event.state == WorkerState.ERROR:
+            self._input_widget.disabled = False
+            self._validation_status_widget.update(f"Scan failed: {event.worker.error}")
+            return
+
+        if event.state != WorkerState.SUCCESS:
+            return
+
+        result_list: list[Photo_Import_Result] = event.worker.result
+        self.dismiss()
         self.app.push_screen(
             Transaction_Create_Popup(
                 self.parent_table,
-                import_list=Photo_Manager.photos_in_directory(path),
+                import_list=result_list,
                 excluded_column_key_list=Photo_Import_Popup.NON_REQUIRED_COLUMNS,
             )
         )
@@ -164,7 +220,8 @@ class Photo_Import_Popup(ModalScreen):
         """
         Called when the escape key is pressed.
 
-        Dismisses all popups
+        Stops the scan if one is running and dismisses all popups
         """
 
+        self._cancel_event.set()
         self.dismiss()
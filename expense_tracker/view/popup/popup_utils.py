@@ -16,6 +16,18 @@ class Popup_Utils:
         path: Path = Popup_Utils._get_path(input)
         return path.suffix == ".csv"
 
+    @staticmethod
+    def _statement_path_exists(input: str) -> bool:
+        path: Path = Popup_Utils._get_path(input)
+        return path.is_file() or path.is_dir()
+
+    @staticmethod
+    def _statement_path_is_csv(input: str) -> bool:
+        path: Path = Popup_Utils._get_path(input)
+        if path.is_dir():
+            return any(path.glob("*.csv"))
+        return path.suffix == ".csv"
+
     @staticmethod
     def _directory_exists(input: str) -> bool:
         path: Path = Popup_Utils._get_path(input)
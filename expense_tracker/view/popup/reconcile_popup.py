@@ -10,6 +10,8 @@ from typing import Optional
 
 from expense_tracker.presenter.reconcile import Reconcile
 
+from expense_tracker.model.reconcile_session import Reconcile_Session
+
 from pathlib import Path
 
 from expense_tracker.view.table.exptrack_data_table import Exptrack_Data_Table
@@ -103,6 +105,44 @@ class Reconcile_Popup(ModalScreen):
         self._possible_match_table.refresh_data()
         self._orphan_table.refresh_data()
 
+    def apply_change_set(
+        self, change_set: Optional[Reconcile_Session.Change_Set]
+    ) -> None:
+        """
+        Updates only the rows of each table that were affected by a change to the session.
+
+        Args:
+            change_set: Changes made to the session, if there is none then every table is refreshed.
+        """
+
+        if not change_set:
+            self.refresh_data()
+            return
+
+        for row_id in sorted(change_set.row_id_set):
+            self._reconcile_table.update_display_row(
+                Reconcile.get_statement_row(row_id)
+            )
+
+        # Rows in the possible match table are grouped by statement row, so it is rebuilt when any of the groups change
+        if change_set.possible_match_changed:
+            self._possible_match_table.refresh_data()
+
+        for orphan_id in change_set.removed_orphan_id_set:
+            self._orphan_table.remove_row(str(orphan_id))
+
+        # Orphans are added in the order of the session's orphan list, so every orphan before one being added is already in the table
+        position_dict: dict[int, int] = {
+            orphan.id: position
+            for position, orphan in enumerate(Reconcile.reconcile_session.orphan_list)
+        }
+        for orphan in sorted(
+            change_set.added_orphan_list, key=lambda orphan: position_dict[orphan.id]
+        ):
+            self._orphan_table.insert_display_row(
+                Reconcile.get_orphan_row(orphan), position_dict[orphan.id]
+            )
+
     def action_exit_popup(self) -> None:
         """
         Called when the escape key is pressed.
@@ -10,17 +10,17 @@ from textual.widgets.selection_list import Selection
 
 from expense_tracker.presenter.transaction import Transaction
 from expense_tracker.presenter.tag import Tag
-from expense_tracker.presenter.location import Location
+from expense_tracker.presenter.photo_import import Photo_Import, Photo_Import_Result
 
 from expense_tracker.view.popup.toggle_input_popup import Toggle_Input_Popup
 from expense_tracker.view.popup.create_popup import Create_Popup, Input_Method
 from expense_tracker.view.table.exptrack_data_table import Exptrack_Data_Table
 
-from expense_tracker.model.photo_manager import Photo_Manager
+from expense_tracker.model.photo_manager import Photo_Manager, Photo_Metadata
 
 from expense_tracker.config_manager import Config_Manager
 
-from typing import Optional
+from typing import Optional, Union
 
 
 class Transaction_Create_Popup(Create_Popup):
@@ -32,12 +32,23 @@ class Transaction_Create_Popup(Create_Popup):
         self,
         parent_table: Exptrack_Data_Table,
         excluded_column_key_list: Optional[list[Transaction.Column]] = None,
-        import_list: Optional[list[Path]] = None,
+        import_list: Optional[list[Union[Path, Photo_Import_Result]]] = None,
         name: Optional[str] = None,
         id: Optional[str] = None,
         classes: Optional[str] = None,
     ) -> None:
-        self.import_photo: Optional[Path] = import_list[0] if import_list else None
+        # Photos that were not scanned ahead of time are scanned when their popup opens
+        self.import_result: Optional[Photo_Import_Result] = None
+        if import_list and isinstance(import_list[0], Photo_Import_Result):
+            self.import_result = import_list[0]
+        elif import_list:
+            self.import_result = Photo_Import.scan_photo(
+                import_list[0], Config_Manager().get_same_merchant_mile_radius()
+            )
+
+        self.import_photo: Optional[Path] = (
+            self.import_result.path if self.import_result else None
+        )
 
         super().__init__(
             parent_table,
@@ -50,7 +61,7 @@ class Transaction_Create_Popup(Create_Popup):
             classes=classes,
         )
 
-        self.import_list: list[Path] = []
+        self.import_list: list[Union[Path, Photo_Import_Result]] = []
         if import_list:
             self.import_list = import_list
 
@@ -59,7 +70,7 @@ class Transaction_Create_Popup(Create_Popup):
 
     def _set_defaults(self) -> None:
         """
-        Finds and sets defaults for each column.
+        Sets defaults for each column from the scan of the photo.
         """
 
         self.values[
@@ -67,48 +78,34 @@ class Transaction_Create_Popup(Create_Popup):
         ].value = Config_Manager().get_default_account_id()
         self.values[Transaction.Column.ACCOUNT].input_method = Input_Method.DEFAULT
 
-        description: Optional[str] = Photo_Manager.get_description(self.import_photo)
+        metadata: Photo_Metadata = self.import_result.metadata
+
+        description: Optional[str] = metadata.description
         if description:
             self.values[Transaction.Column.DESCRIPTION].value = description
             self.values[
                 Transaction.Column.DESCRIPTION
             ].input_method = Input_Method.PHOTO
 
-        date: Optional[datetime] = Photo_Manager.get_date(self.import_photo)
+        date: Optional[datetime] = metadata.date
         if date:
             self.values[Transaction.Column.DATE].value = date
             self.values[Transaction.Column.DATE].input_method = Input_Method.PHOTO
 
-        # The rest of the conditions from here on out require both coords and a possible location id
-        coords: Optional[tuple[float, float]] = Photo_Manager.get_coords(
-            self.import_photo
-        )
-        if not coords:
-            return
-
-        # Get the possible locations and set them as defaults
-        possible_location_id: Optional[int] = Location.possible_location(
-            coords, Config_Manager().get_same_merchant_mile_radius()
-        )
-        if not possible_location_id:
+        # The merchant and default tags were found from the photo coords when it was scanned
+        if not self.import_result.merchant_id:
             return
 
-        self.values[Transaction.Column.MERCHANT].value = possible_location_id
+        self.values[Transaction.Column.MERCHANT].value = self.import_result.merchant_id
         self.values[Transaction.Column.MERCHANT].input_method = Input_Method.PHOTO
 
-        # If a merchant was found then get the default tags if there are any and set them
-        default_tag_id_list: list[int] = list(
-            tag[0]
-            for tag in Tag.get_tags_for_merchant_default(
-                self.values[Transaction.Column.MERCHANT].value
-            )
-        )
-
         # If there are no default tags then done set the value
-        if not default_tag_id_list:
+        if not self.import_result.default_tag_id_list:
             return
 
-        self.values[Transaction.Column.TAGS].value = default_tag_id_list
+        self.values[
+            Transaction.Column.TAGS
+        ].value = self.import_result.default_tag_id_list
         self.values[Transaction.Column.TAGS].input_method = Input_Method.PHOTO
 
     def action_submit(self) -> None:
@@ -147,7 +144,7 @@ class Transaction_Create_Popup(Create_Popup):
 
             # Convert tags into selection objects for the selector widget in Toggle_Input_Popup
             tag_list: list[tuple[str, ...]] = []
-            for tag in Tag.get_all():
+            for tag in Tag.get_all_cached():
                 tag_list.append(
                     Selection(tag[1], tag[0], tag[0] in selected_tag_id_list)
                 )
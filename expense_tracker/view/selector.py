@@ -10,15 +10,19 @@ from textual.widgets.option_list import Option as ListOption
 from textual.widgets.option_list import Separator
 from textual.containers import Vertical
 from textual.message import Message
+from textual.timer import Timer
+from textual.worker import Worker, WorkerState
 
 from typing import Optional, NamedTuple
 
-from difflib import SequenceMatcher
-
 from typing import Optional
 
 from expense_tracker.config_manager import Config_Manager
 
+from expense_tracker.view.selector_index import Selector_Index
+
+from expense_tracker.presenter.presenter import Presenter
+
 
 class Selector(Widget):
     """
@@ -43,6 +47,74 @@ class Selector(Widget):
         display_name: str
         option_id: int
 
+    # Most options shown for a search, only the best matches are rendered
+    MAX_RESULTS: int = 50
+
+    # Seconds to wait after the input changes before searching, a search is skipped if the input changes again first
+    SEARCH_DELAY: float = 0.1
+
+    # Presenter class to the cached rows the options were built from, the options and their search index
+    _option_cache_dict: dict[
+        type, tuple[list, list[Selector.Option], Selector_Index]
+    ] = {}
+
+    @staticmethod
+    def get_option_list(presenter: type[Presenter]) -> list[Selector.Option]:
+        """
+        Get an option for every row of a presenter, named by the row's second column.
+
+        Options are only rebuilt when the presenter's cached rows change. The returned list is shared and must not be modified.
+
+        Args:
+            presenter: Presenter of a reference table like accounts, merchants or tags.
+
+        Return: List of options.
+        """
+
+        row_list: list[tuple[str, ...]] = presenter.get_all_cached()
+        cached_row_list, option_list, _ = Selector._option_cache_dict.get(
+            presenter, (None, None, None)
+        )
+        if cached_row_list is not row_list:
+            option_list = list(Selector.Option(row[1], row[0]) for row in row_list)
+            Selector._option_cache_dict[presenter] = (
+                row_list,
+                option_list,
+                Selector._build_index(option_list),
+            )
+
+        return option_list
+
+    @staticmethod
+    def _build_index(option_list: list[Selector.Option]) -> Selector_Index:
+        """
+        Build the search index of a list of options.
+
+        Args:
+            option_list: Options to index.
+
+        Return: Index over the display names of the options.
+        """
+
+        return Selector_Index(list(option.display_name for option in option_list))
+
+    @staticmethod
+    def _get_index(option_list: list[Selector.Option]) -> Selector_Index:
+        """
+        Get the search index of a list of options, cached option lists already have one.
+
+        Args:
+            option_list: Options to search.
+
+        Return: Index over the display names of the options.
+        """
+
+        for _, cached_option_list, index in Selector._option_cache_dict.values():
+            if cached_option_list is option_list:
+                return index
+
+        return Selector._build_index(option_list)
+
     class Submitted(Message):
         """
         Message to indicate that the selector was submitted and to contain the id of the selected option.
@@ -69,6 +141,15 @@ class Selector(Widget):
             classes: The CSS classes for the widget.
         """
         self._option_list: list[Selector.Option] = option_list
+        self._index: Optional[Selector_Index] = None
+
+        # Options currently shown, the best matches of the search in order
+        self._shown_option_list: list[Selector.Option] = option_list
+        self._shown_search_input: str = ""
+
+        # Search waiting for the input to settle and the search running in the background, only the latest search is shown
+        self._search_timer: Optional[Timer] = None
+        self._search_worker: Optional[Worker] = None
         super().__init__(name=name, id=id, classes=classes)
 
     def compose(self) -> ComposeResult:
@@ -90,14 +171,72 @@ class Selector(Widget):
 
     def on_input_changed(self, event: Input.Changed) -> None:
         """
-        Called when the input is changed and updates the options list.
+        Called when the input is changed and searches the options once the input stops changing.
+
+        Args:
+            event: The event that this function is called in response to.
+        """
+
+        self._cancel_search()
+        if event.value:
+            search_input: str = event.value
+            self._search_timer = self.set_timer(
+                Selector.SEARCH_DELAY, lambda: self._start_search(search_input)
+            )
+        else:
+            self.update_options_list()
+        event.stop()
+
+    def _start_search(self, search_input: str) -> None:
+        """
+        Search the options on a background thread, a search that is still running is superseded.
+
+        Args:
+            search_input: Input the options are matched against.
+        """
+
+        self._search_timer = None
+        self._search_worker = self.run_worker(
+            lambda: (search_input, self._search_options_list(search_input)),
+            name="option_search",
+            group="option_search",
+            exit_on_error=False,
+            exclusive=True,
+            thread=True,
+        )
+
+    def _cancel_search(self) -> None:
+        """
+        Drop the search that is waiting or running so its result is never shown.
+        """
+
+        if self._search_timer:
+            self._search_timer.stop()
+            self._search_timer = None
+
+        if self._search_worker:
+            self._search_worker.cancel()
+            self._search_worker = None
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """
+        Called when a search worker changes state, shows the result of the latest search.
 
         Args:
             event: The event that this function is called in response to.
         """
-        self.update_options_list(search_input=event.value)
+
+        if event.worker.name != "option_search":
+            return
         event.stop()
 
+        if event.worker is not self._search_worker:
+            return
+
+        if event.state == WorkerState.SUCCESS:
+            self._search_worker = None
+            self._show_options(*event.worker.result)
+
     def on_input_submitted(self, event: Input.Submitted) -> None:
         """
         Called when the input is submitted and posts submitted message.
@@ -105,8 +244,15 @@ class Selector(Widget):
         Args:
             event: The event that this function is called in response to.
         """
-        self._input_widget.value = self._option_list[0].display_name
-        self.post_message(self.Submitted(self._option_list[0].option_id))
+        # Search now if the options shown are not for the current input
+        if self._input_widget.value != self._shown_search_input:
+            self.update_options_list(search_input=self._input_widget.value)
+
+        if not self._shown_option_list:
+            return
+
+        self._input_widget.value = self._shown_option_list[0].display_name
+        self.post_message(self.Submitted(self._shown_option_list[0].option_id))
 
     def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
         """
@@ -120,39 +266,55 @@ class Selector(Widget):
 
     def update_options_list(self, search_input: Optional[str] = None) -> None:
         """
-        Sorts and re-creates the option list.
+        Finds and redraws the options that match a search.
 
-        Sorts the option list based on how close search_input is to each option and redraws the list in the new order.
+        Every option is shown when there is no search, otherwise only the best matches are shown with the best first. Searches on the calling thread, a background search that has not finished is dropped.
 
         Args:
-            search_input: Input compared against the option list for similarity.
+            search_input: Input the options are matched against.
         """
+
+        self._cancel_search()
+
         if search_input:
-            self._search_options_list(search_input)
+            self._show_options(search_input, self._search_options_list(search_input))
+        else:
+            self._show_options("", self._option_list)
+
+    def _show_options(
+        self, search_input: str, option_list: list[Selector.Option]
+    ) -> None:
+        """
+        Redraw the option list.
+
+        Args:
+            search_input: Input the options were matched against.
+            option_list: Options to show in order.
+        """
+
+        self._shown_option_list = option_list
+        self._shown_search_input = search_input
 
         self._list_view.clear_options()
         self._list_view.add_options(
             ListOption(option.display_name, id=option.option_id)
-            for option in self._option_list
+            for option in self._shown_option_list
         )
 
-    def _search_options_list(self, search_input: str) -> None:
+    def _search_options_list(self, search_input: str) -> list[Selector.Option]:
         """
-        Sort a list of options based on how similar each option it is to search_input.
+        Find the options that best match search_input, the index is built the first time the options are searched.
 
         Args:
-            search_input: Input compared against the option list for similarity.
+            search_input: Input the options are matched against.
+
+        Return: Up to MAX_RESULTS options with the best match first.
         """
 
-        # Create a list with each option and a value that relates the similarity of the option key to the search_input
-        compared_options_list: list[tuple[float, any]] = []
-        for option in self._option_list:
-            compared_option: tuple[float, any] = (
-                option,
-                SequenceMatcher(None, option[0].lower(), search_input.lower()).ratio(),
-            )
-            compared_options_list.append(compared_option)
+        if self._index is None:
+            self._index = Selector._get_index(self._option_list)
 
-        # Sort the list and return
-        compared_options_list.sort(key=lambda x: x[1], reverse=True)
-        self._option_list = list(option[0] for option in compared_options_list)
+        return list(
+            self._option_list[position]
+            for position in self._index.search(search_input, Selector.MAX_RESULTS)
+        )
@@ -0,0 +1,132 @@
+# expense_tracker/view/selector_index.py
+
+import heapq
+
+from threading import Lock
+
+from collections import Counter
+
+from typing import Sequence
+
+
+class Selector_Index:
+    """
+    Trigram index over the display names of a list of options, used to rank options against a search as it is typed.
+
+    Options are ranked by how many trigrams they share with the search, options that start with or contain the search rank above the rest. The trigram counts of each search are kept so a search that extends the previous one only looks up its new trigrams.
+    """
+
+    # Names are padded so the first letters of a name form trigrams of their own
+    PADDING: str = "  "
+
+    # Added to the score of options that start with or contain the search
+    PREFIX_BONUS: float = 1
+    SUBSTRING_BONUS: float = 0.5
+
+    def __init__(self, name_list: Sequence[str]) -> None:
+        """
+        Build the index.
+
+        Args:
+            name_list: Display name of each option, results refer to options by their position in this list.
+        """
+
+        self._name_list: list[str] = list(name.lower() for name in name_list)
+
+        # Trigram to the positions of the names that contain it
+        self._posting_dict: dict[str, list[int]] = {}
+        self._trigram_count_list: list[int] = []
+        for position, name in enumerate(self._name_list):
+            trigram_set: set[str] = Selector_Index._trigrams(name)
+            self._trigram_count_list.append(len(trigram_set))
+            for trigram in trigram_set:
+                self._posting_dict.setdefault(trigram, []).append(position)
+
+        # Searches made so far, each with its trigrams and the number of them shared by each name, every search extends the one before it
+        self._search_stack: list[tuple[str, set[str], Counter]] = []
+
+        # Searches can run on background threads, the search stack is only used by one at a time
+        self._lock: Lock = Lock()
+
+    @staticmethod
+    def _trigrams(text: str) -> set[str]:
+        """
+        Get the trigrams of a lower case string.
+
+        Args:
+            text: String to split.
+
+        Return: Set of every three character substring of the padded string.
+        """
+
+        padded: str = Selector_Index.PADDING + text
+        return set(padded[index : index + 3] for index in range(len(padded) - 2))
+
+    def _shared_counts(self, search: str) -> tuple[set[str], Counter]:
+        """
+        Count the trigrams each name shares with a search, reusing the counts of the longest previous search it extends.
+
+        Args:
+            search: Lower case search.
+
+        Return: Tuple of the trigrams of the search and the number shared by each name that shares any.
+        """
+
+        while self._search_stack and not search.startswith(self._search_stack[-1][0]):
+            self._search_stack.pop()
+
+        trigram_set: set[str] = Selector_Index._trigrams(search)
+        shared_counter: Counter = Counter()
+        new_trigram_set: set[str] = trigram_set
+
+        # A search contains every trigram of the searches it extends, only its new trigrams need to be counted
+        if self._search_stack:
+            (
+                previous_search,
+                previous_trigram_set,
+                previous_counter,
+            ) = self._search_stack[-1]
+            if previous_search == search:
+                return previous_trigram_set, previous_counter
+            shared_counter = previous_counter.copy()
+            new_trigram_set = trigram_set - previous_trigram_set
+
+        for trigram in new_trigram_set:
+            shared_counter.update(self._posting_dict.get(trigram, ()))
+
+        self._search_stack.append((search, trigram_set, shared_counter))
+        return trigram_set, shared_counter
+
+    def search(self, search: str, limit: int) -> list[int]:
+        """
+        Find the options that best match a search.
+
+        Args:
+            search: Text typed by the user.
+            limit: Maximum number of options to return.
+
+        Return: Positions of the best matching options, best first. Options that share no trigrams with the search are left out.
+        """
+
+        search = search.lower()
+        with self._lock:
+            trigram_set, shared_counter = self._shared_counts(search)
+
+        def score(position: int) -> tuple[float, int]:
+            name: str = self._name_list[position]
+
+            # Dice coefficient of the trigram sets
+            value: float = (
+                2
+                * shared_counter[position]
+                / (len(trigram_set) + self._trigram_count_list[position])
+            )
+            if name.startswith(search):
+                value += Selector_Index.PREFIX_BONUS
+            elif search in name:
+                value += Selector_Index.SUBSTRING_BONUS
+
+            # Ties keep the original order of the options
+            return value, -position
+
+        return heapq.nlargest(limit, shared_counter, key=score)
@@ -45,6 +45,10 @@ class Exptrack_Data_Table(DataTable):
         ("e", "expand", "Expand"),
     ]
 
+    # Column and direction that the pages of _get_row_page are sorted by, rows created or edited into the loaded pages are placed by them. Rows are appended when there is no sort column.
+    SORT_COLUMN: Optional[Enum] = None
+    SORT_DESCENDING: bool = False
+
     class Data_Edited(Message):
         """
         Message to signal that data in the table has been edited.
@@ -69,6 +73,11 @@ class Exptrack_Data_Table(DataTable):
             classes: The CSS classes for the widget.
         """
         self.presenter: Presenter = presenter
+        self._next_page_cursor: Optional[Any] = None
+
+        # Cursor of each loaded row by row key, only known for rows that have been placed by a change
+        self._cursor_dict: dict[str, tuple[Any, int]] = {}
+
         self.column_list: list[Exptrack_Data_Table.Column] = []
         for column in column_list:
             if type(column) == Exptrack_Data_Table.Column:
@@ -99,6 +108,164 @@ class Exptrack_Data_Table(DataTable):
 
         self.refresh_data()
 
+        # Keep rows up to date when they are changed anywhere in the app
+        if isinstance(self.presenter, type) and issubclass(self.presenter, Presenter):
+            self.presenter.subscribe(self.apply_change)
+
+    def on_unmount(self) -> None:
+        """
+        Called when the widget is unmounted, stops listening for changes to the presenter's rows.
+        """
+
+        if isinstance(self.presenter, type) and issubclass(self.presenter, Presenter):
+            self.presenter.unsubscribe(self.apply_change)
+
+    def apply_change(self, change: Presenter.Change) -> None:
+        """
+        Patches only the rows affected by a change instead of reloading the table.
+
+        Only rows that sort before the next page are in the table, created and edited rows are added, moved or removed so the loaded pages stay in order. The rest are added when their page loads.
+
+        Args:
+            change: IDs of the rows that were created, updated or deleted.
+        """
+
+        for id in change.deleted_id_list:
+            self._cursor_dict.pop(str(id), None)
+            if RowKey(str(id)) in self.rows:
+                self.remove_row(str(id))
+
+        if self.SORT_COLUMN is None:
+            for id in change.updated_id_list:
+                if RowKey(str(id)) in self.rows:
+                    self.update_display_row(self.presenter.get_by_id(id))
+
+            for id in change.created_id_list:
+                if RowKey(str(id)) not in self.rows:
+                    self.add_display_row(self.presenter.get_by_id(id))
+            return
+
+        changed_id_list: list[int] = list(
+            dict.fromkeys(change.updated_id_list + change.created_id_list)
+        )
+        cursor_dict: dict[int, tuple[Any, int]] = self.presenter.get_cursors(
+            changed_id_list, self.SORT_COLUMN
+        )
+
+        order_changed: bool = False
+        for id in changed_id_list:
+            key: str = str(id)
+            cursor: Optional[tuple[Any, int]] = cursor_dict.get(id)
+
+            # Rows that sort after the loaded pages are dropped, their page will add them
+            if cursor is None or not self._is_loaded(cursor):
+                self._cursor_dict.pop(key, None)
+                if RowKey(key) in self.rows:
+                    self.remove_row(key)
+                continue
+
+            if RowKey(key) in self.rows:
+                self.update_display_row(self.presenter.get_by_id(id))
+                order_changed = order_changed or self._cursor_dict.get(key) != cursor
+            else:
+                self.add_display_row(self.presenter.get_by_id(id))
+                order_changed = True
+            self._cursor_dict[key] = cursor
+
+        if order_changed:
+            self._sort_rows()
+
+    def _is_loaded(self, cursor: tuple[Any, int]) -> bool:
+        """
+        Check if a row belongs in the pages that have been loaded.
+
+        Args:
+            cursor: Sort value and id of the row.
+
+        Return: True if every page has been loaded or the row sorts before the next page.
+        """
+
+        if self._next_page_cursor is None:
+            return True
+
+        sort_key: tuple = Presenter.cursor_sort_key(cursor)
+        next_page_key: tuple = Presenter.cursor_sort_key(self._next_page_cursor)
+        if self.SORT_DESCENDING:
+            return sort_key >= next_page_key
+        return sort_key <= next_page_key
+
+    def _sort_rows(self) -> None:
+        """
+        Put the loaded rows in the order of their sort values, the cursors of rows that were loaded with their page are read first. Rows that no longer exist are removed.
+        """
+
+        missing_key_list: list[str] = list(
+            row_key.value
+            for row_key in self.rows
+            if row_key.value not in self._cursor_dict
+        )
+        if missing_key_list:
+            cursor_dict: dict[int, tuple[Any, int]] = self.presenter.get_cursors(
+                list(int(key) for key in missing_key_list), self.SORT_COLUMN
+            )
+            for key in missing_key_list:
+                cursor: Optional[tuple[Any, int]] = cursor_dict.get(int(key))
+                if cursor is None:
+                    self.remove_row(key)
+                else:
+                    self._cursor_dict[key] = cursor
+
+        row_key_list: list[RowKey] = list(row.key for row in self.ordered_rows)
+        ordered_row_key_list: list[RowKey] = sorted(
+            row_key_list,
+            key=lambda row_key: Presenter.cursor_sort_key(
+                self._cursor_dict[row_key.value]
+            ),
+            reverse=self.SORT_DESCENDING,
+        )
+
+        # DataTable can only sort by the displayed cells, every row from the first one out of place is moved to the end in order
+        first_index: int = next(
+            (
+                index
+                for index, (row_key, ordered_row_key) in enumerate(
+                    zip(row_key_list, ordered_row_key_list)
+                )
+                if row_key != ordered_row_key
+            ),
+            len(row_key_list),
+        )
+        self._move_rows_to_end(ordered_row_key_list[first_index:])
+
+    def _move_rows_to_end(self, row_key_list: list[RowKey]) -> None:
+        """
+        Move rows to the end of the table in the given order, DataTable only adds rows to the end so they are removed and added again. The cursor stays on the row it was on.
+
+        Args:
+            row_key_list: Keys of the rows to move.
+        """
+
+        if not row_key_list:
+            return
+
+        cursor_row_key: Optional[RowKey] = (
+            self.ordered_rows[self.cursor_row].key
+            if 0 <= self.cursor_row < self.row_count
+            else None
+        )
+
+        moved_row_list: list[tuple[RowKey, list[Any], int]] = list(
+            (row_key, self.get_row(row_key), self.rows[row_key].height)
+            for row_key in row_key_list
+        )
+        for row_key, cell_list, height in moved_row_list:
+            self.remove_row(row_key)
+        for row_key, cell_list, height in moved_row_list:
+            self.add_row(*cell_list, height=height, key=row_key.value)
+
+        if cursor_row_key is not None:
+            self.move_cursor(row=self.get_row_index(cursor_row_key))
+
     def get_content_height(self, container: Size, viewport: Size, width: int) -> int:
         """
         Sets the height of the table.
@@ -113,37 +280,128 @@ class Exptrack_Data_Table(DataTable):
 
         self.clear()
 
-        for row in self._get_row_data():
-            trimmed_row: list = list(
-                cell
-                for cell, column in zip(row, self.column_list)
-                if not column.expanded_view_only
-            )
+        self._next_page_cursor: Optional[Any] = None
+        self._cursor_dict = {}
+        self._add_page(None)
 
-            # Check that the row is of correct length
-            if len(self.columns) != len(trimmed_row):
-                raise ValueError(
-                    f"Table has {len(self.columns)} columns but was given a row with {len(trimmed_row)} values."
-                )
-            # Check that the row is of correct type
-            if not all(type(cell) == str for cell in trimmed_row):
-                raise ValueError(f"Row {trimmed_row} must only contain strings.")
+    def load_next_page(self) -> None:
+        """
+        Adds the next page of rows to the end of the table if there is one.
+        """
+
+        if self._next_page_cursor is None:
+            return
+
+        self._add_page(self._next_page_cursor)
+
+    def _add_page(self, cursor: Optional[Any]) -> None:
+        """
+        Gets a page of rows and adds it to the end of the table, rows that a change already added are skipped.
+
+        Args:
+            cursor: Cursor of the page to get, None for the first page.
+        """
+
+        row_list, self._next_page_cursor = self._get_row_page(cursor)
+
+        for row in row_list:
+            if RowKey(row[0]) not in self.rows:
+                self.add_display_row(row)
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        """
+        Called when the table is scrolled, loads the next page when the bottom of the table is less than a screen away.
+        """
+
+        super().watch_scroll_y(old_value, new_value)
 
-            # Calculate the height that each cell requires and the height that the row will have to be to accommodate it
-            cell_height_list: list[int] = list(
-                cell.count("\n") + 1 for cell in trimmed_row
+        if (
+            self._next_page_cursor is not None
+            and new_value >= self.max_scroll_y - self.size.height
+        ):
+            self.call_after_refresh(self.load_next_page)
+
+    def add_display_row(self, row: tuple[str, ...]) -> None:
+        """
+        Adds a row in display format to the end of the table.
+
+        Args:
+            row: Row in display format, the first cell is used as the row key.
+        """
+
+        trimmed_row: list[str] = self._trim_row(row)
+
+        # Calculate the height that each cell requires and the height that the row will have to be to accommodate it
+        cell_height_list: list[int] = list(cell.count("\n") + 1 for cell in trimmed_row)
+        row_height: int = max(cell_height_list)
+
+        # Style and add the row
+        self.add_row(
+            *(
+                Text(cell, style=self.get_row_style(trimmed_row))
+                for cell in trimmed_row
+            ),
+            key=row[0],
+            height=row_height,
+        )
+
+    def insert_display_row(self, row: tuple[str, ...], index: int) -> None:
+        """
+        Adds a row in display format at a position in the table.
+
+        Args:
+            row: Row in display format, the first cell is used as the row key.
+            index: Position of the row in the table.
+        """
+
+        moved_row_key_list: list[RowKey] = list(
+            ordered_row.key for ordered_row in self.ordered_rows[index:]
+        )
+        self.add_display_row(row)
+        self._move_rows_to_end(moved_row_key_list)
+
+    def update_display_row(self, row: tuple[str, ...]) -> None:
+        """
+        Replaces the cells of a row that is already in the table.
+
+        Args:
+            row: Row in display format, the first cell is the key of the row to update.
+        """
+
+        trimmed_row: list[str] = self._trim_row(row)
+        style: str = self.get_row_style(trimmed_row)
+
+        for cell, column_key in zip(trimmed_row, self.columns):
+            self.update_cell(
+                RowKey(row[0]), column_key, Text(cell, style=style), update_width=True
             )
-            row_height: int = max(cell_height_list)
-
-            # Style and add the row
-            self.add_row(
-                *(
-                    Text(cell, style=self.get_row_style(trimmed_row))
-                    for cell in trimmed_row
-                ),
-                key=row[0],
-                height=row_height,
+
+    def _trim_row(self, row: tuple[str, ...]) -> list[str]:
+        """
+        Removes the cells of columns that are only shown in the expanded view and validates the row.
+
+        Args:
+            row: Row in display format.
+
+        Return: List of the cells that are displayed in the table.
+        """
+
+        trimmed_row: list = list(
+            cell
+            for cell, column in zip(row, self.column_list)
+            if not column.expanded_view_only
+        )
+
+        # Check that the row is of correct length
+        if len(self.columns) != len(trimmed_row):
+            raise ValueError(
+                f"Table has {len(self.columns)} columns but was given a row with {len(trimmed_row)} values."
             )
+        # Check that the row is of correct type
+        if not all(type(cell) == str for cell in trimmed_row):
+            raise ValueError(f"Row {trimmed_row} must only contain strings.")
+
+        return trimmed_row
 
     def get_row_style(self, row: tuple[str, ...]) -> str:
         """
@@ -157,6 +415,22 @@ class Exptrack_Data_Table(DataTable):
 
         return ""
 
+    def _get_row_page(
+        self, cursor: Optional[Any]
+    ) -> tuple[list[tuple[str, ...]], Optional[Any]]:
+        """
+        Gets a page of rows for the table, should be extended if the table is too large to load at once.
+
+        By default the whole table is a single page from _get_row_data.
+
+        Args:
+            cursor: Cursor of the page to get, None for the first page.
+
+        Return: Tuple of the list of rows in display format and the cursor for the next page, or None if there are no more pages.
+        """
+
+        return self._get_row_data(), None
+
     def _get_row_data(self) -> list[tuple[str, ...]]:
         """
         Gets the rows for the table, should be extended if table requires filtered data.
@@ -71,10 +71,7 @@ class Location_Table(Exptrack_Data_Table):
 
         if column == Location.Column.MERCHANT:
             return Options_Input_Popup(
-                list(
-                    Selector.Option(merchant[1], merchant[0])
-                    for merchant in Merchant.get_all()
-                ),
+                Selector.get_option_list(Merchant),
                 instructions="Select a merchant",
             )
 
@@ -87,13 +87,13 @@ class Merchant_Table(Exptrack_Data_Table):
 
         if column == Merchant.Column.DEFAULT_TAGS:
             default_tag_list: list[tuple[str, ...]] = (
-                Tag.get_tags_for_merchant_default(id) if id else Tag.get_all()
+                Tag.get_tags_for_merchant_default(id) if id else Tag.get_all_cached()
             )
             selected_tag_id_list: list[int] = list(tag[0] for tag in default_tag_list)
 
             tag_list: list[tuple[str, ...]] = []
 
-            for tag in Tag.get_all():
+            for tag in Tag.get_all_cached():
                 tag_list.append(
                     Selection(tag[1], tag[0], tag[0] in selected_tag_id_list)
                 )
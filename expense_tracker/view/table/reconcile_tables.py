@@ -70,10 +70,7 @@ class Reconcile_Table(Exptrack_Data_Table):
 
         if column == Reconcile.Full_Column.ST_MERCHANT:
             return Options_Input_Popup(
-                list(
-                    Selector.Option(merchant[1], merchant[0])
-                    for merchant in Merchant.get_all()
-                ),
+                Selector.get_option_list(Merchant),
                 instructions="Select a merchant",
             )
 
@@ -85,9 +82,9 @@ class Reconcile_Table(Exptrack_Data_Table):
         """
         Called when table data is edited.
 
-        Refreshes the view with the new data.
+        Applies the changes from the edit to the view.
         """
-        self.parent.parent.refresh_data()
+        self.parent.parent.apply_change_set(Reconcile.last_change_set)
 
 
 class Possible_Match_Table(Exptrack_Data_Table):
@@ -126,10 +123,7 @@ class Possible_Match_Table(Exptrack_Data_Table):
 
         if column == Reconcile.Full_Column.ST_MERCHANT:
             return Options_Input_Popup(
-                list(
-                    Selector.Option(merchant[1], merchant[0])
-                    for merchant in Merchant.get_all()
-                ),
+                Selector.get_option_list(Merchant),
                 instructions="Select a merchant",
             )
 
@@ -141,9 +135,9 @@ class Possible_Match_Table(Exptrack_Data_Table):
         """
         Called when table data is edited.
 
-        Refreshes the view with the new data.
+        Applies the changes from the edit to the view.
         """
-        self.parent.parent.refresh_data()
+        self.parent.parent.apply_change_set(Reconcile.last_change_set)
 
 
 class Orphan_Table(Exptrack_Data_Table):
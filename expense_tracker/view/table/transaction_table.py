@@ -2,6 +2,7 @@
 
 from enum import Enum
 from typing import Any, Optional
+from datetime import datetime
 from textual.screen import ModalScreen
 from textual.validation import Number
 from textual.widgets.selection_list import Selection
@@ -33,6 +34,11 @@ class Transaction_Table(Exptrack_Data_Table):
         ("r", "reconcile", "Reconcile"),
     ]
 
+    PAGE_SIZE: int = 200
+
+    SORT_COLUMN: Enum = Transaction.Column.DATE
+    SORT_DESCENDING: bool = True
+
     COLUMN_LIST: list[tuple[str, Enum, bool]] = [
         ("ID", Transaction.Column.ID),
         ("Status", Transaction.Column.RECONCILED_STATUS),
@@ -52,6 +58,20 @@ class Transaction_Table(Exptrack_Data_Table):
     ) -> None:
         super().__init__(Transaction, Transaction_Table.COLUMN_LIST, name, id, classes)
 
+    def _get_row_page(
+        self, cursor: Optional[tuple[datetime, int]]
+    ) -> tuple[list[tuple[str, ...]], Optional[tuple[datetime, int]]]:
+        """
+        Gets a page of transactions, newest first, the rest are loaded as the table is scrolled.
+        """
+
+        return Transaction.query(
+            sort_column=Transaction_Table.SORT_COLUMN,
+            descending=Transaction_Table.SORT_DESCENDING,
+            limit=Transaction_Table.PAGE_SIZE,
+            cursor=cursor,
+        )
+
     def action_create(self) -> None:
         """
         Called when c is pressed.
@@ -97,22 +117,14 @@ class Transaction_Table(Exptrack_Data_Table):
         """
 
         if column == Transaction.Column.ACCOUNT:
-            return Options_Input_Popup(
-                list(
-                    Selector.Option(account[1], account[0])
-                    for account in Account.get_all()
-                )
-            )
+            return Options_Input_Popup(Selector.get_option_list(Account))
 
         if column == Transaction.Column.DESCRIPTION:
             return Text_Input_Popup(instructions="Input a description")
 
         if column == Transaction.Column.MERCHANT:
             return Options_Input_Popup(
-                list(
-                    Selector.Option(merchant[1], merchant[0])
-                    for merchant in Merchant.get_all()
-                ),
+                Selector.get_option_list(Merchant),
                 instructions="Select a merchant",
             )
 
@@ -121,13 +133,13 @@ class Transaction_Table(Exptrack_Data_Table):
 
         if column == Transaction.Column.TAGS:
             selected_tag_list: list[tuple[str, ...]] = (
-                Tag.get_tags_for_transaction(id) if id else Tag.get_all()
+                Tag.get_tags_for_transaction(id) if id else Tag.get_all_cached()
             )
             selected_tag_id_list: list[int] = list(tag[0] for tag in selected_tag_list)
 
             tag_list: list[tuple[str, ...]] = []
 
-            for tag in Tag.get_all():
+            for tag in Tag.get_all_cached():
                 tag_list.append(
                     Selection(tag[1], tag[0], tag[0] in selected_tag_id_list)
                 )
@@ -0,0 +1,53 @@
+# tests/conftest.py
+
+import os
+import tempfile
+
+# Config_Manager creates settings.ini and the database relative to the working directory the first time it is imported, run the tests from a scratch directory so they never touch a real database
+os.chdir(tempfile.mkdtemp())
+
+import pytest
+
+from expense_tracker.model.orm import engine, Base
+from expense_tracker.model.orm.db_transaction import DB_Transaction
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+from expense_tracker.model.orm.db_amount import DB_Amount
+from expense_tracker.model.orm.db_account import DB_Account
+from expense_tracker.model.orm.db_merchant_location import DB_Merchant_Location
+from expense_tracker.model.orm.db_tag import DB_Tag
+from expense_tracker.model.orm.db_budget import DB_Budget
+from expense_tracker.model.orm.db_month_budget import DB_Month_Budget
+from expense_tracker.model.orm.db_reconcile_checkpoint import DB_Reconcile_Checkpoint
+from expense_tracker.model.orm.db_reconcile_checkpoint_row import (
+    DB_Reconcile_Checkpoint_Row,
+)
+
+from expense_tracker.model.merchant_matcher import Merchant_Matcher
+from expense_tracker.model.session_manager import Session_Manager
+from expense_tracker.model.tag_repository import Tag_Repository
+from expense_tracker.model.transaction_totals import Transaction_Totals
+
+from expense_tracker.presenter.presenter import Presenter
+
+
+@pytest.fixture
+def database() -> None:
+    """
+    Provide an empty database and clear every in memory cache built from it.
+    """
+
+    Session_Manager.remove()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    Merchant_Matcher.invalidate()
+    Transaction_Totals.invalidate()
+    Tag_Repository.invalidate()
+    Presenter.clear_cache()
+
+    yield
+
+    Session_Manager.remove()
+    Merchant_Matcher.invalidate()
+    Transaction_Totals.invalidate()
+    Tag_Repository.invalidate()
+    Presenter.clear_cache()
@@ -0,0 +1,109 @@
+# tests/helpers.py
+
+"""
+Helpers shared by the tests.
+"""
+
+from datetime import datetime, timedelta
+
+from pathlib import Path
+
+from exif import Image
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_transaction import DB_Transaction
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+from expense_tracker.model.orm.db_amount import DB_Amount
+from expense_tracker.model.orm.db_account import DB_Account
+from expense_tracker.model.orm.db_tag import DB_Tag
+from expense_tracker.model.orm.branch_table import Branch_Table
+
+
+def add_transactions(count: int) -> None:
+    """
+    Bulk insert transactions, each with one tagged amount, continuing from the transactions already in the database.
+    """
+
+    with Session(engine) as session:
+        if not session.get(DB_Account, 1):
+            session.add(
+                DB_Account(
+                    name="Checking",
+                    statement_description_column_index=0,
+                    statement_amount_column_index=1,
+                    statement_date_column_index=2,
+                )
+            )
+            session.add(DB_Merchant(name="Grocery"))
+            session.add(DB_Tag(name="Food", instance_tag=False))
+            session.flush()
+
+        first_id: int = session.query(DB_Transaction).count() + 1
+        id_list: range = range(first_id, first_id + count)
+
+        session.execute(
+            insert(DB_Transaction),
+            list(
+                {
+                    "id": id,
+                    "account_id": 1,
+                    "description": f"Transaction {id}",
+                    "merchant_id": 1,
+                    "date": datetime(2020, 1, 1) + timedelta(hours=id),
+                    "reconciled_status": False,
+                    "total": id,
+                }
+                for id in id_list
+            ),
+        )
+        session.execute(
+            insert(DB_Amount),
+            list({"id": id, "transaction_id": id, "amount": id} for id in id_list),
+        )
+        session.execute(
+            insert(Branch_Table.amount_tag),
+            list({"amount_id": id, "tag_id": 1} for id in id_list),
+        )
+        session.commit()
+
+
+def count_queries(function) -> tuple[int, any]:
+    """
+    Run a function and count the statements it executes.
+
+    Return: Tuple of the number of statements and the function result.
+    """
+
+    statement_list: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statement_list.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = function()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    return len(statement_list), result
+
+
+def write_photo(path: Path, trailing_size: int = 0) -> Path:
+    """
+    Write a minimal JPEG with EXIF metadata, followed by filler image data of the given size.
+    """
+
+    image: Image = Image(b"\xff\xd8\xff\xdb\x00\x04\x00\x00\xff\xd9")
+    image.image_description = "Coffee\nShop"
+    image.datetime = "2023:07:04 12:30:00"
+    image.gps_latitude = (35.0, 54.0, 0.0)
+    image.gps_latitude_ref = "N"
+    image.gps_longitude = (79.0, 0.0, 36.0)
+    image.gps_longitude_ref = "W"
+
+    jpeg: bytes = image.get_file()
+    path.write_bytes(jpeg[:-2] + b"\xff\xda" + b"\x00" * trailing_size + jpeg[-2:])
+    return path
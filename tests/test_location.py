@@ -0,0 +1,46 @@
+# tests/test_location.py
+
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+from expense_tracker.model.orm.db_merchant_location import DB_Merchant_Location
+
+from expense_tracker.presenter.location import Location
+
+
+def _add_locations(coord_list: list[tuple[float, float]]) -> None:
+    """
+    Add a merchant and location for each coordinate, the merchant id matches the position in the list starting at 1.
+    """
+
+    with Session(engine) as session:
+        for index, (x_coord, y_coord) in enumerate(coord_list):
+            merchant: DB_Merchant = DB_Merchant(name=f"Merchant {index}")
+            session.add(merchant)
+            session.flush()
+            session.add(
+                DB_Merchant_Location(
+                    merchant_id=merchant.id,
+                    name=f"Location {index}",
+                    x_coord=x_coord,
+                    y_coord=y_coord,
+                )
+            )
+        session.commit()
+
+
+def test_possible_location_returns_closest_in_radius(database) -> None:
+    _add_locations([(35.9, -79.0), (35.901, -79.0), (35.95, -79.0)])
+
+    # The second location is about 0.014 miles away and the first about 0.08 miles, the third is about 3.4 miles away
+    assert Location.possible_location((35.9012, -79.0), 0.2) == 2
+    assert Location.possible_location((35.95, -79.0), 0.2) == 3
+    assert Location.possible_location((36.5, -79.0), 0.2) is None
+
+
+def test_possible_location_across_antimeridian(database) -> None:
+    _add_locations([(0, 179.9995), (0, 170)])
+
+    # Locations on the other side of 180 degrees longitude are still found
+    assert Location.possible_location((0, -179.9995), 0.2) == 1
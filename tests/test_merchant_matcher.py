@@ -0,0 +1,51 @@
+# tests/test_merchant_matcher.py
+
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+
+from expense_tracker.model.merchant_matcher import Merchant_Matcher
+from expense_tracker.presenter.merchant import Merchant
+
+
+def _add_merchants(*merchant_list: tuple[str, str]) -> None:
+    with Session(engine) as session:
+        for name, naming_rule in merchant_list:
+            session.add(DB_Merchant(name=name, naming_rule=naming_rule))
+        session.commit()
+
+
+def test_first_matching_rule_wins(database) -> None:
+    _add_merchants(
+        ("Grocery", "FOOD"),
+        ("Coffee", "(?i)coffee"),
+        ("Gas", r"(SHELL|EXXON) \d+"),
+        ("Paint", "^COLOU?R"),
+        ("Anything", "."),
+    )
+
+    assert Merchant_Matcher.match("SHELL 123 FOOD MART").name == "Grocery"
+    assert Merchant_Matcher.match("Morning COFFEE").name == "Coffee"
+    assert Merchant_Matcher.match("EXXON 42").name == "Gas"
+    assert Merchant_Matcher.match("COLOR WORLD").name == "Paint"
+    assert Merchant_Matcher.match("Other").name == "Anything"
+    assert Merchant_Matcher.match("") is None
+
+
+def test_invalid_and_empty_rules_are_skipped(database) -> None:
+    _add_merchants(("Broken", "(unclosed"), ("Empty", ""), ("Store", "STORE"))
+
+    assert Merchant_Matcher.match("(unclosed STORE").name == "Store"
+    assert Merchant_Matcher.match("nothing") is None
+
+
+def test_rule_changes_invalidate_matcher(database) -> None:
+    _add_merchants(("Store", "STORE"))
+    assert Merchant_Matcher.match("NEW SHOP") is None
+
+    Merchant.create({Merchant.Column.NAME: "Shop", Merchant.Column.NAMING_RULE: "SHOP"})
+    assert Merchant_Matcher.match("NEW SHOP").name == "Shop"
+
+    Merchant.set_value(1, Merchant.Column.NAMING_RULE, "NEW")
+    assert Merchant_Matcher.match("NEW SHOP").name == "Store"
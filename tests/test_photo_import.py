@@ -0,0 +1,45 @@
+# tests/test_photo_import.py
+
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+from expense_tracker.model.orm.db_merchant_location import DB_Merchant_Location
+from expense_tracker.model.orm.db_tag import DB_Tag
+
+from expense_tracker.presenter.photo_import import Photo_Import, Photo_Import_Result
+
+from tests.helpers import write_photo
+
+
+def test_scan_finds_defaults_in_order(database, tmp_path: Path) -> None:
+    with Session(engine) as session:
+        tag: DB_Tag = DB_Tag(name="Food", instance_tag=False)
+        merchant: DB_Merchant = DB_Merchant(name="Coffee", default_tags=[tag])
+        session.add(merchant)
+        session.flush()
+        session.add(
+            DB_Merchant_Location(
+                merchant_id=merchant.id, name="Cafe", x_coord=35.9, y_coord=-79.01
+            )
+        )
+        session.commit()
+
+    path_list: list[Path] = list(
+        write_photo(tmp_path / f"photo_{index}.jpg") for index in range(20)
+    )
+    progress_list: list[tuple[int, int]] = []
+
+    result_list: list[Photo_Import_Result] = Photo_Import.scan(
+        path_list,
+        progress=lambda scanned_count, total: progress_list.append(
+            (scanned_count, total)
+        ),
+    )
+
+    assert list(result.path for result in result_list) == path_list
+    assert all(result.merchant_id == 1 for result in result_list)
+    assert all(result.default_tag_id_list == ["1"] for result in result_list)
+    assert progress_list[-1] == (20, 20)
@@ -0,0 +1,37 @@
+# tests/test_photo_manager.py
+
+from datetime import datetime
+
+from pathlib import Path
+
+from expense_tracker.model.photo_manager import Photo_Manager, Photo_Metadata
+
+from tests.helpers import write_photo
+
+
+def test_get_metadata(tmp_path: Path) -> None:
+    path: Path = write_photo(tmp_path / "photo.jpg")
+
+    assert Photo_Manager.get_metadata(path) == Photo_Metadata(
+        date=datetime(2023, 7, 4, 12, 30),
+        description="Coffee Shop",
+        coords=(35.9, -79.01),
+    )
+
+
+def test_only_exif_segment_is_read(tmp_path: Path) -> None:
+    path: Path = write_photo(tmp_path / "photo.jpg", trailing_size=1_000_000)
+
+    with open(path, "rb") as src:
+        segment: bytes = Photo_Manager._read_exif_segment(src)
+        position: int = src.tell()
+
+    assert segment.startswith(b"\xff\xe1")
+    assert position == 2 + len(segment)
+
+
+def test_get_metadata_without_exif(tmp_path: Path) -> None:
+    path: Path = tmp_path / "photo.png"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n")
+
+    assert Photo_Manager.get_metadata(path) == Photo_Metadata()
@@ -0,0 +1,107 @@
+# tests/test_presenter_query.py
+
+import pytest
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_transaction import DB_Transaction
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+
+from expense_tracker.presenter.merchant import Merchant
+from expense_tracker.presenter.transaction import Transaction
+
+from tests.helpers import add_transactions, count_queries
+
+
+def _read_pages(presenter, limit: int, **kwargs) -> list[tuple[str, ...]]:
+    """
+    Read every page of a query.
+    """
+
+    row_list: list[tuple[str, ...]] = []
+    cursor = None
+    while True:
+        page, cursor = presenter.query(limit=limit, cursor=cursor, **kwargs)
+        row_list += page
+        if cursor is None:
+            return row_list
+
+
+def test_pages_match_a_single_query(database) -> None:
+    add_transactions(25)
+
+    # Give transactions the same amount so the sort has ties for the id to break
+    with Session(engine) as session:
+        session.execute(update(DB_Transaction).values(total=DB_Transaction.id % 3))
+        session.commit()
+
+    for descending in (False, True):
+        row_list, cursor = Transaction.query(
+            sort_column=Transaction.Column.AMOUNT, descending=descending
+        )
+        assert cursor is None
+        assert len(row_list) == 25
+        assert (
+            _read_pages(
+                Transaction,
+                4,
+                sort_column=Transaction.Column.AMOUNT,
+                descending=descending,
+            )
+            == row_list
+        )
+
+
+def test_filters_run_in_sql(database) -> None:
+    add_transactions(10)
+
+    query_count, (row_list, cursor) = count_queries(
+        lambda: Transaction.query(
+            filter_dict={
+                Transaction.Column.ID: [2, 4, 6],
+                Transaction.Column.ACCOUNT: 1,
+            },
+            sort_column=Transaction.Column.DATE,
+            descending=True,
+            limit=2,
+        )
+    )
+    assert query_count == 1
+    assert list(row[0] for row in row_list) == ["6", "4"]
+    row_list, cursor = Transaction.query(
+        filter_dict={Transaction.Column.ID: [2, 4, 6]},
+        sort_column=Transaction.Column.DATE,
+        descending=True,
+        limit=2,
+        cursor=cursor,
+    )
+    assert list(row[0] for row in row_list) == ["2"]
+    assert cursor is None
+
+    with pytest.raises(ValueError):
+        Transaction.query(filter_dict={Transaction.Column.TAGS: [1]})
+
+
+def test_null_sort_values_page_in_sqlite_order(database) -> None:
+    with Session(engine) as session:
+        session.add_all(
+            DB_Merchant(name=f"Merchant {index}", naming_rule=rule)
+            for index, rule in enumerate([None, "b", None, "a", "b"])
+        )
+        session.commit()
+
+    for descending in (False, True):
+        row_list, _ = Merchant.query(
+            sort_column=Merchant.Column.NAMING_RULE, descending=descending
+        )
+        assert (
+            _read_pages(
+                Merchant,
+                2,
+                sort_column=Merchant.Column.NAMING_RULE,
+                descending=descending,
+            )
+            == row_list
+        )
@@ -0,0 +1,77 @@
+# tests/test_reconcile_matcher.py
+
+import random
+
+from itertools import permutations
+
+from expense_tracker.model.reconcile_matcher import Reconcile_Matcher
+
+
+def _brute_force(edge_dict: dict[int, dict[int, float]]) -> tuple[int, float]:
+    """
+    Find the most matches and their lowest total cost by trying every assignment.
+    """
+
+    row_list: list[int] = list(edge_dict)
+    column_list: list[int] = sorted(
+        set(column for column_dict in edge_dict.values() for column in column_dict)
+    )
+
+    best: tuple[int, float] = (0, 0)
+    for ordering in permutations(column_list + [None] * len(row_list), len(row_list)):
+        pair_list: list[tuple[int, int]] = list(
+            (row, column)
+            for row, column in zip(row_list, ordering)
+            if column is not None and column in edge_dict[row]
+        )
+        if len(pair_list) != sum(column is not None for column in ordering):
+            continue
+
+        score: tuple[int, float] = (
+            len(pair_list),
+            -sum(edge_dict[row][column] for row, column in pair_list),
+        )
+        best = max(best, score)
+
+    return best[0], -best[1]
+
+
+def test_assign_is_global() -> None:
+    # Matching the first row to its cheapest column would leave the second row without one
+    assert Reconcile_Matcher.assign({0: {0: 1, 1: 2}, 1: {0: 1}}) == {0: 1, 1: 0}
+
+    # Equal costs are matched in order
+    assert Reconcile_Matcher.assign({0: {5: 0, 6: 0}, 1: {5: 0, 6: 0}}) == {0: 5, 1: 6}
+    assert Reconcile_Matcher.assign({0: {5: 1, 6: 1, 7: 1}}) == {0: 5}
+
+    # Rows without pairs and separate groups
+    assert Reconcile_Matcher.assign({0: {}, 1: {3: 2}, 2: {4: 1}}) == {1: 3, 2: 4}
+
+
+def test_assign_matches_brute_force() -> None:
+    generator: random.Random = random.Random(1)
+
+    for _ in range(200):
+        edge_dict: dict[int, dict[int, float]] = {
+            row: {
+                column: generator.randint(0, 5)
+                for column in range(4)
+                if generator.random() < 0.5
+            }
+            for row in range(generator.randint(1, 4))
+        }
+
+        assignment_dict: dict[int, int] = Reconcile_Matcher.assign(edge_dict)
+
+        assert len(set(assignment_dict.values())) == len(assignment_dict)
+        assert (
+            len(assignment_dict),
+            sum(edge_dict[row][column] for row, column in assignment_dict.items()),
+        ) == _brute_force(edge_dict)
+
+
+def test_assign_large_group(monkeypatch) -> None:
+    monkeypatch.setattr(Reconcile_Matcher, "MAX_ASSIGNMENT_SIZE", 1)
+
+    # Groups too large to solve exactly are matched cheapest pair first
+    assert Reconcile_Matcher.assign({0: {0: 1, 1: 2}, 1: {0: 0}}) == {1: 0, 0: 1}
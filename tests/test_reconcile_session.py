@@ -0,0 +1,528 @@
+# tests/test_reconcile_session.py
+
+import asyncio
+import random
+
+import pytest
+
+from datetime import datetime, timedelta
+
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from textual.app import App
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_transaction import DB_Transaction
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+from expense_tracker.model.orm.db_amount import DB_Amount
+from expense_tracker.model.orm.db_account import DB_Account
+
+from expense_tracker.model.reconcile_session import Reconcile_Session
+from expense_tracker.model.reconcile_stream import Reconcile_Stream
+from expense_tracker.model.reconcile_matcher import Reconcile_Matcher
+from expense_tracker.model.session_manager import Session_Manager
+
+from expense_tracker.presenter.reconcile import Reconcile
+from expense_tracker.presenter.transaction import Transaction
+
+from expense_tracker.view.popup.reconcile_popup import Reconcile_Popup
+
+
+def _add_transaction(
+    session: Session, merchant_id: int, date: datetime, amount: float
+) -> None:
+    transaction: DB_Transaction = DB_Transaction(
+        account_id=1,
+        description="Transaction",
+        merchant_id=merchant_id,
+        date=date,
+        reconciled_status=False,
+        total=amount,
+    )
+    session.add(transaction)
+    session.flush()
+    session.add(DB_Amount(transaction_id=transaction.id, amount=amount))
+
+
+def _create_session(tmp_path: Path, statement_row_list: list[str]) -> Reconcile_Session:
+    """
+    Create an account with two merchants and four unreconciled transactions, then start a session against a statement.
+    """
+
+    with Session(engine) as session:
+        session.add(
+            DB_Account(
+                name="Checking",
+                statement_description_column_index=0,
+                statement_amount_column_index=1,
+                statement_date_column_index=2,
+            )
+        )
+        session.add(DB_Merchant(name="Grocery", naming_rule="GROCERY"))
+        session.add(DB_Merchant(name="Coffee", naming_rule="COFFEE"))
+        session.flush()
+
+        _add_transaction(session, 1, datetime(2023, 7, 1), 10.5)
+        _add_transaction(session, 1, datetime(2023, 7, 1), 10.5)
+        _add_transaction(session, 2, datetime(2023, 7, 2), 4.25)
+        _add_transaction(session, 2, datetime(2023, 7, 9), 99)
+        session.commit()
+
+    statement_path: Path = tmp_path / "statement.csv"
+    statement_path.write_text(
+        "\n".join(["Description,Amount,Date"] + statement_row_list)
+    )
+
+    return Reconcile_Session(statement_path, 1)
+
+
+def test_match(database, tmp_path: Path) -> None:
+    reconcile_session: Reconcile_Session = _create_session(
+        tmp_path,
+        [
+            "GROCERY,-10.50,07/01/2023",
+            "GROCERY,-10.50,07/01/2023",
+            "COFFEE,-4.25,07/13/2023",
+            "UNKNOWN,-99,07/09/2023",
+        ],
+    )
+
+    row_list: list[Reconcile_Session.Row] = reconcile_session.reconcile_row_list
+
+    # Exact matches are each claimed once and in date order
+    assert row_list[0].matched_trans.id == 1
+    assert row_list[1].matched_trans.id == 2
+
+    # Amount and merchant match but the date is outside the tolerance
+    assert row_list[2].matched_trans is None
+    assert list(db_trans.id for db_trans in row_list[2].possible_match_list) == [3]
+
+    # Without a merchant only amount and date can match
+    assert row_list[3].matched_trans is None
+    assert list(db_trans.id for db_trans in row_list[3].possible_match_list) == [4]
+
+    assert list(db_trans.id for db_trans in reconcile_session.orphan_list) == [4, 3]
+    assert not reconcile_session.committable()
+
+
+def test_set_merchant_rematches(database, tmp_path: Path) -> None:
+    reconcile_session: Reconcile_Session = _create_session(
+        tmp_path, ["UNKNOWN,-99,07/09/2023"]
+    )
+
+    with Session(engine) as session:
+        coffee: DB_Merchant = session.get(DB_Merchant, 2)
+
+    change_set: Reconcile_Session.Change_Set = (
+        reconcile_session.set_statement_transaction_merchant(0, coffee)
+    )
+
+    assert change_set.row_id_set == {0}
+    assert change_set.removed_orphan_id_set == {4}
+    assert change_set.added_orphan_list == []
+    assert reconcile_session.reconcile_row_list[0].matched_trans.id == 4
+    assert list(db_trans.id for db_trans in reconcile_session.orphan_list) == [3, 1, 2]
+    assert reconcile_session.committable()
+
+
+def test_set_merchant_releases_match(database, tmp_path: Path) -> None:
+    reconcile_session: Reconcile_Session = _create_session(
+        tmp_path, ["COFFEE,-99,07/09/2023", "UNKNOWN,-99,07/09/2023"]
+    )
+
+    with Session(engine) as session:
+        grocery: DB_Merchant = session.get(DB_Merchant, 1)
+        coffee: DB_Merchant = session.get(DB_Merchant, 2)
+
+    # The released transaction is claimed by the other row that now matches it exactly
+    reconcile_session.set_statement_transaction_merchant(1, coffee)
+    change_set: Reconcile_Session.Change_Set = (
+        reconcile_session.set_statement_transaction_merchant(0, grocery)
+    )
+
+    assert change_set.row_id_set == {0, 1}
+    assert reconcile_session.reconcile_row_list[0].matched_trans is None
+    assert reconcile_session.reconcile_row_list[1].matched_trans.id == 4
+    assert change_set.added_orphan_list == []
+
+
+def test_display_rows_are_cached(database, tmp_path: Path) -> None:
+    _create_session(tmp_path, ["COFFEE,-4.25,07/13/2023", "UNKNOWN,-99,07/09/2023"])
+    Reconcile.new_session(tmp_path / "statement.csv", 1)
+
+    def refresh() -> tuple[list, list, list]:
+        return (
+            Reconcile.get_statement_list(),
+            Reconcile.get_possible_match_list(),
+            Reconcile.get_orphan_list(),
+        )
+
+    statement_list: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statement_list.append(statement)
+
+    try:
+        refresh()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            statement_rows, possible_rows, orphan_rows = refresh()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        # Refreshing the tables only reads the cached display rows
+        assert statement_list == []
+        assert possible_rows == [
+            ("0", "COFFEE", "Coffee", "Thu, Jul 13 2023", "-4.25")
+            + ("3", "Transaction", "Coffee", "Sun, Jul 2 2023", "4.25"),
+            ("1", "UNKNOWN", "None", "Sun, Jul 9 2023", "-99.0")
+            + ("4", "Transaction", "Coffee", "Sun, Jul 9 2023", "99.0"),
+        ]
+
+        # Only the rows whose match state changed are formatted again
+        Reconcile.set_value(1, Reconcile.Full_Column.ST_MERCHANT, 2)
+        assert Reconcile.get_statement_row(1)[2::5] == ("Coffee", "Coffee")
+        assert Reconcile.get_statement_row(0) is statement_rows[0]
+        assert Reconcile.get_possible_match_list() == possible_rows[:1]
+        assert list(row[0] for row in Reconcile.get_orphan_list()) == ["3", "1", "2"]
+    finally:
+        Reconcile.kill_session()
+
+
+def test_rematch_after_edit(database, tmp_path: Path) -> None:
+    _create_session(tmp_path, ["COFFEE,-4.50,07/02/2023"])
+    Reconcile.new_session(tmp_path / "statement.csv", 1)
+
+    try:
+        assert Reconcile.reconcile_session.get_row(0).matched_trans is None
+
+        # Fixing the transaction and matching again picks up the new total
+        Transaction.set_value(3, Transaction.Column.AMOUNT, "4.50")
+        Reconcile.rematch()
+        assert Reconcile.reconcile_session.get_row(0).matched_trans.id == 3
+    finally:
+        Reconcile.kill_session()
+
+
+def test_edited_transactions_are_formatted_again(database, tmp_path: Path) -> None:
+    _create_session(tmp_path, ["COFFEE,-4.50,07/02/2023"])
+    Reconcile.new_session(tmp_path / "statement.csv", 1)
+
+    try:
+        assert Reconcile.get_orphan_list()[0][::4] == ("4", "99.0")
+        assert Reconcile.get_possible_match_list()[0][5::4] == ("3", "4.25")
+
+        # Orphans and possible matches show the edited values without matching again
+        Transaction.set_value(4, Transaction.Column.AMOUNT, "50")
+        Transaction.set_value(3, Transaction.Column.AMOUNT, "4.50")
+        assert Reconcile.get_orphan_list()[0][::4] == ("4", "50.0")
+        assert Reconcile.get_possible_match_list()[0][5::4] == ("3", "4.5")
+
+        Reconcile.rematch()
+        assert Reconcile.get_statement_row(0)[5::4] == ("3", "4.5")
+    finally:
+        Reconcile.kill_session()
+
+
+def test_released_orphans_are_shown_in_order(database, tmp_path: Path) -> None:
+    _create_session(tmp_path, ["COFFEE,-99,07/09/2023"])
+
+    async def run() -> tuple[list[str], list[str]]:
+        app: App = App()
+        async with app.run_test():
+            popup: Reconcile_Popup = Reconcile_Popup(tmp_path / "statement.csv", 1)
+            await app.push_screen(popup)
+
+            # The released transaction is the newest orphan so it belongs at the top
+            Reconcile.set_value(0, Reconcile.Full_Column.ST_MERCHANT, 1)
+            popup.apply_change_set(Reconcile.last_change_set)
+
+            return list(
+                row.key.value for row in popup._orphan_table.ordered_rows
+            ), list(row[0] for row in Reconcile.get_orphan_list())
+
+    try:
+        shown_id_list, orphan_id_list = asyncio.run(run())
+        assert shown_id_list == orphan_id_list == ["4", "3", "1", "2"]
+    finally:
+        Reconcile.kill_session()
+
+
+def test_resume_checkpoint(database, tmp_path: Path, monkeypatch) -> None:
+    _create_session(
+        tmp_path,
+        [
+            "GROCERY,-10.50,07/01/2023",
+            "UNKNOWN,-99,07/09/2023",
+            "UNKNOWN,-4.25,07/02/2023",
+        ],
+    )
+    Reconcile.new_session(tmp_path / "statement.csv", 1)
+
+    try:
+        Reconcile.set_value(1, Reconcile.Full_Column.ST_MERCHANT, 2)
+        statement_rows: list = Reconcile.get_statement_list()
+        possible_rows: list = Reconcile.get_possible_match_list()
+        orphan_rows: list = Reconcile.get_orphan_list()
+
+        # Closing the app forgets the session and every object it loaded
+        Reconcile.reconcile_session = None
+        Session_Manager.remove()
+
+        def cost(st_trans, db_trans) -> float:
+            raise AssertionError("Resumed rows should not be scored")
+
+        # The merchant set by hand and the matches are restored without matching again
+        monkeypatch.setattr(Reconcile_Matcher, "cost", cost)
+        assert Reconcile.resume_session()
+        assert Reconcile.statement_path == (tmp_path / "statement.csv").resolve()
+        assert Reconcile.get_statement_list() == statement_rows
+        assert Reconcile.get_possible_match_list() == possible_rows
+        assert Reconcile.get_orphan_list() == orphan_rows
+    finally:
+        Reconcile.kill_session()
+
+    # Killed sessions are not resumed
+    assert not Reconcile.resume_session()
+
+
+def test_resume_drops_matches_that_no_longer_match(database, tmp_path: Path) -> None:
+    _create_session(tmp_path, ["COFFEE,-4.25,07/02/2023"])
+    Reconcile.new_session(tmp_path / "statement.csv", 1)
+    Reconcile.reconcile_session = None
+    Session_Manager.remove()
+
+    # The matched transaction is edited after the checkpoint
+    with Session(engine) as session:
+        session.get(DB_Transaction, 3).total = 500
+        session.get(DB_Transaction, 3).date = datetime(2024, 1, 1)
+        session.commit()
+
+    try:
+        assert Reconcile.resume_session()
+        row: Reconcile_Session.Row = Reconcile.reconcile_session.get_row(0)
+        assert row.matched_trans is None
+        assert list(db_trans.id for db_trans in row.possible_match_list) == []
+        assert not Reconcile.committable()
+    finally:
+        Reconcile.kill_session()
+
+
+def test_changed_statement_is_not_resumed(database, tmp_path: Path) -> None:
+    _create_session(tmp_path, ["GROCERY,-10.50,07/01/2023"])
+    statement_path: Path = tmp_path / "statement.csv"
+    Reconcile.new_session(statement_path, 1)
+    Reconcile.reconcile_session = None
+
+    statement_path.write_text(statement_path.read_text() + "\nCOFFEE,-4.25,07/02/2023")
+
+    assert not Reconcile.resume_session()
+    assert not Reconcile.ongoing_session()
+
+
+def test_commit(database, tmp_path: Path) -> None:
+    reconcile_session: Reconcile_Session = _create_session(
+        tmp_path,
+        [
+            "GROCERY,-10.50,07/01/2023",
+            "GROCERY,-10.50,07/01/2023",
+            "COFFEE,-4.25,07/02/2023",
+        ],
+    )
+
+    statement_list: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statement_list.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        reconcile_session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # Every matched transaction is updated by one statement
+    assert list(
+        statement.split()[0] for statement in statement_list if "UPDATE" in statement
+    ) == ["UPDATE"]
+
+    with Session(engine) as session:
+        transaction_list: list[DB_Transaction] = (
+            session.query(DB_Transaction).order_by(DB_Transaction.id).all()
+        )
+        assert list(
+            (db_trans.reconciled_status, db_trans.statement_name)
+            for db_trans in transaction_list
+        ) == [
+            (True, "statement.csv:0:2023-07-01"),
+            (True, "statement.csv:1:2023-07-01"),
+            (True, "statement.csv:2:2023-07-02"),
+            (False, None),
+        ]
+
+    # Loaded transactions have the committed values without being read again
+    assert reconcile_session.reconcile_row_list[2].matched_trans.statement_name == (
+        "statement.csv:2:2023-07-02"
+    )
+
+
+def test_match_with_tolerances(database, tmp_path: Path) -> None:
+    reconcile_session: Reconcile_Session = _create_session(
+        tmp_path,
+        [
+            "GROCERY,-10.50,07/03/2023",
+            "GROCERY,-10.50,07/01/2023",
+            "COFFEE,-4.26,07/04/2023",
+        ],
+    )
+
+    row_list: list[Reconcile_Session.Row] = reconcile_session.reconcile_row_list
+
+    # Rows posted a few days late or a cent off still match
+    assert list(row.matched_trans.id for row in row_list) == [1, 2, 3]
+    assert list(db_trans.id for db_trans in reconcile_session.orphan_list) == [4]
+
+
+def test_stream_commit(database, tmp_path: Path) -> None:
+    # Newest first, the coffee row was posted two days late
+    _create_session(
+        tmp_path,
+        [
+            "UNKNOWN,-99,07/09/2023",
+            "COFFEE,-4.25,07/04/2023",
+            "GROCERY,-10.50,07/01/2023",
+        ],
+    )
+
+    result: Reconcile_Stream.Result = Reconcile_Stream(
+        tmp_path / "statement.csv", 1
+    ).commit()
+
+    assert result == Reconcile_Stream.Result(
+        matched_count=2, unmatched_count=1, orphan_count=2
+    )
+    with Session(engine) as session:
+        assert list(
+            (db_trans.id, db_trans.statement_name)
+            for db_trans in session.query(DB_Transaction)
+            .where(DB_Transaction.reconciled_status == True)
+            .order_by(DB_Transaction.id)
+        ) == [(1, "statement.csv:2:2023-07-01"), (3, "statement.csv:1:2023-07-04")]
+
+
+def test_stream_orphans_are_within_statement_dates(database, tmp_path: Path) -> None:
+    _create_session(tmp_path, ["GROCERY,-10.50,07/01/2023"])
+
+    # The coffee transaction a day later is read within the date tolerance but is not an orphan of a statement that ends on 07/01
+    assert Reconcile_Stream(tmp_path / "statement.csv", 1).commit() == (
+        Reconcile_Stream.Result(matched_count=1, unmatched_count=0, orphan_count=1)
+    )
+
+
+def test_stream_then_interactive(database, tmp_path: Path) -> None:
+    _create_session(tmp_path, ["GROCERY,-10.50,07/01/2023", "UNKNOWN,-4.25,07/02/2023"])
+    result: Reconcile_Stream.Result = Reconcile_Stream(
+        tmp_path / "statement.csv", 1
+    ).commit()
+    assert (result.matched_count, result.unmatched_count) == (1, 1)
+
+    # Streaming again does not match the reconciled row a second time
+    assert Reconcile_Stream(tmp_path / "statement.csv", 1).commit().matched_count == 0
+
+    # Only the row the stream could not match is left, it is not matched to the other grocery transaction
+    Reconcile.new_session(tmp_path / "statement.csv", 1)
+    try:
+        assert list(
+            row.statement_trans.row_id
+            for row in Reconcile.reconcile_session.reconcile_row_list
+        ) == [1]
+
+        Reconcile.set_value(1, Reconcile.Full_Column.ST_MERCHANT, 2)
+        assert Reconcile.committable()
+        Reconcile.commit()
+    finally:
+        Reconcile.kill_session()
+
+    with Session(engine) as session:
+        assert list(
+            (db_trans.id, db_trans.statement_name)
+            for db_trans in session.query(DB_Transaction)
+            .where(DB_Transaction.reconciled_status == True)
+            .order_by(DB_Transaction.id)
+        ) == [(1, "statement.csv:0:2023-07-01"), (3, "statement.csv:1:2023-07-02")]
+
+
+def test_stream_requires_date_order(database, tmp_path: Path) -> None:
+    _create_session(
+        tmp_path, ["GROCERY,-10.50,07/01/2023", "COFFEE,-4.25,07/02/2023"] * 2
+    )
+
+    with pytest.raises(ValueError):
+        Reconcile_Stream(tmp_path / "statement.csv", 1).commit()
+
+    # Nothing is committed when the stream fails
+    with Session(engine) as session:
+        assert (
+            session.query(DB_Transaction)
+            .where(DB_Transaction.reconciled_status == True)
+            .count()
+            == 0
+        )
+
+
+def test_stream_matches_session(database, tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(Reconcile_Stream, "BATCH_SIZE", 7)
+    generator: random.Random = random.Random(2)
+
+    # Transactions over a year with few distinct amounts so rows compete for them
+    statement_row_list: list[str] = []
+    with Session(engine) as session:
+        for _ in range(300):
+            date: datetime = datetime(2022, 1, 1) + timedelta(
+                days=generator.randint(0, 365)
+            )
+            amount: float = generator.choice([5, 10.5, 20])
+            merchant: str = generator.choice(["GROCERY", "COFFEE"])
+            _add_transaction(session, 1 if merchant == "GROCERY" else 2, date, amount)
+
+            if generator.random() < 0.8:
+                posted: datetime = date + timedelta(days=generator.randint(0, 4))
+                statement_row_list.append(
+                    (posted, f"{merchant},-{amount},{posted:%m/%d/%Y}")
+                )
+        session.commit()
+
+    statement_row_list.sort()
+    reconcile_session: Reconcile_Session = _create_session(
+        tmp_path, list(row for _, row in statement_row_list)
+    )
+
+    def total_cost(pair_list: list[tuple]) -> float:
+        return round(
+            sum(
+                Reconcile_Matcher.cost(st_trans, db_trans)
+                for st_trans, db_trans in pair_list
+            ),
+            3,
+        )
+
+    session_pair_list: list[tuple] = list(
+        (row.statement_trans, row.matched_trans)
+        for row in reconcile_session.reconcile_row_list
+        if row.matched_trans
+    )
+    with Session(engine) as session:
+        stream_pair_list: list[tuple] = list(
+            (st_trans, db_row)
+            for st_trans, db_row in Reconcile_Stream(
+                tmp_path / "statement.csv", 1
+            ).match(session)
+            if db_row
+        )
+
+    # Both find the same number of matches at the same cost, equal cost matches may differ
+    assert len(stream_pair_list) == len(session_pair_list) > 200
+    assert total_cost(stream_pair_list) == total_cost(session_pair_list)
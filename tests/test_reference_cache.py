@@ -0,0 +1,32 @@
+# tests/test_reference_cache.py
+
+from expense_tracker.presenter.account import Account
+from expense_tracker.presenter.merchant import Merchant
+
+from expense_tracker.view.selector import Selector
+
+from tests.helpers import add_transactions, count_queries
+
+
+def test_options_are_cached_until_rows_change(database) -> None:
+    add_transactions(1)
+
+    query_count, option_list = count_queries(lambda: Selector.get_option_list(Merchant))
+    assert query_count > 0
+    assert option_list == [Selector.Option("Grocery", "1")]
+    assert count_queries(lambda: Selector.get_option_list(Merchant)) == (
+        0,
+        option_list,
+    )
+
+    # Changes to other presenters do not invalidate the merchant options
+    Account.set_value(1, Account.Column.NAME, "Savings")
+    assert count_queries(lambda: Selector.get_option_list(Merchant))[0] == 0
+    assert Selector.get_option_list(Account) == [Selector.Option("Savings", "1")]
+
+    Merchant.create({Merchant.Column.NAME: "Coffee", Merchant.Column.NAMING_RULE: ""})
+    Merchant.set_value(1, Merchant.Column.NAME, "Market")
+    assert Selector.get_option_list(Merchant) == [
+        Selector.Option("Coffee", "2"),
+        Selector.Option("Market", "1"),
+    ]
@@ -0,0 +1,52 @@
+# tests/test_schema_manager.py
+
+from sqlalchemy import text
+
+from expense_tracker.model.orm import engine, Base
+
+from expense_tracker.model.schema_manager import Schema_Manager
+
+
+def _index_name_set() -> set[str]:
+    # Read the schema with a query, PRAGMA index_list can answer from a pooled connection's stale schema cache
+    with engine.connect() as connection:
+        return set(
+            connection.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index'")
+            ).scalars()
+        )
+
+
+def _declared_index_name_set() -> set[str]:
+    return set(
+        index.name for table in Base.metadata.sorted_tables for index in table.indexes
+    )
+
+
+def test_existing_database_gets_indexes(database) -> None:
+    # Simulate a database created before the models declared indexes
+    with engine.begin() as connection:
+        for name in _declared_index_name_set():
+            connection.execute(text(f"DROP INDEX {name}"))
+        connection.execute(text("PRAGMA user_version = 0"))
+
+    assert Schema_Manager.migrate(engine) == len(Schema_Manager._STEP_LIST)
+    assert _declared_index_name_set() <= _index_name_set()
+
+    # Migrating an up to date database does nothing
+    assert Schema_Manager.migrate(engine) == 0
+
+
+def test_unreconciled_filter_uses_index(database) -> None:
+    with engine.connect() as connection:
+        plan: str = " ".join(
+            str(row[-1])
+            for row in connection.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT * FROM transactions "
+                    "WHERE account_id = 1 AND reconciled_status = 0"
+                )
+            )
+        )
+
+    assert "ix_transactions_account_id_reconciled_status" in plan
@@ -0,0 +1,35 @@
+# tests/test_selector_index.py
+
+import random
+import string
+
+from expense_tracker.view.selector_index import Selector_Index
+
+
+NAME_LIST: list[str] = [
+    "Grocery Outlet",
+    "Coffee Shop",
+    "Gas Station",
+    "Groceries Plus",
+]
+
+
+def test_prefix_matches_rank_first() -> None:
+    index: Selector_Index = Selector_Index(NAME_LIST)
+
+    assert index.search("gro", 10)[:2] == [0, 3]
+    assert index.search("shop", 10)[0] == 1
+    assert index.search("xyz", 10) == []
+
+
+def test_incremental_search_matches_fresh_search() -> None:
+    random.seed(0)
+    name_list: list[str] = list(
+        "".join(random.choices(string.ascii_lowercase + " ", k=random.randint(3, 20)))
+        for _ in range(2000)
+    )
+    index: Selector_Index = Selector_Index(name_list)
+
+    # Type a search, delete part of it and type something else
+    for search in ["a", "ab", "abc", "abcd", "ab", "abx", "q", "qu"]:
+        assert index.search(search, 50) == Selector_Index(name_list).search(search, 50)
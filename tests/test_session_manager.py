@@ -0,0 +1,77 @@
+# tests/test_session_manager.py
+
+import gc
+
+import pytest
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_transaction import DB_Transaction
+
+from expense_tracker.model.session_manager import Session_Manager
+
+from expense_tracker.presenter.tag import Tag
+from expense_tracker.presenter.transaction import Transaction
+
+from tests.helpers import add_transactions, count_queries
+
+
+def test_loaded_rows_are_not_queried_again(database) -> None:
+    add_transactions(1)
+
+    assert count_queries(lambda: Tag.get_tag_list([1]))[0] == 1
+    assert count_queries(lambda: Tag.get_tag_list([1, 1]))[0] == 0
+
+    # Edits go through the shared session, so reads after them are not stale
+    Transaction.set_value(1, Transaction.Column.DESCRIPTION, "Edited")
+    assert Transaction.get_by_id(1)[Transaction.Column.DESCRIPTION.value] == "Edited"
+
+
+def test_expire_reloads_rows_changed_elsewhere(database) -> None:
+    add_transactions(1)
+    assert Transaction.get_by_id(1)[Transaction.Column.DESCRIPTION.value] == (
+        "Transaction 1"
+    )
+
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE transactions SET description = 'Outside'"))
+
+    # The loaded transaction is kept until it is expired
+    assert Transaction.get_by_id(1)[Transaction.Column.DESCRIPTION.value] == (
+        "Transaction 1"
+    )
+    Session_Manager.expire()
+    assert Transaction.get_by_id(1)[Transaction.Column.DESCRIPTION.value] == "Outside"
+
+
+def test_failed_work_is_rolled_back(database) -> None:
+    add_transactions(1)
+
+    with pytest.raises(ValueError):
+        with Session_Manager.unit_of_work() as session:
+            session.get(DB_Transaction, 1).description = "Uncommitted"
+            raise ValueError()
+
+    assert Transaction.get_by_id(1)[Transaction.Column.DESCRIPTION.value] == (
+        "Transaction 1"
+    )
+
+
+def test_loaded_objects_are_bounded(database, monkeypatch) -> None:
+    monkeypatch.setattr(Session_Manager, "MAX_REFERENCE_COUNT", 10)
+    add_transactions(100)
+
+    Transaction.get_all()
+    gc.collect()
+
+    # Only the most recently loaded objects and what they refer to stay loaded
+    session: Session = Session_Manager.get_session()
+    assert len(session.info["reference_dict"]) == 10
+    assert len(session.identity_map) < 50
+
+    # Dropped objects are read again when they are used
+    assert Transaction.get_by_id(1)[Transaction.Column.DESCRIPTION.value] == (
+        "Transaction 1"
+    )
@@ -0,0 +1,67 @@
+# tests/test_statement_import.py
+
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+from expense_tracker.model.orm.db_account import DB_Account
+
+from expense_tracker.model.statement_manager import Statement, ST_Transaction
+from expense_tracker.model.statement_import import Statement_Import, Staged_Statement
+
+
+def _row_fields(st_trans: ST_Transaction) -> tuple:
+    return (
+        st_trans.row_id,
+        st_trans.description,
+        st_trans.merchant and st_trans.merchant.id,
+        st_trans.date,
+        st_trans.amount,
+    )
+
+
+def test_import_matches_single_statement_parsing(database, tmp_path: Path) -> None:
+    with Session(engine) as session:
+        for name in ("Checking", "Credit Card", "Credit Card Business"):
+            session.add(
+                DB_Account(
+                    name=name,
+                    statement_description_column_index=0,
+                    statement_amount_column_index=1,
+                    statement_date_column_index=2,
+                )
+            )
+        session.add(DB_Merchant(name="Coffee", naming_rule="COFFEE"))
+        session.commit()
+
+    for file_name in ("checking_july", "credit-card-july", "CreditCardBusiness July"):
+        (tmp_path / f"{file_name}.csv").write_text(
+            "Description,Amount,Date\n"
+            "COFFEE,-3.50,07/04/2023\n"
+            f"{file_name},-20,07/05/2023\n"
+        )
+    (tmp_path / "savings_july.csv").write_text("")
+
+    statement_dict: dict[Path, int] = Statement_Import.map_statements(tmp_path)
+    assert {path.name: account_id for path, account_id in statement_dict.items()} == {
+        "checking_july.csv": 1,
+        "credit-card-july.csv": 2,
+        "CreditCardBusiness July.csv": 3,
+    }
+
+    # Use more than one worker so the statements are parsed in worker processes
+    staged_list: list[Staged_Statement] = Statement_Import.import_statements(
+        statement_dict, max_workers=2
+    )
+
+    assert list(staged.statement_path for staged in staged_list) == list(statement_dict)
+    for staged in staged_list:
+        assert list(map(_row_fields, staged.st_trans_list)) == list(
+            map(
+                _row_fields,
+                Statement(staged.statement_path, staged.account_id).get_all(),
+            )
+        )
+        assert staged.st_trans_list[0].merchant.name == "Coffee"
@@ -0,0 +1,53 @@
+# tests/test_statement_manager.py
+
+from datetime import datetime
+
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_merchant import DB_Merchant
+from expense_tracker.model.orm.db_account import DB_Account
+
+from expense_tracker.model.statement_manager import Statement, ST_Transaction
+
+
+def test_batches_skip_unreadable_rows(database, tmp_path: Path) -> None:
+    with Session(engine) as session:
+        session.add(
+            DB_Account(
+                name="Checking",
+                statement_description_column_index=0,
+                statement_amount_column_index=1,
+                statement_date_column_index=2,
+            )
+        )
+        session.add(DB_Merchant(name="Coffee", naming_rule="COFFEE"))
+        session.commit()
+
+    statement_path: Path = tmp_path / "statement.csv"
+    statement_path.write_text(
+        "Description,Amount,Date\n"
+        "COFFEE 1,-3.50,07/04/2023\n"
+        "GROCERY,-20,7/5/2023\n"
+        "COFFEE 2,abc,07/06/2023\n"
+        "COFFEE 3,-4,02/30/2023\n"
+        "COFFEE 4,-5,07/07/2023\n"
+        "short row\n"
+    )
+
+    batch_list: list[list[ST_Transaction]] = list(
+        Statement(statement_path, 1).get_batches(batch_size=2)
+    )
+
+    assert list(len(batch) for batch in batch_list) == [2, 1]
+    assert list(
+        (st_trans.row_id, st_trans.merchant and st_trans.merchant.name, st_trans.date)
+        for batch in batch_list
+        for st_trans in batch
+    ) == [
+        (0, "Coffee", datetime(2023, 7, 4)),
+        (1, None, datetime(2023, 7, 5)),
+        (2, "Coffee", datetime(2023, 7, 7)),
+    ]
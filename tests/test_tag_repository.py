@@ -0,0 +1,64 @@
+# tests/test_tag_repository.py
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_tag import DB_Tag
+
+from expense_tracker.presenter.tag import Tag
+from expense_tracker.presenter.transaction import Transaction
+
+from tests.helpers import add_transactions, count_queries
+
+
+def _add_tags(count: int) -> None:
+    """
+    Bulk insert tags named after their id, continuing from the tags already in the database.
+    """
+
+    with Session(engine) as session:
+        first_id: int = session.query(DB_Tag).count() + 1
+        session.execute(
+            insert(DB_Tag),
+            list(
+                {"id": id, "name": f"Tag {id}", "instance_tag": False}
+                for id in range(first_id, first_id + count)
+            ),
+        )
+        session.commit()
+
+
+def test_tags_are_loaded_in_one_query_and_cached(database) -> None:
+    _add_tags(20)
+    id_list: list[int] = list(range(20, 0, -1))
+
+    query_count, tag_list = count_queries(lambda: Tag.get_tag_list(id_list))
+    assert query_count == 1
+    assert list(tag.id for tag in tag_list) == id_list
+
+    # String ids from the tables resolve to the same cached tags
+    assert count_queries(lambda: Tag.get_tag_list(["3", "4"]))[0] == 0
+
+
+def test_tag_edits_invalidate_cache(database) -> None:
+    _add_tags(1)
+    Tag.get_tag_list([1])
+
+    new_tag: tuple[str, ...] = Tag.create(
+        {Tag.Column.NAME: "New", Tag.Column.INSTANCE_TAG: False}
+    )
+    Tag.set_value(1, Tag.Column.NAME, "Renamed")
+
+    query_count, tag_list = count_queries(
+        lambda: Tag.get_tag_list([1, int(new_tag[0])])
+    )
+    assert query_count == 1
+    assert list(tag.name for tag in tag_list) == ["Renamed", "New"]
+
+
+def test_setting_transaction_tags(database) -> None:
+    add_transactions(1)
+    _add_tags(3)
+
+    assert Transaction.set_value(1, Transaction.Column.TAGS, [3, 2]) == "Tag 3, Tag 2"
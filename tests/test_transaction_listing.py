@@ -0,0 +1,114 @@
+# tests/test_transaction_listing.py
+
+"""
+Checks that listing transactions issues a fixed number of queries.
+
+The benchmark up to 100k transactions is skipped by default, run it with:
+    EXPTRACK_BENCHMARK=1 python -m pytest -s tests/test_transaction_listing.py
+"""
+
+import os
+import time
+
+import pytest
+
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_transaction import DB_Transaction
+
+from expense_tracker.presenter.transaction import Transaction
+
+from tests.helpers import add_transactions
+
+
+def _count_get_all_queries() -> tuple[int, int]:
+    """
+    Run Transaction.get_all and count the SELECT statements it issues.
+
+    Return: Tuple of the number of queries and the number of rows returned.
+    """
+
+    statement_list: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statement_list.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        row_list: list[tuple[str, ...]] = Transaction.get_all()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    return len(statement_list), len(row_list)
+
+
+def _row_total() -> int:
+    with Session(engine) as session:
+        return session.query(DB_Transaction).count()
+
+
+def test_get_all_query_count_is_constant(database) -> None:
+    for count in (10, 100, 1000):
+        add_transactions(count - _row_total())
+        assert _count_get_all_queries() == (1, count)
+
+
+def test_get_all_format(database) -> None:
+    add_transactions(2)
+
+    assert Transaction.get_all()[0] == (
+        "2",
+        "False",
+        "Checking",
+        "Transaction 2",
+        "Grocery",
+        "Wed, Jan 1 2020",
+        "Food",
+        "2.0",
+    )
+
+
+def test_edits_notify_listeners(database) -> None:
+    add_transactions(2)
+    change_list: list[Transaction.Change] = []
+
+    Transaction.subscribe(change_list.append)
+    try:
+        Transaction.create(
+            {
+                Transaction.Column.ACCOUNT: 1,
+                Transaction.Column.MERCHANT: 1,
+                Transaction.Column.DATE: datetime(2020, 2, 1),
+                Transaction.Column.DESCRIPTION: "New",
+                Transaction.Column.AMOUNT: 5.0,
+                Transaction.Column.TAGS: [1],
+            }
+        )
+        Transaction.set_value(1, Transaction.Column.DESCRIPTION, "Edited")
+    finally:
+        Transaction.unsubscribe(change_list.append)
+
+    assert change_list == [
+        Transaction.Change(created_id_list=[3]),
+        Transaction.Change(updated_id_list=[1]),
+    ]
+
+
+@pytest.mark.skipif(
+    not os.environ.get("EXPTRACK_BENCHMARK"), reason="Benchmark is not enabled"
+)
+def test_get_all_benchmark(database) -> None:
+    print(f"\n{'rows':>8} {'queries':>8} {'seconds':>8}")
+
+    for count in (100, 1000, 10000, 100000):
+        add_transactions(count - _row_total())
+
+        start: float = time.perf_counter()
+        query_count, row_count = _count_get_all_queries()
+        print(f"{row_count:>8} {query_count:>8} {time.perf_counter() - start:>8.2f}")
+
+        assert query_count == 1
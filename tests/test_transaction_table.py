@@ -0,0 +1,100 @@
+# tests/test_transaction_table.py
+
+import asyncio
+
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from textual.app import App, ComposeResult
+
+from expense_tracker.model.orm import engine
+from expense_tracker.model.orm.db_transaction import DB_Transaction
+from expense_tracker.model.orm.db_amount import DB_Amount
+
+from expense_tracker.presenter.transaction import Transaction
+
+from expense_tracker.view.table.transaction_table import Transaction_Table
+
+from tests.helpers import add_transactions
+
+
+class _Table_App(App):
+    def compose(self) -> ComposeResult:
+        yield Transaction_Table()
+
+
+def _create(date: datetime) -> int:
+    return int(
+        Transaction.create(
+            {
+                Transaction.Column.ACCOUNT: 1,
+                Transaction.Column.DESCRIPTION: "Created",
+                Transaction.Column.MERCHANT: 1,
+                Transaction.Column.DATE: date,
+                Transaction.Column.AMOUNT: "1",
+                Transaction.Column.TAGS: [],
+            }
+        )[0]
+    )
+
+
+def test_changes_keep_pages_in_order(database, monkeypatch) -> None:
+    monkeypatch.setattr(Transaction_Table, "PAGE_SIZE", 5)
+
+    # Transaction n is n hours into 2020, the first page is 12 to 8
+    add_transactions(12)
+
+    async def run() -> tuple[list[int], list[int]]:
+        app: _Table_App = _Table_App()
+        async with app.run_test():
+            table: Transaction_Table = app.query_one(Transaction_Table)
+
+            def shown_id_list() -> list[int]:
+                return list(int(row.key.value) for row in table.ordered_rows)
+
+            # Rows that sort after the loaded pages wait for their page, the rest are placed in order
+            _create(datetime(2020, 1, 1, 0, 30))
+            newest_id: int = _create(datetime(2021, 1, 1))
+            Transaction.set_value(10, Transaction.Column.DATE, datetime(2019, 1, 1))
+            Transaction.set_value(
+                2, Transaction.Column.DATE, datetime(2020, 1, 1, 10, 30)
+            )
+            assert shown_id_list() == [newest_id, 12, 11, 2, 9, 8]
+
+            while table._next_page_cursor is not None:
+                table.load_next_page()
+
+            return shown_id_list(), list(
+                int(row[0])
+                for row in Transaction.query(
+                    sort_column=Transaction.Column.DATE, descending=True
+                )[0]
+            )
+
+    shown_id_list, expected_id_list = asyncio.run(run())
+    assert shown_id_list == expected_id_list
+
+
+def test_rows_deleted_elsewhere_are_removed(database, monkeypatch) -> None:
+    monkeypatch.setattr(Transaction_Table, "PAGE_SIZE", 5)
+    add_transactions(12)
+
+    async def run() -> tuple[int, list[int]]:
+        app: _Table_App = _Table_App()
+        async with app.run_test():
+            table: Transaction_Table = app.query_one(Transaction_Table)
+
+            # A loaded row is deleted without going through the presenter
+            with Session(engine) as session:
+                session.execute(delete(DB_Amount).where(DB_Amount.transaction_id == 11))
+                session.execute(delete(DB_Transaction).where(DB_Transaction.id == 11))
+                session.commit()
+
+            # Placing a created row does not need the cursor of the deleted row
+            newest_id: int = _create(datetime(2021, 1, 1))
+            return newest_id, list(int(row.key.value) for row in table.ordered_rows)
+
+    newest_id, shown_id_list = asyncio.run(run())
+    assert shown_id_list == [newest_id, 12, 10, 9, 8]
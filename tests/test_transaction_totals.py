@@ -0,0 +1,67 @@
+# tests/test_transaction_totals.py
+
+from sqlalchemy import text
+
+from expense_tracker.model.orm import engine
+
+from expense_tracker.model.schema_manager import Schema_Manager
+from expense_tracker.model.transaction_totals import Transaction_Totals
+
+from expense_tracker.presenter.transaction import Transaction
+
+from tests.helpers import add_transactions, count_queries
+
+
+def test_totals_are_batched_and_memoized(database) -> None:
+    add_transactions(2000)
+    id_list: list[int] = list(range(1, 2001))
+
+    # One query per IN clause sized chunk, then every total is memoized
+    query_count, total_dict = count_queries(
+        lambda: Transaction_Totals.get_totals(id_list)
+    )
+    assert query_count == 3
+    assert total_dict[1500] == 1500
+
+    assert count_queries(lambda: Transaction_Totals.get_total(1500)) == (0, 1500)
+    assert count_queries(lambda: Transaction_Totals.get_totals([5, 2001])) == (
+        1,
+        {5: 5, 2001: 0},
+    )
+
+
+def test_amount_edit_invalidates_total(database) -> None:
+    add_transactions(1)
+    assert Transaction_Totals.get_total(1) == 1
+
+    Transaction.set_value(1, Transaction.Column.AMOUNT, "7.5")
+
+    assert Transaction_Totals.get_total(1) == 7.5
+    assert Transaction_Totals.verify() == []
+
+
+def test_verify_and_rebuild_stored_totals(database) -> None:
+    add_transactions(3)
+    assert Transaction_Totals.verify() == []
+
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE transactions SET total = 99 WHERE id = 2"))
+
+    assert Transaction_Totals.verify() == [(2, 99, 2)]
+    assert Transaction_Totals.rebuild() == 1
+    assert Transaction_Totals.verify() == []
+    assert Transaction_Totals.get_total(2) == 2
+
+
+def test_migration_backfills_stored_totals(database) -> None:
+    add_transactions(3)
+
+    # Simulate a database from before transactions stored their total
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_transactions_total"))
+        connection.execute(text("ALTER TABLE transactions DROP COLUMN total"))
+        connection.execute(text("PRAGMA user_version = 2"))
+
+    assert Schema_Manager.migrate(engine) == 1
+    assert Transaction_Totals.verify() == []
+    assert Transaction_Totals.get_totals([1, 3]) == {1: 1, 3: 3}